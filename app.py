@@ -1,9 +1,16 @@
+import io
+import zipfile
 import streamlit as st
 import pandas as pd
 import numpy as np
+import matplotlib
+# 图形只渲染到内存缓冲区，使用非交互式Agg后端，不初始化GUI后端
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
-from typing import List, Dict, Tuple, Set, Optional
+from typing import List, Dict, Tuple, Set, Optional, Iterable
 from collections import defaultdict
+from itertools import chain
+from pathlib import Path
 
 # 导入自定义模块
 from utils import (
@@ -11,12 +18,15 @@ from utils import (
     load_preferences_from_excel,
     parse_custom_weights,
     compute_pair_weights,
+    encode_pairs_by_rank,
     generate_seats,
     generate_adjacent_edges,
+    build_adjacency_matrix,
     visualize_layout,
     validate_layout,
     solve_top_n_assignments,
-    compute_satisfaction_metrics,
+    solve_top_n_parallel,
+    compute_satisfaction_metrics_batch,
     export_assignment_to_excel,
     export_assignment_to_image,
     get_seat_info
@@ -26,68 +36,22 @@ from utils import (
 plt.rcParams['font.sans-serif'] = ['SimHei', 'DejaVu Sans']
 plt.rcParams['axes.unicode_minus'] = False
 
+STATIC_DIR = Path(__file__).parent / "static"
+
+
+@st.cache_resource(show_spinner=False)
+def load_static_text(filename: str) -> str:
+    """读取static目录下的样式或页面片段，进程内只读取一次"""
+    return (STATIC_DIR / filename).read_text(encoding="utf-8")
+
+
 # 页面配置
 st.set_page_config(page_title="智能座位分配系统", layout="wide", 
                    page_icon="🪑", initial_sidebar_state="expanded")
 
-# 自定义CSS样式
-st.markdown("""
-<style>
-    .main .block-container {
-        padding-top: 2rem;
-        padding-bottom: 2rem;
-    }
-    .stExpander {
-        border: 1px solid #f0f2f6;
-        border-radius: 0.5rem;
-        box-shadow: 0 1px 2px rgba(0,0,0,0.05);
-        margin-bottom: 1rem;
-    }
-    .result-card {
-        padding: 1rem;
-        border-radius: 0.5rem;
-        background: #f8f9fa;
-        margin-bottom: 1rem;
-    }
-    .highlight-text {
-        font-weight: bold;
-        color: #4361ee;
-    }
-    .title-container {
-        display: flex;
-        align-items: center;
-        margin-bottom: 1rem;
-    }
-    .title-icon {
-        font-size: 2rem;
-        margin-right: 1rem;
-    }
-    .metric-container {
-        background: #f8f9fa;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        margin-bottom: 0.5rem;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# 页面标题和介绍
-st.markdown("""
-<div class="title-container">
-    <div class="title-icon">🪑</div>
-    <div>
-        <h1 style="margin:0;">智能座位分配系统</h1>
-        <p style="margin:0;color:#666;">基于喜好关系的座位优化分配</p>
-    </div>
-</div>
-""", unsafe_allow_html=True)
-
-st.markdown("""
-<div style="background-color:#f0f7ff;padding:10px;border-radius:5px;margin-bottom:20px;">
-    <p style="margin-bottom:5px;"><b>系统功能</b>：根据喜好关系优化座位分配，让喜欢坐在一起的人相邻，不喜欢坐在一起的人分开。</p>
-    <p style="margin:0;"><b>使用方法</b>：上传名单和喜好关系Excel，设置权重，配置教室布局，然后生成最优座位方案。</p>
-</div>
-""", unsafe_allow_html=True)
+# 自定义CSS样式和页面标题（静态文件只读取一次）
+st.markdown(f"<style>\n{load_static_text('style.css')}</style>", unsafe_allow_html=True)
+st.markdown(load_static_text('header.html'), unsafe_allow_html=True)
 
 # 初始化session state变量
 if 'willing_pairs_by_rank' not in st.session_state:
@@ -99,6 +63,170 @@ if 'willing_headers' not in st.session_state:
 if 'unwilling_headers' not in st.session_state:
     st.session_state.unwilling_headers = []
 
+
+@st.cache_data(show_spinner=False)
+def build_layout(n_cols: int, col_rows: Tuple[int, ...], include_diag: bool, aisles: Tuple[Tuple[int, int], ...]):
+    """按布局参数缓存座位、邻座边和邻接矩阵，布局不变时跨重跑复用"""
+    seats = generate_seats(n_cols, list(col_rows))
+    edges = generate_adjacent_edges(n_cols, list(col_rows), include_diag, list(aisles))
+    return seats, edges, build_adjacency_matrix(seats, edges)
+
+
+@st.cache_data(show_spinner=False)
+def render_layout_png(n_cols: int, col_rows: Tuple[int, ...], include_diag: bool, aisles: Tuple[Tuple[int, int], ...]) -> bytes:
+    """按布局参数缓存布局预览图，布局不变时不再重复绘制matplotlib图形"""
+    _, edges, _ = build_layout(n_cols, col_rows, include_diag, aisles)
+    fig = visualize_layout(n_cols, list(col_rows), edges, list(aisles) or None)
+    buf = io.BytesIO()
+    try:
+        # 界面预览图用低压缩级别，编码更快（PNG无损，只是文件稍大）
+        fig.savefig(buf, format="png", dpi=200, bbox_inches="tight", pil_kwargs={'compress_level': 1})
+    finally:
+        # 保存失败也要释放图形，避免重跑时pyplot持续持有图形对象
+        plt.close(fig)
+    return buf.getvalue()
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def render_plan_image(assignment, seats, n_cols, col_rows, pair_weights, figsize, dpi,
+                      split_visualization, aisle_cols, show_all_lines) -> bytes:
+    """按方案和可视化参数缓存座位分配图，切换无关选项时不重新绘制"""
+    return export_assignment_to_image(
+        assignment, seats, n_cols, col_rows, pair_weights,
+        figsize=figsize, dpi=dpi, split_visualization=split_visualization,
+        aisles=aisle_cols, show_all_lines=show_all_lines
+    )
+
+
+@st.cache_data(show_spinner=False)
+def cached_satisfaction_metrics(assignments, names, seats, positive_pairs, edges, willing_pairs_by_rank, adj_matrix):
+    """一次批量计算全部方案的满足度指标并缓存，界面交互引起的重跑不再重复统计"""
+    return compute_satisfaction_metrics_batch(
+        assignments, names, seats, positive_pairs, edges, willing_pairs_by_rank, adj_matrix=adj_matrix
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def render_plan_excel(assignment, seats, n_cols, col_rows) -> bytes:
+    """按方案缓存Excel座位表"""
+    return export_assignment_to_excel(assignment, seats, n_cols, col_rows)
+
+
+@st.cache_data(show_spinner=False)
+def compute_rank_satisfaction(first_assignment, names, willing_pairs_by_rank, unwilling_pairs_by_rank, adj_matrix):
+    """按方案计算各等级愿意/不愿意关系的满足率，输入不变时界面重跑直接复用
+
+    Returns:
+        Tuple[List[str], List[float], List[str], List[float]]:
+            (愿意等级名称, 愿意满足率, 不愿意等级名称, 不愿意满足率(成功分开的比例))
+    """
+    # 将人名对编码为(等级, 人员索引1, 人员索引2)整数数组，按座位索引批量判断是否相邻；
+    # 只对已分配座位的人编码，含未就座人员的关系对在编码时即被跳过
+    placed_names = [name for name in names if name in first_assignment]
+    seat_of = np.array([first_assignment[name] for name in placed_names], dtype=np.int64)
+
+    # 计算愿意关系各等级满足率
+    willing_satisfaction = []
+    willing_names = []
+
+    if willing_pairs_by_rank and len(willing_pairs_by_rank) > 0:
+        willing_idx = encode_pairs_by_rank(willing_pairs_by_rank, placed_names)
+        willing_adjacent = adj_matrix[seat_of[willing_idx[:, 1]], seat_of[willing_idx[:, 2]]]
+        # 一次bincount得到每个等级的满足对数
+        satisfied_by_rank = np.bincount(
+            willing_idx[:, 0], weights=willing_adjacent, minlength=max(willing_pairs_by_rank) + 1
+        )
+        for rank in sorted(willing_pairs_by_rank.keys()):
+            pairs = willing_pairs_by_rank[rank]
+            if pairs:
+                total_pairs = len(pairs)
+                satisfied_in_level = int(satisfied_by_rank[rank])
+
+                level_rate = (satisfied_in_level / total_pairs) * 100 if total_pairs > 0 else 0
+                willing_satisfaction.append(level_rate)
+                willing_names.append(f'第{rank}顺位愿意')
+
+    # 计算不愿意关系各等级满足率（满足率指成功分开的比例）
+    unwilling_satisfaction = []
+    unwilling_names = []
+
+    if unwilling_pairs_by_rank and len(unwilling_pairs_by_rank) > 0:
+        unwilling_idx = encode_pairs_by_rank(unwilling_pairs_by_rank, placed_names)
+        unwilling_adjacent = adj_matrix[seat_of[unwilling_idx[:, 1]], seat_of[unwilling_idx[:, 2]]]
+        # 不愿意关系的满足是指没有相邻
+        separated_by_rank = np.bincount(
+            unwilling_idx[:, 0], weights=~unwilling_adjacent, minlength=max(unwilling_pairs_by_rank) + 1
+        )
+        for rank in sorted(unwilling_pairs_by_rank.keys()):
+            pairs = unwilling_pairs_by_rank[rank]
+            if pairs:
+                total_pairs = len(pairs)
+                separated_in_level = int(separated_by_rank[rank])
+
+                level_rate = (separated_in_level / total_pairs) * 100 if total_pairs > 0 else 0
+                unwilling_satisfaction.append(level_rate)
+                unwilling_names.append(f'第{rank}顺位不愿意')
+
+    return willing_names, willing_satisfaction, unwilling_names, unwilling_satisfaction
+
+
+def pairs_to_rows(pairs: Iterable[frozenset], relation: str) -> List[List[str]]:
+    """把人员对展开为 [姓名1, 关系类型, 姓名2] 行，跳过不足两人的对"""
+    rows = []
+    for pair in pairs:
+        if len(pair) == 2:
+            a, b = pair
+            rows.append([a, relation, b])
+    return rows
+
+
+def group_preferences(preferences: List[List[str]], like_weights: List[float], dislike_weights: List[float]):
+    """按等级整理喜好关系并计算人员对权重，数据预览和求解共用
+    
+    Returns:
+        Tuple: (按等级的喜欢关系, 按等级的不喜欢关系, 人员对权重字典)
+    """
+    if not preferences:
+        return defaultdict(set), defaultdict(set), {}
+    
+    # 如果有Excel数据，使用已解析的等级数据
+    if st.session_state.willing_pairs_by_rank or st.session_state.unwilling_pairs_by_rank:
+        # 使用Excel中的多等级数据
+        current_willing = st.session_state.willing_pairs_by_rank
+        current_unwilling = st.session_state.unwilling_pairs_by_rank
+        
+        # 确保数据结构正确
+        if not isinstance(current_willing, dict):
+            current_willing = defaultdict(set)
+        if not isinstance(current_unwilling, dict):
+            current_unwilling = defaultdict(set)
+    else:
+        # 解析手动输入的偏好数据为按等级分组的格式
+        current_willing = defaultdict(set)
+        current_unwilling = defaultdict(set)
+        
+        for p in preferences:
+            if len(p) > 2:
+                name1, pref_type, name2 = p[0], p[1], p[2]
+                pair = frozenset([name1, name2])
+                if pref_type == "喜欢":
+                    # 如果有多个等级，需要根据实际等级分配
+                    level = 0 if len(like_weights) == 1 else 1
+                    current_willing[level].add(pair)
+                elif pref_type == "不喜欢":
+                    # 如果有多个等级，需要根据实际等级分配
+                    level = 0 if len(dislike_weights) == 1 else 1
+                    current_unwilling[level].add(pair)
+    
+    pair_weights = compute_pair_weights(
+        current_willing, 
+        current_unwilling,
+        like_weights, 
+        dislike_weights
+    )
+    return current_willing, current_unwilling, pair_weights
+
+
 # 侧边栏配置
 with st.sidebar:
     st.header("📋 配置参数")
@@ -113,6 +241,9 @@ with st.sidebar:
         help="Excel文件第一列为姓名，可包含表头"
     )
     
+    # 解析名单（结果已缓存，侧边栏和数据预览共用）
+    names = load_names_from_excel(names_file) if names_file is not None else []
+    
     # 上传喜好关系文件
     preferences_file = st.file_uploader(
         "上传喜好关系Excel文件（可选）", 
@@ -235,31 +366,14 @@ with st.sidebar:
         help="统一行数：所有列都有相同的行数；自定义：可以为每列设置不同的行数"
     )
     
+    # 根据学生数量动态计算默认行数：每列平均行数向上取整，并限制在输入框范围内
+    default_rows = min(30, max(1, (len(names) + n_cols - 1) // n_cols)) if names else 15
+    
     if layout_mode == "统一行数":
-        # 根据学生数量动态计算默认行数
-        default_rows = 15
-        if names_file is not None:
-            try:
-                temp_names = load_names_from_excel(names_file)
-                if temp_names:
-                    # 计算每列平均行数，向上取整
-                    default_rows = max(1, (len(temp_names) + n_cols - 1) // n_cols)
-            except:
-                pass
         uniform_rows = st.number_input("每列行数", min_value=1, max_value=30, value=default_rows, step=1)
         col_rows = [uniform_rows] * n_cols
     else:
         col_rows = []
-        # 根据学生数量动态计算默认行数
-        default_rows = 15
-        if names_file is not None:
-            try:
-                temp_names = load_names_from_excel(names_file)
-                if temp_names:
-                    # 计算每列平均行数，向上取整
-                    default_rows = max(1, (len(temp_names) + n_cols - 1) // n_cols)
-            except:
-                pass
         for i in range(n_cols):
             rows = st.number_input(f"第{i+1}列行数", min_value=1, max_value=30, value=default_rows, step=1, key=f"col_{i}")
             col_rows.append(rows)
@@ -319,6 +433,11 @@ with st.sidebar:
     debug_mode = st.checkbox("启用调试模式", value=False, help="显示详细的生成过程信息")
     more_info_mode = st.checkbox("更多信息", value=False, help="显示详细的满足率统计和分析信息")
 
+# 生成座位和邻接关系（数据预览和结果计算共用）
+seats, edges, adj_matrix = build_layout(
+    n_cols, tuple(col_rows), include_diag, tuple(aisles) if enable_aisles else ()
+)
+
 # 主区域
 tab1, tab2, tab3 = st.tabs(["数据预览", "结果查看", "使用帮助"])
 
@@ -326,20 +445,15 @@ with tab1:
     st.header("📊 数据预览")
     
     # 处理名单数据
-    names = []
     if names_file is not None:
-        try:
-            names = load_names_from_excel(names_file)
-            st.success(f"✅ 成功加载 {len(names)} 个姓名")
-            
-            # 显示名单预览
-            with st.expander("👥 查看名单详情", expanded=False):
-                cols = st.columns(4)
-                for i, name in enumerate(names):
-                    with cols[i % 4]:
-                        st.write(f"{i+1}. {name}")
-        except Exception as e:
-            st.error(f"❌ 名单文件读取失败：{str(e)}")
+        st.success(f"✅ 成功加载 {len(names)} 个姓名")
+        
+        # 显示名单预览
+        with st.expander("👥 查看名单详情", expanded=False):
+            cols = st.columns(4)
+            for i, name in enumerate(names):
+                with cols[i % 4]:
+                    st.write(f"{i+1}. {name}")
     
     # 处理喜好关系数据
     preferences = []
@@ -375,17 +489,8 @@ with tab1:
                 st.warning("⚠️ 未能自动识别到有效的数据范围，请检查Excel文件格式。")
             
             # 将解析的数据转换为preferences格式
-            for rank, pairs in st.session_state.willing_pairs_by_rank.items():
-                for pair in pairs:
-                    names_list = list(pair)
-                    if len(names_list) >= 2:
-                        preferences.append([names_list[0], "喜欢", names_list[1]])
-            
-            for rank, pairs in st.session_state.unwilling_pairs_by_rank.items():
-                for pair in pairs:
-                    names_list = list(pair)
-                    if len(names_list) >= 2:
-                        preferences.append([names_list[0], "不喜欢", names_list[1]])
+            preferences.extend(pairs_to_rows(chain.from_iterable(st.session_state.willing_pairs_by_rank.values()), "喜欢"))
+            preferences.extend(pairs_to_rows(chain.from_iterable(st.session_state.unwilling_pairs_by_rank.values()), "不喜欢"))
             
             st.success(f"✅ 成功加载 {len(preferences)} 条喜好关系")
             
@@ -397,14 +502,13 @@ with tab1:
                 st.info(f"📊 数据解析详情：\n- 喜欢关系范围：{actual_willing_range}\n- 不喜欢关系范围：{actual_unwilling_range}\n- 工作表：{sheet_name or '第一个工作表'}")
                 
                 # 显示解析的等级信息
-                level_info = []
-                for i, (h1, h2) in enumerate(st.session_state.willing_headers):
-                    level_info.append(h1 or f"喜欢等级{i+1}")
-                for i, (h1, h2) in enumerate(st.session_state.unwilling_headers):
-                    level_info.append(h1 or f"不喜欢等级{i+1}")
+                level_info = "\n".join([
+                    *(h1 or f"喜欢等级{i+1}" for i, (h1, _) in enumerate(st.session_state.willing_headers)),
+                    *(h1 or f"不喜欢等级{i+1}" for i, (h1, _) in enumerate(st.session_state.unwilling_headers)),
+                ])
                 
                 if level_info:
-                    st.success("✅ 识别的等级列：\n" + "\n".join(level_info))
+                    st.success("✅ 识别的等级列：\n" + level_info)
         except Exception as e:
             st.error(f"❌ 喜好关系文件读取失败：{str(e)}")
             st.error("请检查数据范围设置是否正确，确保Excel文件格式符合要求。")
@@ -421,6 +525,9 @@ with tab1:
         except Exception as e:
             st.error(f"❌ 手动输入解析失败：{str(e)}")
     
+    # 按等级整理喜好关系并计算权重（数据预览和求解共用）
+    current_willing, current_unwilling, pair_weights = group_preferences(preferences, like_weights, dislike_weights)
+    
     # 显示喜好关系预览
     if preferences:
         with st.expander("💕 查看喜好关系详情", expanded=False):
@@ -453,7 +560,7 @@ with tab1:
                     if willing_pairs[rank]:
                         header_name = willing_headers[rank-1][0] if rank-1 < len(willing_headers) else f"喜欢等级{rank}"
                         tab_names.append(f"😊 {header_name}")
-                        pairs_list = [[list(pair)[0], "喜欢", list(pair)[1]] for pair in willing_pairs[rank]]
+                        pairs_list = pairs_to_rows(willing_pairs[rank], "喜欢")
                         tab_contents.append(("like", pairs_list, rank))
                 
                 # 添加不喜欢等级标签页
@@ -461,7 +568,7 @@ with tab1:
                     if unwilling_pairs[rank]:
                         header_name = unwilling_headers[rank-1][0] if rank-1 < len(unwilling_headers) else f"不喜欢等级{rank}"
                         tab_names.append(f"😤 {header_name}")
-                        pairs_list = [[list(pair)[0], "不喜欢", list(pair)[1]] for pair in unwilling_pairs[rank]]
+                        pairs_list = pairs_to_rows(unwilling_pairs[rank], "不喜欢")
                         tab_contents.append(("dislike", pairs_list, rank))
                 
                 if tab_names:
@@ -513,10 +620,6 @@ with tab1:
     if names:
         st.subheader("🪑 座位布局预览")
         
-        # 生成座位和邻接关系
-        seats = generate_seats(n_cols, col_rows)
-        edges = generate_adjacent_edges(n_cols, col_rows, include_diag, aisles if enable_aisles else [])
-        
         # 显示布局信息
         col1, col2 = st.columns(2)
         with col1:
@@ -530,35 +633,6 @@ with tab1:
         with col2:
             st.info(f"🔗 邻接边数：{len(edges)}")
             if preferences:
-                # 如果有Excel数据，使用已解析的等级数据
-                if st.session_state.willing_pairs_by_rank or st.session_state.unwilling_pairs_by_rank:
-                    # 使用Excel中的多等级数据
-                    current_willing = st.session_state.willing_pairs_by_rank
-                    current_unwilling = st.session_state.unwilling_pairs_by_rank
-                else:
-                    # 解析手动输入的偏好数据为按等级分组的格式
-                    current_willing = defaultdict(set)
-                    current_unwilling = defaultdict(set)
-                    
-                    for p in preferences:
-                        if len(p) > 2:
-                            name1, pref_type, name2 = p[0], p[1], p[2]
-                            pair = frozenset([name1, name2])
-                            if pref_type == "喜欢":
-                                # 如果有多个等级，需要根据实际等级分配
-                                level = 0 if len(like_weights) == 1 else 1
-                                current_willing[level].add(pair)
-                            elif pref_type == "不喜欢":
-                                # 如果有多个等级，需要根据实际等级分配
-                                level = 0 if len(dislike_weights) == 1 else 1
-                                current_unwilling[level].add(pair)
-                
-                pair_weights = compute_pair_weights(
-                    current_willing, 
-                    current_unwilling,
-                    like_weights, 
-                    dislike_weights
-                )
                 st.info(f"⚖️ 权重对数：{len(pair_weights)}")
                 
                 # 显示等级统计信息
@@ -568,24 +642,27 @@ with tab1:
                     st.info(f"📊 等级统计：{len(current_willing)}个喜欢等级({willing_count}对)，{len(current_unwilling)}个不喜欢等级({unwilling_count}对)")
                     
                     # 显示详细等级统计
-                    level_stats = []
-                    for rank, pairs in current_willing.items():
-                        level_stats.append(f"喜欢等级{rank}: {len(pairs)}对")
-                    for rank, pairs in current_unwilling.items():
-                        level_stats.append(f"不喜欢等级{rank}: {len(pairs)}对")
+                    level_stats = "\n".join([
+                        *(f"喜欢等级{rank}: {len(pairs)}对" for rank, pairs in current_willing.items()),
+                        *(f"不喜欢等级{rank}: {len(pairs)}对" for rank, pairs in current_unwilling.items()),
+                    ])
                     
                     if level_stats:
-                        st.info("📊 详细等级统计：\n" + "\n".join(level_stats))
+                        st.info("📊 详细等级统计：\n" + level_stats)
         
         # 可视化布局
-        try:
-            fig = visualize_layout(n_cols, col_rows, edges, aisles if enable_aisles else None)
-            
-            st.pyplot(fig, use_container_width=True)
-        except Exception as e:
-            st.error(f"❌ 布局可视化失败：{str(e)}")
+        if show_visualization:
+            try:
+                layout_png = render_layout_png(
+                    n_cols, tuple(col_rows), include_diag, tuple(aisles) if enable_aisles else ()
+                )
+                st.image(layout_png, use_container_width=True)
+            except Exception as e:
+                st.error(f"❌ 布局可视化失败：{str(e)}")
 
-with tab2:
+@st.fragment
+def render_results_tab():
+    """结果页以片段方式运行：生成方案、查看和下载结果时只重跑本页，不重新执行侧边栏和数据预览"""
     st.header("🎯 座位分配结果")
     
     if not names:
@@ -597,52 +674,10 @@ with tab2:
         if st.button("🚀 计算最优座位分配", type="primary", use_container_width=True):
             with st.spinner("🔄 正在计算最优座位分配..."):
                 try:
-                    # 生成座位和邻接关系
-                    seats = generate_seats(n_cols, col_rows)
-                    edges = generate_adjacent_edges(n_cols, col_rows, include_diag, aisles if enable_aisles else [])
-                    
-                    # 计算权重
-                    pair_weights = {}
-                    if preferences:
-                        # 如果有Excel数据，使用已解析的等级数据
-                        if st.session_state.willing_pairs_by_rank or st.session_state.unwilling_pairs_by_rank:
-                            # 使用Excel中的多等级数据
-                            current_willing = st.session_state.willing_pairs_by_rank
-                            current_unwilling = st.session_state.unwilling_pairs_by_rank
-                            
-                            # 确保数据结构正确
-                            if not isinstance(current_willing, dict):
-                                current_willing = defaultdict(set)
-                            if not isinstance(current_unwilling, dict):
-                                current_unwilling = defaultdict(set)
-                        else:
-                            # 解析手动输入的偏好数据为按等级分组的格式
-                            current_willing = defaultdict(set)
-                            current_unwilling = defaultdict(set)
-                            
-                            for p in preferences:
-                                if len(p) > 2:
-                                    name1, pref_type, name2 = p[0], p[1], p[2]
-                                    pair = frozenset([name1, name2])
-                                    if pref_type == "喜欢":
-                                        # 如果有多个等级，需要根据实际等级分配
-                                        level = 0 if len(like_weights) == 1 else 1
-                                        current_willing[level].add(pair)
-                                    elif pref_type == "不喜欢":
-                                        # 如果有多个等级，需要根据实际等级分配
-                                        level = 0 if len(dislike_weights) == 1 else 1
-                                        current_unwilling[level].add(pair)
-                        
-                        pair_weights = compute_pair_weights(
-                            current_willing, 
-                            current_unwilling,
-                            like_weights, 
-                            dislike_weights
-                        )
-                    
                     # 存储到session state
                     st.session_state.seats = seats
                     st.session_state.edges = edges
+                    st.session_state.adj_matrix = adj_matrix
                     st.session_state.pair_weights = pair_weights
                     st.session_state.names = names
                     
@@ -660,7 +695,6 @@ with tab2:
                         debug_info = []
                         
                         # 重定向调试输出
-                        import io
                         import sys
                         from contextlib import redirect_stdout
                         
@@ -678,6 +712,13 @@ with tab2:
                         if debug_text:
                             with st.expander("🔍 调试信息", expanded=True):
                                 st.text(debug_text)
+                    elif top_n > 1:
+                        # 多个方案在子进程中并行求解，不阻塞页面线程
+                        results = solve_top_n_parallel(
+                            names, seats, pair_weights, edges,
+                            top_n=top_n, time_limit_s=time_limit,
+                            progress_callback=progress_callback
+                        )
                     else:
                         results = solve_top_n_assignments(
                             names, seats, pair_weights, edges,
@@ -706,78 +747,19 @@ with tab2:
             st.subheader("📋 分配方案")
             
             # 计算各等级满足率统计（只计算一次，使用第一个方案）
+            # 会话状态只读取一次，下面的统计都使用局部变量
+            plan_names = st.session_state.names
             first_assignment = st.session_state.results[0].assignment
             willing_pairs_data = st.session_state.get('willing_pairs_by_rank', {})
             unwilling_pairs_data = st.session_state.get('unwilling_pairs_by_rank', {})
+            plan_adj_matrix = st.session_state.get('adj_matrix')
+            if plan_adj_matrix is None:
+                plan_adj_matrix = build_adjacency_matrix(st.session_state.seats, st.session_state.edges)
+                st.session_state.adj_matrix = plan_adj_matrix
             
-            # 计算愿意关系各等级满足率
-            willing_satisfaction = []
-            willing_names = []
-            
-            if willing_pairs_data and len(willing_pairs_data) > 0:
-                for rank in sorted(willing_pairs_data.keys()):
-                    pairs = willing_pairs_data[rank]
-                    if pairs:
-                        satisfied_in_level = 0
-                        total_pairs = len(pairs)
-                        
-                        for pair in pairs:
-                             pair_list = list(pair)
-                             if len(pair_list) >= 2:
-                                 name1, name2 = pair_list[0], pair_list[1]
-                                 if name1 in first_assignment and name2 in first_assignment:
-                                     seat1_idx = first_assignment[name1]
-                                     seat2_idx = first_assignment[name2]
-                                     # 检查这两个座位是否相邻
-                                     seat1_coord = st.session_state.seats[seat1_idx]
-                                     seat2_coord = st.session_state.seats[seat2_idx]
-                                     is_adjacent = False
-                                     for (c1, r1), (c2, r2) in st.session_state.edges:
-                                         if ((c1, r1) == seat1_coord and (c2, r2) == seat2_coord) or \
-                                            ((c1, r1) == seat2_coord and (c2, r2) == seat1_coord):
-                                             is_adjacent = True
-                                             break
-                                     if is_adjacent:
-                                         satisfied_in_level += 1
-                        
-                        level_rate = (satisfied_in_level / total_pairs) * 100 if total_pairs > 0 else 0
-                        willing_satisfaction.append(level_rate)
-                        willing_names.append(f'第{rank}顺位愿意')
-            
-            # 计算不愿意关系各等级满足率（满足率指成功分开的比例）
-            unwilling_satisfaction = []
-            unwilling_names = []
-            
-            if unwilling_pairs_data and len(unwilling_pairs_data) > 0:
-                for rank in sorted(unwilling_pairs_data.keys()):
-                    pairs = unwilling_pairs_data[rank]
-                    if pairs:
-                        separated_in_level = 0
-                        total_pairs = len(pairs)
-                        
-                        for pair in pairs:
-                            pair_list = list(pair)
-                            if len(pair_list) >= 2:
-                                name1, name2 = pair_list[0], pair_list[1]
-                                if name1 in first_assignment and name2 in first_assignment:
-                                    seat1_idx = first_assignment[name1]
-                                    seat2_idx = first_assignment[name2]
-                                    # 检查这两个座位是否相邻
-                                    seat1_coord = st.session_state.seats[seat1_idx]
-                                    seat2_coord = st.session_state.seats[seat2_idx]
-                                    is_adjacent = False
-                                    for (c1, r1), (c2, r2) in st.session_state.edges:
-                                        if ((c1, r1) == seat1_coord and (c2, r2) == seat2_coord) or \
-                                           ((c1, r1) == seat2_coord and (c2, r2) == seat1_coord):
-                                            is_adjacent = True
-                                            break
-                                    # 不愿意关系的满足是指没有相邻
-                                    if not is_adjacent:
-                                        separated_in_level += 1
-                        
-                        level_rate = (separated_in_level / total_pairs) * 100 if total_pairs > 0 else 0
-                        unwilling_satisfaction.append(level_rate)
-                        unwilling_names.append(f'第{rank}顺位不愿意')
+            willing_names, willing_satisfaction, unwilling_names, unwilling_satisfaction = compute_rank_satisfaction(
+                first_assignment, plan_names, willing_pairs_data, unwilling_pairs_data, plan_adj_matrix
+            )
             
             # 显示各等级满足率统计（只显示一次）
             if willing_satisfaction or unwilling_satisfaction:
@@ -812,267 +794,226 @@ with tab2:
             else:
                 st.info("💡 当前数据为单一等级，如需查看多等级满足率统计，请在Excel中按列分别填写不同等级的喜好关系")
             
-            for i, result in enumerate(st.session_state.results):
-                assignment = result.assignment
-                objective = result.objective
+            # 提取过道列索引（使用左侧列索引，因为过道绘制在左侧列的右边）
+            aisle_cols = [left for left, _ in aisles] if enable_aisles and aisles else None
+            
+            # 座位编号和行列号（从1开始）查找表，各方案共用；末尾为越界索引的哨兵行
+            n_plan_seats = len(st.session_state.seats)
+            seat_labels = np.array(
+                [get_seat_info(idx, st.session_state.seats) for idx in range(n_plan_seats)] + ["未知座位"], dtype=object
+            )
+            seat_cols_rows = np.zeros((n_plan_seats + 1, 2), dtype=np.int64)
+            if n_plan_seats:
+                seat_cols_rows[:n_plan_seats] = np.asarray(st.session_state.seats, dtype=np.int64) + 1
+            
+            # 提取正向关系对（各方案相同，只提取一次）
+            positive_pairs = frozenset(pair for pair, weight in st.session_state.pair_weights.items() if weight > 0)
+            
+            # 各方案的满足度指标（已缓存）用于概览表，只有选中的方案才渲染图片、Excel和明细
+            plan_results = st.session_state.results
+            plan_metrics = cached_satisfaction_metrics(
+                [result.assignment for result in plan_results], 
+                plan_names, 
+                st.session_state.seats, 
+                positive_pairs, 
+                st.session_state.edges,
+                willing_pairs_data,
+                plan_adj_matrix
+            )
+            # metrics为元组: (满足的人数, 有喜好关系的总人数, 满足的对数, 第一意愿满足率)
+            plan_rates = [round((m[0] / m[1] * 100) if m[1] > 0 else 0) for m in plan_metrics]
+            
+            if len(plan_results) > 1:
+                st.dataframe(pd.DataFrame({
+                    "方案": [f"方案 {k+1}" for k in range(len(plan_results))],
+                    "目标函数值": [round(result.objective, 2) for result in plan_results],
+                    "满足率(%)": plan_rates,
+                    "满足对数": [m[2] for m in plan_metrics]
+                }), use_container_width=True, hide_index=True)
+            
+            i = st.radio(
+                "🎯 查看方案",
+                range(len(plan_results)),
+                format_func=lambda k: f"方案 {k+1} - 满足率 {plan_rates[k]}%",
+                horizontal=True
+            )
+            result = plan_results[i]
+            assignment = result.assignment
+            objective = result.objective
+            n_satisfied, n_total_people_with_pref, n_satisfied_pairs, first_preference_rate = plan_metrics[i]
+            satisfaction_rate = plan_rates[i]
+            
+            with st.container(border=True):
+                # 选中方案的图片和Excel只生成一次，预览和各下载按钮共用
+                excel_bytes = render_plan_excel(assignment, st.session_state.seats, n_cols, col_rows)
+                img_bytes = render_plan_image(
+                    assignment, st.session_state.seats, n_cols, col_rows, st.session_state.pair_weights,
+                    (viz_figsize_w, viz_figsize_h), viz_dpi, split_visualization, aisle_cols, show_all_lines
+                ) if show_visualization else None
                 
-                # 计算满足度指标
-                # 提取正向关系对
-                positive_pairs = set()
-                for pair, weight in st.session_state.pair_weights.items():
-                    if weight > 0:
-                        positive_pairs.add(pair)
+                # 显示可视化结果
+                if show_visualization:
+                    if split_visualization:
+                        # 拆分可视化返回ZIP文件，需要特殊处理
+                        # 从ZIP中提取图片并显示
+                        try:
+                            with zipfile.ZipFile(io.BytesIO(img_bytes), 'r') as zip_file:
+                                # 显示正向关系图
+                                if 'positive_relationships.png' in zip_file.namelist():
+                                    pos_img = zip_file.read('positive_relationships.png')
+                                    st.image(pos_img, caption=f"方案 {i+1} - 正向关系图", use_container_width=True)
+                                
+                                # 显示负向关系图
+                                if 'negative_relationships.png' in zip_file.namelist():
+                                    neg_img = zip_file.read('negative_relationships.png')
+                                    st.image(neg_img, caption=f"方案 {i+1} - 负向关系图", use_container_width=True)
+                        except Exception as e:
+                            st.error(f"图片预览失败: {str(e)}")
+                            st.info("请使用下载按钮获取分离的图片文件。")
+                    else:
+                        st.image(img_bytes, caption=f"方案 {i+1} 座位分配图", use_container_width=True)
+                else:
+                    st.info("可视化已关闭，如需查看座位分配图请在左侧开启可视化选项。")
                 
-                metrics = compute_satisfaction_metrics(
-                    assignment, 
-                    st.session_state.names, 
-                    st.session_state.seats, 
-                    positive_pairs, 
-                    st.session_state.edges,
-                    st.session_state.get('willing_pairs_by_rank', {})
-                )
+                # 基本统计信息（始终显示）
+                st.subheader("📊 基本统计")
                 
-                # metrics返回元组: (满足的人数, 有喜好关系的总人数, 满足的对数, 第一意愿满足率)
-                n_satisfied = metrics[0]
-                n_total_people_with_pref = metrics[1]
-                n_satisfied_pairs = metrics[2]
-                first_preference_rate = metrics[3]
+                st.markdown(f"""
+                <div class="metric-grid">
+                    <div class="metric-container">
+                        <h4>😊 满足率</h4>
+                        <h2 style="color: {'#28a745' if satisfaction_rate >= 70 else '#ffc107' if satisfaction_rate >= 40 else '#dc3545'};">{satisfaction_rate}%</h2>
+                        <small>有喜好关系且满足的人数占比</small>
+                    </div>
+                    <div class="metric-container">
+                        <h4>🎯 目标函数值</h4>
+                        <h2 style="color: #4361ee;">{objective:.2f}</h2>
+                    </div>
+                    <div class="metric-container">
+                        <h4>💑 满足对数</h4>
+                        <h2 style="color: #17a2b8;">{n_satisfied_pairs} 对</h2>
+                    </div>
+                </div>
+                """, unsafe_allow_html=True)
                 
-                # 计算满足率
-                satisfaction_rate = round((n_satisfied / n_total_people_with_pref * 100) if n_total_people_with_pref > 0 else 0)
+                # 下载按钮（始终显示）
+                st.subheader("📥 下载选项")
                 
-                with st.expander(f"🎯 方案 {i+1} - 满足率 {satisfaction_rate}%", expanded=(i==0)):
-                    
-                    # 显示可视化结果
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.download_button(
+                        label="📊 下载Excel座位表",
+                        data=excel_bytes,
+                        file_name=f"座位方案_{i+1}.xlsx",
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                        use_container_width=True,
+                        key=f"download_excel_summary_{i}"
+                    )
+                
+                with col2:
                     if show_visualization:
-                        # 提取过道列索引（使用左侧列索引，因为过道绘制在左侧列的右边）
-                        aisle_cols = [left for left, right in aisles] if enable_aisles and aisles else None
-                        img_bytes = export_assignment_to_image(
-                            assignment, st.session_state.seats, n_cols, col_rows, st.session_state.pair_weights,
-                            figsize=(viz_figsize_w, viz_figsize_h), dpi=viz_dpi, split_visualization=split_visualization,
-                            aisles=aisle_cols, show_all_lines=show_all_lines
-                        )
                         if split_visualization:
-                            # 拆分可视化返回ZIP文件，需要特殊处理
-                            import zipfile
-                            import io
-                            
-                            # 从ZIP中提取图片并显示
-                            try:
-                                with zipfile.ZipFile(io.BytesIO(img_bytes), 'r') as zip_file:
-                                    # 显示正向关系图
-                                    if 'positive_relationships.png' in zip_file.namelist():
-                                        pos_img = zip_file.read('positive_relationships.png')
-                                        st.image(pos_img, caption=f"方案 {i+1} - 正向关系图", use_container_width=True)
-                                    
-                                    # 显示负向关系图
-                                    if 'negative_relationships.png' in zip_file.namelist():
-                                        neg_img = zip_file.read('negative_relationships.png')
-                                        st.image(neg_img, caption=f"方案 {i+1} - 负向关系图", use_container_width=True)
-                            except Exception as e:
-                                st.error(f"图片预览失败: {str(e)}")
-                                st.info("请使用下载按钮获取分离的图片文件。")
+                            st.download_button(
+                                label="📦 下载分离图片包 (ZIP)",
+                                data=img_bytes,
+                                file_name=f"座位方案_{i+1}_分离图片.zip",
+                                mime="application/zip",
+                                use_container_width=True,
+                                key=f"download_zip_summary_{i}"
+                            )
                         else:
-                            st.image(img_bytes, caption=f"方案 {i+1} 座位分配图", use_container_width=True)
-                    else:
-                        st.info("可视化已关闭，如需查看座位分配图请在左侧开启可视化选项。")
-                    
-                    # 基本统计信息（始终显示）
-                    st.subheader("📊 基本统计")
+                            st.download_button(
+                                label="🖼️ 下载座位分配图",
+                                data=img_bytes,
+                                file_name=f"座位方案_{i+1}.png",
+                                mime="image/png",
+                                use_container_width=True,
+                                key=f"download_img_summary_{i}"
+                            )
+                
+                # 更多信息（仅在启用时显示）
+                if more_info_mode:
+                    # 显示详细统计信息
+                    st.subheader("📊 详细统计")
                     
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        st.markdown(f"""
+                    st.markdown(f"""
+                    <div class="metric-grid">
                         <div class="metric-container">
-                            <h4>😊 满足率</h4>
-                            <h2 style="color: {'#28a745' if satisfaction_rate >= 70 else '#ffc107' if satisfaction_rate >= 40 else '#dc3545'};">{satisfaction_rate}%</h2>
-                            <small>有喜好关系且满足的人数占比</small>
+                            <h4>👥 有喜好关系的人数</h4>
+                            <h2>{n_total_people_with_pref}</h2>
                         </div>
-                        """, unsafe_allow_html=True)
-                    
-                    with col2:
-                        st.markdown(f"""
                         <div class="metric-container">
-                            <h4>🎯 目标函数值</h4>
-                            <h2 style="color: #4361ee;">{objective:.2f}</h2>
+                            <h4>✅ 喜好被满足的人数</h4>
+                            <h2 style="color: #28a745;">{n_satisfied}</h2>
                         </div>
-                        """, unsafe_allow_html=True)
+                        <div class="metric-container">
+                            <h4>🥇 第一意愿满足率</h4>
+                            <h2 style="color: {'#28a745' if first_preference_rate >= 70 else '#ffc107' if first_preference_rate >= 40 else '#dc3545'};">{first_preference_rate:.1f}%</h2>
+                            <small>最高等级喜好关系的满足率</small>
+                        </div>
+                    </div>
+                    """, unsafe_allow_html=True)
+                    
+                    # 添加统计图表
+                    st.subheader("📈 统计图表")
                     
-                    with col3:
+                    # 满足情况比例条（HTML绘制，避免每个方案创建matplotlib图）
+                    if n_total_people_with_pref > 0:
+                        satisfied_pct = n_satisfied / n_total_people_with_pref * 100
                         st.markdown(f"""
                         <div class="metric-container">
-                            <h4>💑 满足对数</h4>
-                            <h2 style="color: #17a2b8;">{n_satisfied_pairs} 对</h2>
+                            <h4>喜好关系满足情况</h4>
+                            <div class="ratio-bar">
+                                <div style="width: {satisfied_pct:.1f}%; background: #28a745;">满足 {satisfied_pct:.1f}%</div>
+                                <div style="width: {100 - satisfied_pct:.1f}%; background: #dc3545;">未满足 {100 - satisfied_pct:.1f}%</div>
+                            </div>
                         </div>
                         """, unsafe_allow_html=True)
+                    # 下载按钮
+                    st.download_button(
+                        label="📊 下载Excel座位表",
+                        data=excel_bytes,
+                        file_name=f"座位方案_{i+1}.xlsx",
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                        use_container_width=True,
+                        key=f"download_excel_detail_{i}"
+                    )
                     
-                    # 下载按钮（始终显示）
-                    st.subheader("📥 下载选项")
-                    
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        excel_bytes = export_assignment_to_excel(
-                            assignment, st.session_state.seats, n_cols, col_rows
-                        )
-                        
-                        st.download_button(
-                            label="📊 下载Excel座位表",
-                            data=excel_bytes,
-                            file_name=f"座位方案_{i+1}.xlsx",
-                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                            use_container_width=True,
-                            key=f"download_excel_summary_{i}"
-                        )
-                    
-                    with col2:
-                        if show_visualization:
-                            # 提取过道列索引（使用左侧列索引，因为过道绘制在左侧列的右边）
-                            aisle_cols = [left for left, right in aisles] if enable_aisles and aisles else None
-                            download_img_bytes = export_assignment_to_image(
-                                assignment, st.session_state.seats, n_cols, col_rows, st.session_state.pair_weights,
-                                figsize=(viz_figsize_w, viz_figsize_h), dpi=viz_dpi, split_visualization=split_visualization,
-                                aisles=aisle_cols, show_all_lines=show_all_lines
+                    if show_visualization:
+                        if split_visualization:
+                            st.download_button(
+                                label="📦 下载分离图片包 (ZIP)",
+                                data=img_bytes,
+                                file_name=f"座位方案_{i+1}_分离图片.zip",
+                                mime="application/zip",
+                                use_container_width=True
                             )
-                            
-                            if split_visualization:
-                                st.download_button(
-                                    label="📦 下载分离图片包 (ZIP)",
-                                    data=download_img_bytes,
-                                    file_name=f"座位方案_{i+1}_分离图片.zip",
-                                    mime="application/zip",
-                                    use_container_width=True,
-                                    key=f"download_zip_summary_{i}"
-                                )
-                            else:
-                                st.download_button(
-                                    label="🖼️ 下载座位分配图",
-                                    data=download_img_bytes,
-                                    file_name=f"座位方案_{i+1}.png",
-                                    mime="image/png",
-                                    use_container_width=True,
-                                    key=f"download_img_summary_{i}"
-                                )
-                    
-                    # 更多信息（仅在启用时显示）
-                    if more_info_mode:
-                        # 显示详细统计信息
-                        st.subheader("📊 详细统计")
-                        
-                        col1, col2, col3 = st.columns(3)
-                        with col1:
-                            st.markdown(f"""
-                            <div class="metric-container">
-                                <h4>👥 有喜好关系的人数</h4>
-                                <h2>{n_total_people_with_pref}</h2>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        
-                        with col2:
-                            st.markdown(f"""
-                            <div class="metric-container">
-                                <h4>✅ 喜好被满足的人数</h4>
-                                <h2 style="color: #28a745;">{n_satisfied}</h2>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        
-                        with col3:
-                            st.markdown(f"""
-                            <div class="metric-container">
-                                <h4>🥇 第一意愿满足率</h4>
-                                <h2 style="color: {'#28a745' if first_preference_rate >= 70 else '#ffc107' if first_preference_rate >= 40 else '#dc3545'};">{first_preference_rate:.1f}%</h2>
-                                <small>最高等级喜好关系的满足率</small>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        
-                        # 添加统计图表
-                        st.subheader("📈 统计图表")
-                        
-                        # 创建满足率饼图
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            fig_pie, ax_pie = plt.subplots(figsize=(6, 4))
-                            satisfied_count = n_satisfied
-                            unsatisfied_count = n_total_people_with_pref - n_satisfied
-                            
-                            if n_total_people_with_pref > 0:
-                                labels = ['满足', '未满足']
-                                sizes = [satisfied_count, unsatisfied_count]
-                                colors = ['#28a745', '#dc3545']
-                                
-                                ax_pie.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90)
-                                ax_pie.set_title('喜好关系满足情况', fontsize=12, fontweight='bold')
-                                
-                                st.pyplot(fig_pie, use_container_width=True)
-                        
+                        else:
+                            st.download_button(
+                                label="🖼️ 下载座位分配图",
+                                data=img_bytes,
+                                file_name=f"座位方案_{i+1}.png",
+                                mime="image/png",
+                                use_container_width=True
+                            )
+                
+                # 显示详细分配信息
+                st.subheader("📝 详细座位分配")
+                
+                # 创建座位分配表格：越界索引统一映射到末尾的"未知座位"哨兵行
+                idx_arr = np.fromiter(assignment.values(), dtype=np.int64, count=len(assignment))
+                safe_idx = np.where((idx_arr >= 0) & (idx_arr < n_plan_seats), idx_arr, n_plan_seats)
+                df_assignment = pd.DataFrame({
+                    "姓名": list(assignment.keys()),
+                    "座位编号": seat_labels[safe_idx],
+                    "列": seat_cols_rows[safe_idx, 0],
+                    "行": seat_cols_rows[safe_idx, 1]
+                })
+                st.dataframe(df_assignment, use_container_width=True, hide_index=True)
 
-                        
 
-                        
-                        # 下载按钮
-                        excel_bytes = export_assignment_to_excel(
-                            assignment, st.session_state.seats, n_cols, col_rows
-                        )
-                        
-                        st.download_button(
-                            label="📊 下载Excel座位表",
-                            data=excel_bytes,
-                            file_name=f"座位方案_{i+1}.xlsx",
-                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                            use_container_width=True,
-                            key=f"download_excel_detail_{i}"
-                        )
-                        
-                        if show_visualization:
-                            # 提取过道列索引（使用左侧列索引，因为过道绘制在左侧列的右边）
-                            aisle_cols = [left for left, right in aisles] if enable_aisles and aisles else None
-                            download_img_bytes = export_assignment_to_image(
-                                assignment, st.session_state.seats, n_cols, col_rows, st.session_state.pair_weights,
-                                figsize=(viz_figsize_w, viz_figsize_h), dpi=viz_dpi, split_visualization=split_visualization,
-                                aisles=aisle_cols, show_all_lines=show_all_lines
-                            )
-                            
-                            if split_visualization:
-                                st.download_button(
-                                    label="📦 下载分离图片包 (ZIP)",
-                                    data=download_img_bytes,
-                                    file_name=f"座位方案_{i+1}_分离图片.zip",
-                                    mime="application/zip",
-                                    use_container_width=True
-                                )
-                            else:
-                                st.download_button(
-                                    label="🖼️ 下载座位分配图",
-                                    data=download_img_bytes,
-                                    file_name=f"座位方案_{i+1}.png",
-                                    mime="image/png",
-                                    use_container_width=True
-                                )
-                    
-                    # 显示详细分配信息
-                    st.subheader("📝 详细座位分配")
-                    
-                    # 创建座位分配表格
-                    assignment_data = []
-                    for name, seat_idx in assignment.items():
-                        seat_info = get_seat_info(seat_idx, st.session_state.seats)
-                        if 0 <= seat_idx < len(st.session_state.seats):
-                            col, row = st.session_state.seats[seat_idx]
-                            assignment_data.append({
-                                "姓名": name,
-                                "座位编号": seat_info,
-                                "列": col + 1,
-                                "行": row + 1
-                            })
-                        else:
-                            assignment_data.append({
-                                "姓名": name,
-                                "座位编号": "未知座位",
-                                "列": 0,
-                                "行": 0
-                            })
-                    
-                    df_assignment = pd.DataFrame(assignment_data)
-                    st.dataframe(df_assignment, use_container_width=True, hide_index=True)
+with tab2:
+    render_results_tab()
 
 with tab3:
     st.header("📖 使用帮助")
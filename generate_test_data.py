@@ -6,6 +6,7 @@
 """
 
 from test_data_generator import TestDataGenerator
+from openpyxl.utils import get_column_letter
 import os
 
 def main():
@@ -70,9 +71,11 @@ def main():
                 f.write(f"不喜好等级数: {unwilling_levels}\n\n")
                 
                 f.write("建议的单元格范围配置:\n")
-                willing_range = f"A1:{chr(ord('A') + willing_levels * 2 - 1)}50"
-                unwilling_start = chr(ord('A') + willing_levels * 2 + 1)
-                unwilling_end = chr(ord(unwilling_start) + unwilling_levels * 2 - 1)
+                # 列号按Excel规则换算为字母（超过Z列时为AA、AB…）
+                willing_range = f"A1:{get_column_letter(willing_levels * 2)}50"
+                unwilling_start_idx = willing_levels * 2 + 2
+                unwilling_start = get_column_letter(unwilling_start_idx)
+                unwilling_end = get_column_letter(unwilling_start_idx + unwilling_levels * 2 - 1)
                 unwilling_range = f"{unwilling_start}1:{unwilling_end}50"
                 
                 f.write(f"喜好关系范围: {willing_range}\n")
@@ -6,6 +6,7 @@
 
 import sys
 import os
+import importlib.util
 
 def check_python_version():
     """检查Python版本"""
@@ -27,18 +28,22 @@ def check_dependencies():
         'PIL'
     ]
     
+    # 只查找模块规格而不真正导入，避免启动检查加载ortools等C扩展
+    module_names = {'ortools': 'ortools.sat.python.cp_model'}
+    
     missing_packages = []
+    # 自动安装后重新检查时，需要清除导入系统缓存的目录列表
+    importlib.invalidate_caches()
     
     for package in required_packages:
         try:
-            if package == 'PIL':
-                __import__('PIL')
-            elif package == 'ortools':
-                __import__('ortools.sat.python.cp_model')
-            else:
-                __import__(package)
-            print(f"✓ {package} 已安装")
+            installed = importlib.util.find_spec(module_names.get(package, package)) is not None
         except ImportError:
+            # 父包缺失时find_spec会直接抛出ModuleNotFoundError
+            installed = False
+        if installed:
+            print(f"✓ {package} 已安装")
+        else:
             print(f"✗ {package} 未安装")
             missing_packages.append(package)
     
@@ -64,12 +69,16 @@ def install_missing_packages(packages):
     import subprocess
     try:
         cmd = [sys.executable, '-m', 'pip', 'install'] + install_list
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode == 0:
+        # 逐行转发pip输出，下载大型wheel时可实时看到进度，也不在内存中缓存全部输出
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+        for line in proc.stdout:
+            print(line, end='')
+        proc.wait()
+        if proc.returncode == 0:
             print("✓ 依赖包安装成功")
             return True
         else:
-            print(f"✗ 安装失败: {result.stderr}")
+            print(f"✗ 安装失败，pip退出码: {proc.returncode}")
             return False
     except Exception as e:
         print(f"✗ 安装过程出错: {e}")
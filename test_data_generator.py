@@ -5,14 +5,70 @@
 用于生成座位分配系统的测试数据，包含各种复杂情况
 """
 
-import pandas as pd
-import random
+import csv
+import io
+import zipfile
+import numpy as np
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
 import string
-from typing import List, Tuple, Dict, Optional
+from typing import List, Tuple, Dict, Optional, Iterable, Sequence, Union, BinaryIO
 import argparse
+from itertools import chain, repeat
 import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+def _write_rows_to_excel(output_file: Union[str, BinaryIO], rows: Iterable[Sequence[str]], sheet_name: str = "Sheet1"):
+    """以只写（流式）模式把行数据写入Excel，空字符串写为空单元格
+    
+    Args:
+        output_file: 输出文件路径或二进制文件对象
+        rows: 行数据（可为惰性迭代器），第一行为表头
+        sheet_name: 工作表名称
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title=sheet_name)
+    for row in rows:
+        ws.append([value if value != '' else None for value in row])
+    wb.save(output_file)
+
+def _write_rows_to_csv(output_file: Union[str, BinaryIO], rows: Iterable[Sequence[str]]):
+    """把行数据写入CSV（UTF-8 BOM编码，Excel可直接打开中文）
+    
+    Args:
+        output_file: 输出文件路径或二进制文件对象
+        rows: 行数据（可为惰性迭代器），第一行为表头
+    """
+    if isinstance(output_file, str):
+        with open(output_file, 'w', newline='', encoding='utf-8-sig') as f:
+            csv.writer(f).writerows(rows)
+    else:
+        text_file = io.TextIOWrapper(output_file, encoding='utf-8-sig', newline='')
+        csv.writer(text_file).writerows(rows)
+        text_file.flush()
+        # 分离包装器，避免其被回收时关闭调用方的文件对象
+        text_file.detach()
+
+def _write_rows(
+    output_file: Union[str, BinaryIO], rows: Iterable[Sequence[str]],
+    file_format: str = 'xlsx', sheet_name: str = "Sheet1"
+):
+    """按输出格式写入行数据
+    
+    Args:
+        output_file: 输出文件路径或二进制文件对象
+        rows: 行数据（可为惰性迭代器），第一行为表头
+        file_format: 输出格式，'xlsx'或'csv'（CSV无工作表，忽略sheet_name）
+        sheet_name: Excel工作表名称
+    """
+    if file_format == 'xlsx':
+        _write_rows_to_excel(output_file, rows, sheet_name=sheet_name)
+    elif file_format == 'csv':
+        _write_rows_to_csv(output_file, rows)
+    else:
+        raise ValueError(f"不支持的输出格式: {file_format}")
+
 class TestDataGenerator:
     """测试数据生成器类"""
     
@@ -22,8 +78,9 @@ class TestDataGenerator:
         Args:
             seed: 随机种子，用于生成可重复的测试数据
         """
-        if seed is not None:
-            random.seed(seed)
+        self.seed = seed
+        # 所有随机抽样都使用同一个NumPy生成器，可批量抽取，同一种子下结果可重复
+        self.rng = np.random.default_rng(seed)
         
         # 常用中文姓名库
         self.surnames = [
@@ -38,6 +95,10 @@ class TestDataGenerator:
             '平', '刚', '桂英', '华', '建华', '建国', '建军', '志强', '志明', '秀珍',
             '晓明', '晓红', '小红', '小明', '小华', '小丽', '小燕', '小芳', '小娟', '小静'
         ]
+        # 姓×名的全部组合（姓均为单字，组合互不重复），抽样时直接无放回抽取
+        self._all_names = np.char.add(
+            np.array(self.surnames)[:, None], np.array(self.given_names)[None, :]
+        ).ravel()
     
     def generate_names(self, count: int) -> List[str]:
         """生成指定数量的随机姓名
@@ -48,35 +109,36 @@ class TestDataGenerator:
         Returns:
             List[str]: 生成的姓名列表
         """
-        names = set()
-        while len(names) < count:
-            surname = random.choice(self.surnames)
-            given_name = random.choice(self.given_names)
-            name = f"{surname}{given_name}"
-            names.add(name)
-        
-        return list(names)
+        pool_size = len(self._all_names)
+        if count <= pool_size:
+            # 从全部组合中无放回抽样，无需拒绝采样
+            return self.rng.choice(self._all_names, size=count, replace=False).tolist()
+        
+        # 超出组合总数时，先用完全部组合，其余按轮次加数字后缀（如"王伟2"）
+        names = self.rng.permutation(self._all_names).tolist()
+        for i in range(pool_size, count):
+            names.append(f"{names[i % pool_size]}{i // pool_size + 1}")
+        return names
     
-    def generate_student_list(self, count: int, output_file: str) -> List[str]:
+    def generate_student_list(
+        self, count: int, output_file: Union[str, BinaryIO], file_format: str = 'xlsx'
+    ) -> List[str]:
         """生成学生名单Excel文件
         
         Args:
             count: 学生数量
-            output_file: 输出文件路径
+            output_file: 输出文件路径，或写入内存的二进制文件对象
+            file_format: 输出格式，'xlsx'或'csv'（CSV写入快得多，适合只做批量测试的场合）
             
         Returns:
             List[str]: 生成的学生姓名列表
         """
         names = self.generate_names(count)
         
-        # 创建DataFrame
-        df = pd.DataFrame({
-            '姓名': names
-        })
-        
-        # 保存到Excel
-        df.to_excel(output_file, index=False)
-        print(f"学生名单已保存到: {output_file}")
+        # 保存到Excel（第一行为表头）
+        _write_rows(output_file, [['姓名']] + [[name] for name in names], file_format)
+        if isinstance(output_file, str):
+            print(f"学生名单已保存到: {output_file}")
         
         return names
     
@@ -86,7 +148,8 @@ class TestDataGenerator:
         willing_levels: int = 3,
         unwilling_levels: int = 3,
         fill_rate_range: Tuple[float, float] = (0.3, 0.8),
-        output_file: str = "preferences.xlsx"
+        output_file: Union[str, BinaryIO] = "preferences.xlsx",
+        file_format: str = 'xlsx'
     ) -> Dict:
         """生成偏好关系数据
         
@@ -95,166 +158,268 @@ class TestDataGenerator:
             willing_levels: 喜好权重等级数量
             unwilling_levels: 不喜好权重等级数量
             fill_rate_range: 填充率范围 (最小值, 最大值)
-            output_file: 输出文件路径
+            output_file: 输出文件路径，或写入内存的二进制文件对象
+            file_format: 输出格式，'xlsx'或'csv'
             
         Returns:
             Dict: 生成的偏好关系统计信息
         """
-        # 创建工作簿
-        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+        # 生成喜好关系数据
+        willing_data = {}
+        willing_stats = {}
+        # 所有等级中最多的对数，即合并后表格的数据行数
+        max_rows = 0
+        
+        # 随机决定每个等级的填充率
+        fill_rates = self.rng.uniform(*fill_rate_range, size=willing_levels).tolist()
+        
+        for level, fill_rate in enumerate(fill_rates, 1):
+            col1_name = f"喜好{level}_人员1"
+            col2_name = f"喜好{level}_人员2"
             
-            # 生成喜好关系数据
-            willing_data = {}
-            willing_stats = {}
+            max_pairs = min(len(names) // 2, int(len(names) * fill_rate))
             
-            for level in range(1, willing_levels + 1):
-                col1_name = f"喜好{level}_人员1"
-                col2_name = f"喜好{level}_人员2"
-                
-                # 随机决定这个等级的填充率
-                fill_rate = random.uniform(*fill_rate_range)
-                max_pairs = min(len(names) // 2, int(len(names) * fill_rate))
-                
-                # 生成随机的人员对
-                pairs = []
-                used_names = set()
-                
-                for _ in range(max_pairs):
-                    # 随机选择两个不同的人
-                    available_names = [n for n in names if n not in used_names]
-                    if len(available_names) < 2:
-                        break
-                    
-                    person1 = random.choice(available_names)
-                    available_names.remove(person1)
-                    person2 = random.choice(available_names)
-                    
-                    pairs.append((person1, person2))
-                    
-                    # 根据随机概率决定是否将这些人标记为已使用
-                    if random.random() < 0.7:  # 70%的概率避免重复使用
-                        used_names.add(person1)
-                        used_names.add(person2)
-                
-                # 模拟部分填写情况：随机删除一些条目
-                if random.random() < 0.3:  # 30%的概率出现部分填写
-                    remove_count = random.randint(1, max(1, len(pairs) // 3))
-                    pairs = pairs[:-remove_count]
-                
-                willing_data[col1_name] = [pair[0] for pair in pairs]
-                willing_data[col2_name] = [pair[1] for pair in pairs]
-                willing_stats[f"level_{level}"] = len(pairs)
+            # 生成随机的人员对
+            pairs = []
+            # 尚未被标记为已使用的人员，移除时与末尾元素交换后弹出，避免每轮重建列表
+            available_names = list(names)
             
-            # 生成不喜好关系数据
-            unwilling_data = {}
-            unwilling_stats = {}
+            # 每对的两个选人随机数和“是否标记为已使用”的判定一次性批量抽取，
+            # 循环中只剩依赖可用名单状态的下标换算
+            draws = self.rng.random((max_pairs, 2))
+            mark_used = (self.rng.random(max_pairs) < 0.7).tolist()  # 70%的概率避免重复使用
             
-            for level in range(1, unwilling_levels + 1):
-                col1_name = f"不喜好{level}_人员1"
-                col2_name = f"不喜好{level}_人员2"
+            for (u1, u2), used in zip(draws.tolist(), mark_used):
+                if len(available_names) < 2:
+                    break
                 
-                # 不喜好关系通常比喜好关系少
-                fill_rate = random.uniform(0.1, 0.4)
-                max_pairs = min(len(names) // 3, int(len(names) * fill_rate))
+                # 随机选择两个不同的人
+                idx1 = int(u1 * len(available_names))
+                idx2 = int(u2 * (len(available_names) - 1))
+                if idx2 >= idx1:
+                    idx2 += 1
+                person1 = available_names[idx1]
+                person2 = available_names[idx2]
                 
-                pairs = []
-                for _ in range(max_pairs):
-                    person1 = random.choice(names)
-                    person2 = random.choice([n for n in names if n != person1])
-                    pairs.append((person1, person2))
+                pairs.append((person1, person2))
                 
-                # 模拟部分填写情况
-                if random.random() < 0.4:  # 40%的概率出现部分填写
-                    remove_count = random.randint(1, max(1, len(pairs) // 2))
-                    pairs = pairs[:-remove_count]
-                
-                unwilling_data[col1_name] = [pair[0] for pair in pairs]
-                unwilling_data[col2_name] = [pair[1] for pair in pairs]
-                unwilling_stats[f"level_{level}"] = len(pairs)
+                # 根据随机判定决定是否将这些人标记为已使用
+                if used:
+                    for idx in sorted((idx1, idx2), reverse=True):
+                        available_names[idx] = available_names[-1]
+                        available_names.pop()
+            
+            # 模拟部分填写情况：随机删除一些条目
+            if self.rng.random() < 0.3:  # 30%的概率出现部分填写
+                remove_count = int(self.rng.integers(1, max(1, len(pairs) // 3), endpoint=True))
+                pairs = pairs[:-remove_count]
             
-            # 合并所有数据到一个DataFrame
-            max_rows = max(
-                max([len(v) for v in willing_data.values()] + [0]),
-                max([len(v) for v in unwilling_data.values()] + [0])
-            )
+            willing_data[col1_name] = [pair[0] for pair in pairs]
+            willing_data[col2_name] = [pair[1] for pair in pairs]
+            willing_stats[f"level_{level}"] = len(pairs)
+            max_rows = max(max_rows, len(pairs))
+        
+        # 生成不喜好关系数据
+        unwilling_data = {}
+        unwilling_stats = {}
+        
+        # 不喜好关系通常比喜好关系少；各等级互不影响，先确定每个等级的对数
+        level_sizes = [
+            min(len(names) // 3, int(len(names) * fill_rate))
+            for fill_rate in self.rng.uniform(0.1, 0.4, size=unwilling_levels).tolist()
+        ]
+        level_offsets = np.cumsum([0] + level_sizes)
+        
+        # 一次性批量抽取所有等级的人员对：第二个人取第一个人之后的随机非零偏移，保证两人不同
+        total_pairs = int(level_offsets[-1])
+        names_arr = np.array(names)
+        if total_pairs > 0:
+            idx1 = self.rng.integers(0, len(names), size=total_pairs)
+            idx2 = (idx1 + 1 + self.rng.integers(0, len(names) - 1, size=total_pairs)) % len(names)
+            all_person1 = names_arr[idx1].tolist()
+            all_person2 = names_arr[idx2].tolist()
+        else:
+            all_person1, all_person2 = [], []
+        
+        for level in range(1, unwilling_levels + 1):
+            col1_name = f"不喜好{level}_人员1"
+            col2_name = f"不喜好{level}_人员2"
             
-            # 填充数据到相同长度
-            all_data = {}
+            start, end = level_offsets[level - 1], level_offsets[level]
             
-            # 添加喜好数据（从A列开始）- 每列包含用逗号分隔的人名对
-            col_index = 0
-            for level in range(1, willing_levels + 1):
-                col1_name = f"喜好{level}_人员1"
-                col2_name = f"喜好{level}_人员2"
-                
-                data1 = willing_data.get(col1_name, [])
-                data2 = willing_data.get(col2_name, [])
-                
-                # 合并为逗号分隔的人名对
-                combined_data = []
-                for i in range(len(data1)):
-                    if data1[i] and data2[i]:
-                        combined_data.append(f"{data1[i]},{data2[i]}")
-                    else:
-                        combined_data.append('')
-                
-                # 填充到max_rows长度
-                combined_data.extend([''] * (max_rows - len(combined_data)))
-                
-                all_data[chr(ord('A') + col_index)] = combined_data
-                col_index += 1
+            # 模拟部分填写情况
+            if self.rng.random() < 0.4:  # 40%的概率出现部分填写
+                remove_count = int(self.rng.integers(1, max(1, (end - start) // 2), endpoint=True))
+                end = max(start, end - remove_count)
+            
+            unwilling_data[col1_name] = all_person1[start:end]
+            unwilling_data[col2_name] = all_person2[start:end]
+            unwilling_stats[f"level_{level}"] = int(end - start)
+            max_rows = max(max_rows, int(end - start))
+        
+        # 填充数据到相同长度
+        all_data = {}
+        
+        # 添加喜好数据（从A列开始）- 每列包含用逗号分隔的人名对
+        col_index = 0
+        for level in range(1, willing_levels + 1):
+            col1_name = f"喜好{level}_人员1"
+            col2_name = f"喜好{level}_人员2"
+            
+            data1 = willing_data.get(col1_name, [])
+            data2 = willing_data.get(col2_name, [])
             
-            # 添加空列分隔
-            all_data[chr(ord('A') + col_index)] = [''] * max_rows
+            # 合并为逗号分隔的人名对，并填充到max_rows长度
+            combined_data = [f"{a},{b}" if a and b else '' for a, b in zip(data1, data2)]
+            combined_data += [''] * (max_rows - len(combined_data))
+            
+            all_data[get_column_letter(col_index + 1)] = combined_data
             col_index += 1
+        
+        # 添加空列分隔
+        all_data[get_column_letter(col_index + 1)] = [''] * max_rows
+        col_index += 1
+        
+        # 添加不喜好数据 - 每列包含用逗号分隔的人名对
+        for level in range(1, unwilling_levels + 1):
+            col1_name = f"不喜好{level}_人员1"
+            col2_name = f"不喜好{level}_人员2"
             
-            # 添加不喜好数据 - 每列包含用逗号分隔的人名对
-            for level in range(1, unwilling_levels + 1):
-                col1_name = f"不喜好{level}_人员1"
-                col2_name = f"不喜好{level}_人员2"
-                
-                data1 = unwilling_data.get(col1_name, [])
-                data2 = unwilling_data.get(col2_name, [])
-                
-                # 合并为逗号分隔的人名对
-                combined_data = []
-                for i in range(len(data1)):
-                    if data1[i] and data2[i]:
-                        combined_data.append(f"{data1[i]},{data2[i]}")
-                    else:
-                        combined_data.append('')
-                
-                # 填充到max_rows长度
-                combined_data.extend([''] * (max_rows - len(combined_data)))
-                
-                all_data[chr(ord('A') + col_index)] = combined_data
-                col_index += 1
+            data1 = unwilling_data.get(col1_name, [])
+            data2 = unwilling_data.get(col2_name, [])
             
-            # 创建DataFrame并保存
-            df = pd.DataFrame(all_data)
-            df.to_excel(writer, sheet_name='偏好关系', index=False)
+            # 合并为逗号分隔的人名对，并填充到max_rows长度
+            combined_data = [f"{a},{b}" if a and b else '' for a, b in zip(data1, data2)]
+            combined_data += [''] * (max_rows - len(combined_data))
             
+            all_data[get_column_letter(col_index + 1)] = combined_data
+            col_index += 1
+        
+        # 按行写入Excel（第一行为列字母表头）；只写模式按行流式写出，
+        # 各列按行转置后逐行交给写入器，不再整体复制出一份行列表
+        rows = chain([list(all_data.keys())], zip(*all_data.values()))
+        _write_rows(output_file, rows, file_format, sheet_name='偏好关系')
+        
+        if isinstance(output_file, str):
             print(f"偏好关系数据已保存到: {output_file}")
+        
+        # 返回统计信息
+        return {
+            'willing_stats': willing_stats,
+            'unwilling_stats': unwilling_stats,
+            'willing_levels': willing_levels,
+            'unwilling_levels': unwilling_levels,
+            'total_students': len(names)
+        }
+
+    def generate_scenario(
+        self, i: int, scenario: Dict, output_dir: str, in_memory: bool = False,
+        file_format: str = 'xlsx'
+    ) -> Tuple[List[str], Dict[str, bytes]]:
+        """生成单个测试场景的名单、偏好关系和配置说明
+        
+        Args:
+            i: 场景序号（从1开始），用于目录命名
+            scenario: 场景配置
+            output_dir: 测试套件输出目录（in_memory时只用于报告显示）
+            in_memory: 为True时不写磁盘，文件内容以字节返回，供主进程写入压缩包
+            file_format: 名单和偏好关系文件的格式，'xlsx'或'csv'
             
-            # 返回统计信息
-            return {
-                'willing_stats': willing_stats,
-                'unwilling_stats': unwilling_stats,
-                'willing_levels': willing_levels,
-                'unwilling_levels': unwilling_levels,
-                'total_students': len(names)
+        Returns:
+            Tuple[List[str], Dict[str, bytes]]: (该场景在生成报告中的文本行,
+                {场景内相对路径: 文件内容}，仅in_memory时非空)
+        """
+        print(f"\n生成测试场景 {i}: {scenario['name']}")
+        
+        scenario_name = f"{i:02d}_{scenario['name']}"
+        # 压缩包模式下显示为压缩包内的路径
+        scenario_dir = os.path.join(f"{output_dir}.zip" if in_memory else output_dir, scenario_name)
+        if in_memory:
+            student_file, preferences_file = io.BytesIO(), io.BytesIO()
+        else:
+            # 创建场景目录
+            os.makedirs(scenario_dir, exist_ok=True)
+            student_file = os.path.join(scenario_dir, f"students.{file_format}")
+            preferences_file = os.path.join(scenario_dir, f"preferences.{file_format}")
+        
+        # 生成学生名单
+        names = self.generate_student_list(scenario['student_count'], student_file, file_format)
+        
+        # 生成偏好关系
+        stats = self.generate_preferences_data(
+            names=names,
+            willing_levels=scenario['willing_levels'],
+            unwilling_levels=scenario['unwilling_levels'],
+            fill_rate_range=scenario['fill_rate_range'],
+            output_file=preferences_file,
+            file_format=file_format
+        )
+        
+        # 生成配置说明
+        # 列号按Excel规则换算为字母（超过Z列时为AA、AB…）
+        willing_range = f"A1:{get_column_letter(scenario['willing_levels'] * 2)}50"
+        unwilling_start_idx = scenario['willing_levels'] * 2 + 2
+        unwilling_start = get_column_letter(unwilling_start_idx)
+        unwilling_end = get_column_letter(unwilling_start_idx + scenario['unwilling_levels'] * 2 - 1)
+        unwilling_range = f"{unwilling_start}1:{unwilling_end}50"
+        
+        config_lines = [
+            f"测试场景: {scenario['name']}",
+            f"学生数量: {scenario['student_count']}",
+            f"喜好等级数: {scenario['willing_levels']}",
+            f"不喜好等级数: {scenario['unwilling_levels']}",
+            f"填充率范围: {scenario['fill_rate_range']}",
+            "",
+            "建议的单元格范围配置:",
+            f"喜好关系范围: {willing_range}",
+            f"不喜好关系范围: {unwilling_range}",
+            "",
+            "生成的数据统计:",
+        ]
+        config_lines += [f"喜好等级{level.split('_')[1]}: {count}对" for level, count in stats['willing_stats'].items()]
+        config_lines += [f"不喜好等级{level.split('_')[1]}: {count}对" for level, count in stats['unwilling_stats'].items()]
+        
+        # 整个配置说明拼成一个字符串后一次写入
+        config_text = '\n'.join(config_lines) + '\n'
+        files = {}
+        if in_memory:
+            files = {
+                f"{scenario_name}/students.{file_format}": student_file.getvalue(),
+                f"{scenario_name}/preferences.{file_format}": preferences_file.getvalue(),
+                f"{scenario_name}/config.txt": config_text.encode('utf-8'),
             }
+        else:
+            with open(os.path.join(scenario_dir, "config.txt"), 'w', encoding='utf-8') as f:
+                f.write(config_text)
+        
+        print(f"场景 {i} 生成完成: {scenario_dir}")
+        
+        # 报告中该场景的段落
+        report_lines = [
+            f"\n场景 {i}: {scenario['name']}",
+            f"  学生数量: {scenario['student_count']}",
+            f"  喜好等级: {scenario['willing_levels']}, 不喜好等级: {scenario['unwilling_levels']}",
+            f"  输出目录: {scenario_dir}",
+        ]
+        return report_lines, files
     
     def generate_test_suite(
         self,
         output_dir: str = "test_data",
-        scenarios: Optional[List[Dict]] = None
+        scenarios: Optional[List[Dict]] = None,
+        max_workers: Optional[int] = None,
+        zip_output: bool = False,
+        file_format: str = 'xlsx'
     ):
         """生成完整的测试数据套件
         
         Args:
             output_dir: 输出目录
             scenarios: 测试场景配置列表
+            max_workers: 并行生成场景的进程数，默认使用全部CPU核
+            zip_output: 为True时不创建目录，所有文件写入单个"<output_dir>.zip"压缩包
+            file_format: 名单和偏好关系文件的格式；'csv'写入快得多，适合批量测试，
+                但座位分配系统只能读取'xlsx'
         """
         if scenarios is None:
             scenarios = [
@@ -295,66 +460,50 @@ class TestDataGenerator:
                 }
             ]
         
-        # 创建输出目录
-        os.makedirs(output_dir, exist_ok=True)
+        # 创建输出目录（压缩包模式只需确保压缩包所在目录存在）
+        os.makedirs(os.path.dirname(os.path.abspath(output_dir)) if zip_output else output_dir, exist_ok=True)
         
         # 生成测试报告
         report = []
         report.append(f"测试数据生成报告 - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         report.append("=" * 60)
         
-        for i, scenario in enumerate(scenarios, 1):
-            print(f"\n生成测试场景 {i}: {scenario['name']}")
-            
-            # 创建场景目录
-            scenario_dir = os.path.join(output_dir, f"{i:02d}_{scenario['name']}")
-            os.makedirs(scenario_dir, exist_ok=True)
-            
-            # 生成学生名单
-            student_file = os.path.join(scenario_dir, "students.xlsx")
-            names = self.generate_student_list(scenario['student_count'], student_file)
-            
-            # 生成偏好关系
-            preferences_file = os.path.join(scenario_dir, "preferences.xlsx")
-            stats = self.generate_preferences_data(
-                names=names,
-                willing_levels=scenario['willing_levels'],
-                unwilling_levels=scenario['unwilling_levels'],
-                fill_rate_range=scenario['fill_rate_range'],
-                output_file=preferences_file
-            )
-            
-            # 生成配置说明
-            config_file = os.path.join(scenario_dir, "config.txt")
-            with open(config_file, 'w', encoding='utf-8') as f:
-                f.write(f"测试场景: {scenario['name']}\n")
-                f.write(f"学生数量: {scenario['student_count']}\n")
-                f.write(f"喜好等级数: {scenario['willing_levels']}\n")
-                f.write(f"不喜好等级数: {scenario['unwilling_levels']}\n")
-                f.write(f"填充率范围: {scenario['fill_rate_range']}\n\n")
-                
-                f.write("建议的单元格范围配置:\n")
-                willing_range = f"A1:{chr(ord('A') + scenario['willing_levels'] * 2 - 1)}50"
-                unwilling_start = chr(ord('A') + scenario['willing_levels'] * 2 + 1)
-                unwilling_end = chr(ord(unwilling_start) + scenario['unwilling_levels'] * 2 - 1)
-                unwilling_range = f"{unwilling_start}1:{unwilling_end}50"
-                
-                f.write(f"喜好关系范围: {willing_range}\n")
-                f.write(f"不喜好关系范围: {unwilling_range}\n\n")
-                
-                f.write("生成的数据统计:\n")
-                for level, count in stats['willing_stats'].items():
-                    f.write(f"喜好等级{level.split('_')[1]}: {count}对\n")
-                for level, count in stats['unwilling_stats'].items():
-                    f.write(f"不喜好等级{level.split('_')[1]}: {count}对\n")
-            
-            # 添加到报告
-            report.append(f"\n场景 {i}: {scenario['name']}")
-            report.append(f"  学生数量: {scenario['student_count']}")
-            report.append(f"  喜好等级: {scenario['willing_levels']}, 不喜好等级: {scenario['unwilling_levels']}")
-            report.append(f"  输出目录: {scenario_dir}")
+        # 各场景互不依赖，分发到多个进程并行生成；每个场景使用独立的派生种子，
+        # 结果与进程数无关，可重复
+        scenario_seeds = [None if self.seed is None else self.seed + i for i in range(1, len(scenarios) + 1)]
+        cpu_count = os.cpu_count() or 1
+        max_workers = max(1, min(max_workers or cpu_count, len(scenarios)))
+        if max_workers == 1:
+            # 单核或单场景时多进程没有收益，直接顺序生成
+            scenario_outputs = list(map(
+                _run_scenario, range(1, len(scenarios) + 1), scenarios,
+                repeat(output_dir), scenario_seeds, repeat(zip_output),
+                repeat(file_format)
+            ))
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                scenario_outputs = list(executor.map(
+                    _run_scenario, range(1, len(scenarios) + 1), scenarios,
+                    repeat(output_dir), scenario_seeds, repeat(zip_output),
+                    repeat(file_format)
+                ))
+        
+        for lines, _ in scenario_outputs:
+            report.extend(lines)
+        
+        if zip_output:
+            # xlsx本身已压缩，直接存储不再压缩（CSV文本则压缩）；所有文件一次写入同一个压缩包
+            zip_file = f"{output_dir}.zip"
+            compression = zipfile.ZIP_STORED if file_format == 'xlsx' else zipfile.ZIP_DEFLATED
+            with zipfile.ZipFile(zip_file, 'w', compression) as zf:
+                for _, files in scenario_outputs:
+                    for name, data in files.items():
+                        zf.writestr(name, data)
+                zf.writestr("generation_report.txt", '\n'.join(report).encode('utf-8'))
             
-            print(f"场景 {i} 生成完成: {scenario_dir}")
+            print(f"\n所有测试数据生成完成！")
+            print(f"压缩包: {zip_file}")
+            return
         
         # 保存总报告
         report_file = os.path.join(output_dir, "generation_report.txt")
@@ -365,6 +514,13 @@ class TestDataGenerator:
         print(f"输出目录: {output_dir}")
         print(f"生成报告: {report_file}")
 
+def _run_scenario(
+    i: int, scenario: Dict, output_dir: str, seed: Optional[int], in_memory: bool = False,
+    file_format: str = 'xlsx'
+) -> Tuple[List[str], Dict[str, bytes]]:
+    """在（子）进程中用独立种子的生成器生成单个场景，返回报告文本行和内存中的文件"""
+    return TestDataGenerator(seed=seed).generate_scenario(i, scenario, output_dir, in_memory, file_format)
+
 def main():
     """主函数"""
     parser = argparse.ArgumentParser(description='座位分配系统测试数据生成器')
@@ -380,6 +536,10 @@ def main():
                        help='不喜好权重等级数 (默认: 3)')
     parser.add_argument('--generate-suite', action='store_true',
                        help='生成完整的测试套件')
+    parser.add_argument('--zip', action='store_true',
+                       help='测试套件写入单个 <输出目录>.zip 压缩包，而不是多级目录')
+    parser.add_argument('--format', '-f', choices=['xlsx', 'csv'], default='xlsx',
+                       help='名单和偏好关系文件格式 (默认: xlsx；csv生成更快，但座位分配系统只读取xlsx)')
     
     args = parser.parse_args()
     
@@ -388,22 +548,25 @@ def main():
     
     if args.generate_suite:
         # 生成完整测试套件
-        generator.generate_test_suite(output_dir=args.output_dir)
+        generator.generate_test_suite(
+            output_dir=args.output_dir, zip_output=args.zip, file_format=args.format
+        )
     else:
         # 生成单个测试场景
         os.makedirs(args.output_dir, exist_ok=True)
         
         # 生成学生名单
-        student_file = os.path.join(args.output_dir, "students.xlsx")
-        names = generator.generate_student_list(args.student_count, student_file)
+        student_file = os.path.join(args.output_dir, f"students.{args.format}")
+        names = generator.generate_student_list(args.student_count, student_file, args.format)
         
         # 生成偏好关系
-        preferences_file = os.path.join(args.output_dir, "preferences.xlsx")
+        preferences_file = os.path.join(args.output_dir, f"preferences.{args.format}")
         stats = generator.generate_preferences_data(
             names=names,
             willing_levels=args.willing_levels,
             unwilling_levels=args.unwilling_levels,
-            output_file=preferences_file
+            output_file=preferences_file,
+            file_format=args.format
         )
         
         print(f"\n测试数据生成完成！")
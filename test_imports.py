@@ -2,63 +2,78 @@
 # -*- coding: utf-8 -*-
 """
 测试导入模块
+
+用法:
+    python test_imports.py          # 实际导入各模块
+    python test_imports.py --quick  # 只检查模块是否存在，不加载C扩展，几乎瞬间完成
 """
 
-try:
-    import streamlit as st
-    print("✓ Streamlit 导入成功")
-except ImportError as e:
-    print(f"✗ Streamlit 导入失败: {e}")
+import sys
+import importlib
+import importlib.util
 
-try:
-    import pandas as pd
-    print("✓ Pandas 导入成功")
-except ImportError as e:
-    print(f"✗ Pandas 导入失败: {e}")
+# (显示名称, 模块名)
+MODULES = [
+    ("Streamlit", "streamlit"),
+    ("Pandas", "pandas"),
+    ("NumPy", "numpy"),
+    ("Matplotlib", "matplotlib.pyplot"),
+    ("OR-Tools", "ortools.sat.python.cp_model"),
+    ("OpenPyXL", "openpyxl"),
+    ("XlsxWriter", "xlsxwriter"),
+    ("Pillow", "PIL.Image"),
+]
 
-try:
-    import numpy as np
-    print("✓ NumPy 导入成功")
-except ImportError as e:
-    print(f"✗ NumPy 导入失败: {e}")
+UTILS_NAMES = [
+    "load_names_from_excel",
+    "load_preferences_from_excel",
+    "compute_pair_weights",
+    "generate_seats",
+    "generate_adjacent_edges",
+    "solve_top_n_assignments",
+    "export_assignment_to_excel",
+    "export_assignment_to_image",
+]
 
-try:
-    import matplotlib.pyplot as plt
-    print("✓ Matplotlib 导入成功")
-except ImportError as e:
-    print(f"✗ Matplotlib 导入失败: {e}")
 
-try:
-    from ortools.sat.python import cp_model
-    print("✓ OR-Tools 导入成功")
-except ImportError as e:
-    print(f"✗ OR-Tools 导入失败: {e}")
+def check_module(module_name: str, quick: bool = False):
+    """检查单个模块
 
-try:
-    import openpyxl
-    print("✓ OpenPyXL 导入成功")
-except ImportError as e:
-    print(f"✗ OpenPyXL 导入失败: {e}")
+    Args:
+        module_name: 模块名
+        quick: 为True时只查找模块规格，不执行导入
 
-try:
-    from PIL import Image
-    print("✓ Pillow 导入成功")
-except ImportError as e:
-    print(f"✗ Pillow 导入失败: {e}")
+    Raises:
+        ImportError: 模块不存在或导入失败
+    """
+    if quick:
+        # 父包缺失时find_spec本身会抛出ModuleNotFoundError
+        if importlib.util.find_spec(module_name) is None:
+            raise ModuleNotFoundError(f"No module named '{module_name}'")
+    else:
+        importlib.import_module(module_name)
+
+
+quick = "--quick" in sys.argv[1:]
+
+for label, module_name in MODULES:
+    try:
+        check_module(module_name, quick)
+        print(f"✓ {label} {'存在' if quick else '导入成功'}")
+    except ImportError as e:
+        print(f"✗ {label} {'不存在' if quick else '导入失败'}: {e}")
 
 try:
-    from utils import (
-        load_names_from_excel,
-        load_preferences_from_excel,
-        compute_pair_weights,
-        generate_seats,
-        generate_adjacent_edges,
-        solve_top_n_assignments,
-        export_assignment_to_excel,
-        export_assignment_to_image
-    )
-    print("✓ Utils 模块导入成功")
+    if quick:
+        check_module("utils", quick)
+        print("✓ Utils 模块存在")
+    else:
+        utils = importlib.import_module("utils")
+        missing = [name for name in UTILS_NAMES if not hasattr(utils, name)]
+        if missing:
+            raise ImportError(f"cannot import name(s) {', '.join(missing)} from 'utils'")
+        print("✓ Utils 模块导入成功")
 except ImportError as e:
-    print(f"✗ Utils 模块导入失败: {e}")
+    print(f"✗ Utils 模块{'不存在' if quick else '导入失败'}: {e}")
 
-print("\n导入测试完成!")
\ No newline at end of file
+print("\n导入测试完成!")
@@ -3,37 +3,61 @@
 包含数据处理、座位布局、优化求解和导出功能的工具函数。
 """
 
-from .data_processor import (
-    load_names_from_excel,
-    load_preferences_from_excel,
-    parse_custom_weights,
-    compute_pair_weights,
-    parse_cell_range
-)
+import importlib
+
+# 公开名称 -> 所在子模块；按需导入（PEP 562），只用到数据处理函数时
+# 不会连带加载ortools、matplotlib等较重的依赖
+_LAZY_EXPORTS = {
+    # 数据处理
+    'load_names_from_excel': 'data_processor',
+    'load_preferences_from_excel': 'data_processor',
+    'parse_custom_weights': 'data_processor',
+    'compute_pair_weights': 'data_processor',
+    'build_weight_matrix': 'data_processor',
+    'encode_pairs_by_rank': 'data_processor',
+    'parse_cell_range': 'data_processor',
+    
+    # 座位布局
+    'generate_seats': 'seat_layout',
+    'generate_adjacent_edges': 'seat_layout',
+    'visualize_layout': 'seat_layout',
+    'get_adjacent_seat_pairs': 'seat_layout',
+    'build_adjacency_matrix': 'seat_layout',
+    'validate_layout': 'seat_layout',
+    'get_seat_info': 'seat_layout',
+    
+    # 优化求解
+    'SeatAssignmentResult': 'optimizer',
+    'solve_top_n_assignments': 'optimizer',
+    'solve_one': 'optimizer',
+    'solve_top_n_parallel': 'optimizer',
+    'evaluate_assignment': 'optimizer',
+    'compute_satisfaction_metrics': 'optimizer',
+    'compute_satisfaction_metrics_batch': 'optimizer',
+    'validate_assignment': 'optimizer',
+    'get_assignment_summary': 'optimizer',
+    
+    # 导出功能
+    'export_assignment_to_excel': 'exporter',
+    'export_assignment_to_image': 'exporter',
+    'create_assignment_summary_excel': 'exporter',
+    'export_layout_preview': 'exporter',
+}
+
+
+def __getattr__(name):
+    """首次访问公开名称时导入对应子模块，并缓存到包命名空间"""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    globals()[name] = value
+    return value
 
-from .seat_layout import (
-    generate_seats,
-    generate_adjacent_edges,
-    visualize_layout,
-    get_adjacent_seat_pairs,
-    validate_layout,
-    get_seat_info
-)
 
-from .optimizer import (
-    SeatAssignmentResult,
-    solve_top_n_assignments,
-    compute_satisfaction_metrics,
-    validate_assignment,
-    get_assignment_summary
-)
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
 
-from .exporter import (
-    export_assignment_to_excel,
-    export_assignment_to_image,
-    create_assignment_summary_excel,
-    export_layout_preview
-)
 
 __all__ = [
     # 数据处理
@@ -41,6 +65,8 @@ __all__ = [
     'load_preferences_from_excel', 
     'parse_custom_weights',
     'compute_pair_weights',
+    'build_weight_matrix',
+    'encode_pairs_by_rank',
     'parse_cell_range',
     
     # 座位布局
@@ -48,13 +74,18 @@ __all__ = [
     'generate_adjacent_edges',
     'visualize_layout',
     'get_adjacent_seat_pairs',
+    'build_adjacency_matrix',
     'validate_layout',
     'get_seat_info',
     
     # 优化求解
     'SeatAssignmentResult',
     'solve_top_n_assignments',
+    'solve_one',
+    'solve_top_n_parallel',
+    'evaluate_assignment',
     'compute_satisfaction_metrics',
+    'compute_satisfaction_metrics_batch',
     'validate_assignment',
     'get_assignment_summary',
     
@@ -3,13 +3,61 @@
 包含Excel文件读取、数据解析和预处理功能。
 """
 
-import pandas as pd
-import openpyxl
+import io
+import re
+import numpy as np
 from typing import List, Dict, Tuple, Set, Optional
 from collections import defaultdict
 import streamlit as st
 
+# openpyxl导入需要一百多毫秒，只在实际读取Excel、换算列号的函数内导入，
+# 未上传文件时的首次页面加载不再为此付出启动时间
 
+
+# 单元格引用：列字母 + 可选行号，如"A1"、"AB"
+_CELL_RE = re.compile(r"([A-Za-z]+)(\d*)")
+
+# 名单列中需要跳过的表头关键词（小写）
+_NAME_HEADER_KEYWORDS = frozenset({'姓名', 'name', '名字', '学生姓名'})
+
+
+def _file_bytes(file) -> bytes:
+    """取出上传文件对象（或打开的文件、文件路径）的全部字节内容"""
+    if hasattr(file, 'getvalue'):
+        return file.getvalue()
+    if hasattr(file, 'read'):
+        file.seek(0)
+        return file.read()
+    with open(file, 'rb') as f:
+        return f.read()
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _read_sheet_rows(file_bytes: bytes, sheet_name: Optional[str] = None) -> List[tuple]:
+    """解析工作簿并按行读出一个工作表的全部单元格值（按文件内容缓存）
+    
+    名单和喜好关系的读取共用此缓存：修改单元格范围、切换自动识别等交互
+    引起的重新运行不会再重复解压和解析同一个工作簿。
+    
+    Args:
+        file_bytes: Excel文件的字节内容
+        sheet_name: 工作表名称，None表示使用第一个工作表
+        
+    Returns:
+        List[tuple]: 工作表按行读取的单元格值（ws.iter_rows(values_only=True)）
+    """
+    import openpyxl
+    
+    wb = openpyxl.load_workbook(io.BytesIO(file_bytes), read_only=True, data_only=True)
+    try:
+        ws = wb[sheet_name] if sheet_name else wb.worksheets[0]
+        # 只读模式下按单元格随机访问很慢，一次性读出所有值
+        return list(ws.iter_rows(values_only=True))
+    finally:
+        wb.close()
+
+
+@st.cache_data(show_spinner=False)
 def load_names_from_excel(file, sheet_name: Optional[str] = None, name_col_spec: str = "A:A") -> List[str]:
     """从Excel文件加载人员名单
     
@@ -21,51 +69,36 @@ def load_names_from_excel(file, sheet_name: Optional[str] = None, name_col_spec:
     Returns:
         List[str]: 人员名单列表
     """
+    from openpyxl.utils import column_index_from_string
+    
     try:
         # 确保文件对象有效
         if file is None:
             st.error("文件对象为空")
             return []
             
-        # 读取Excel文件
+        # 读取Excel文件：工作表按行缓存解析结果，只取名单所在的一列，
+        # 不再为整张表构建DataFrame
         try:
-            # 如果没有指定sheet_name，使用0来明确指定第一个工作表
-            # 这样可以避免pd.read_excel返回字典的情况
-            if sheet_name is None:
-                df = pd.read_excel(file, sheet_name=0, header=None, usecols=name_col_spec)
-            else:
-                df = pd.read_excel(file, sheet_name=sheet_name, header=None, usecols=name_col_spec)
+            name_col = name_col_spec.split(":")[0].strip().upper()
+            col_idx = column_index_from_string(name_col) - 1
+            rows = _read_sheet_rows(_file_bytes(file), sheet_name)
+            values = [row[col_idx] if col_idx < len(row) else None for row in rows]
         except Exception as read_error:
             st.error(f"读取Excel文件失败: {str(read_error)}")
             return []
             
-        # 检查DataFrame类型
-        if not isinstance(df, pd.DataFrame):
-            # 如果返回字典，尝试转换为DataFrame
-            if isinstance(df, dict):
-                try:
-                    # 尝试从字典创建DataFrame
-                    df = pd.DataFrame(df)
-                    st.warning("Excel文件格式异常，已尝试自动修复")
-                except Exception as convert_error:
-                    st.error(f"无法转换数据格式: {str(convert_error)}")
-                    return []
-            else:
-                st.error(f"读取的数据类型错误: {type(df)}，期望DataFrame。请检查Excel文件格式。")
-                return []
-            
-        # 检查DataFrame是否有效
-        if df is None or df.empty:
+        # 检查是否读到数据
+        if not values:
             st.error("Excel文件为空或无法读取")
             return []
             
-        # 获取第一列的所有非空值，跳过第一行（表头）
-        names = df.iloc[1:, 0].dropna().astype(str).tolist()
-        # 去重并保持顺序
-        names = list(dict.fromkeys(names))
-        # 过滤空字符串和表头关键词
-        names = [name.strip() for name in names if name.strip() and name.strip().lower() not in ['姓名', 'name', '名字', '学生姓名']]
-        return names
+        # 获取该列的所有非空值，跳过第一行（表头），每个值只去除一次首尾空白
+        stripped = (str(value).strip() for value in values[1:] if value is not None)
+        # 过滤空字符串和表头关键词，再去重并保持顺序（去空白后再去重，" 张三"与"张三"视为同一人）
+        return list(dict.fromkeys(
+            name for name in stripped if name and name.lower() not in _NAME_HEADER_KEYWORDS
+        ))
     except Exception as e:
         import traceback
         error_msg = f"加载名单出错: {str(e)}\n详细错误:\n{traceback.format_exc()}"
@@ -82,33 +115,25 @@ def parse_cell_range(range_spec: str) -> Tuple[Optional[int], Optional[int], Opt
     Returns:
         Tuple: (start_col_idx, start_row_idx, end_col_idx, end_row_idx)
     """
+    from openpyxl.utils import column_index_from_string
+    
     if not range_spec or ":" not in range_spec:
         return None, None, None, None
     
     try:
         start, end = range_spec.split(":")
         
-        # 解析起始单元格
-        start_col = ""
-        start_row = ""
-        for c in start:
-            if c.isalpha():
-                start_col += c
-            else:
-                start_row += c
-        
-        # 解析结束单元格
-        end_col = ""
-        end_row = ""
-        for c in end:
-            if c.isalpha():
-                end_col += c
-            else:
-                end_row += c
+        # 解析起始单元格和结束单元格（列字母+可选行号）
+        start_match = _CELL_RE.fullmatch(start.strip())
+        end_match = _CELL_RE.fullmatch(end.strip())
+        if start_match is None or end_match is None:
+            return None, None, None, None
+        start_col, start_row = start_match.groups()
+        end_col, end_row = end_match.groups()
         
         # 转换列标签为数字索引（0-based）
-        start_col_idx = openpyxl.utils.column_index_from_string(start_col) - 1
-        end_col_idx = openpyxl.utils.column_index_from_string(end_col) - 1
+        start_col_idx = column_index_from_string(start_col) - 1
+        end_col_idx = column_index_from_string(end_col) - 1
         
         # 转换行标签为数字索引（0-based）
         start_row_idx = int(start_row) - 1 if start_row else 0
@@ -119,87 +144,57 @@ def parse_cell_range(range_spec: str) -> Tuple[Optional[int], Optional[int], Opt
         return None, None, None, None
 
 
-def auto_detect_preference_ranges(ws) -> Tuple[Optional[str], Optional[str]]:
+def _has_value(value) -> bool:
+    """单元格是否有非空内容"""
+    return bool(value) and bool(str(value).strip())
+
+
+def auto_detect_preference_ranges(rows: List[tuple]) -> Tuple[Optional[str], Optional[str]]:
     """自动识别喜好名单的单元格范围
     
     Args:
-        ws: openpyxl工作表对象
+        rows: 工作表按行读取的单元格值（ws.iter_rows(values_only=True)）
         
     Returns:
         Tuple[Optional[str], Optional[str]]: (willing_range, unwilling_range)
     """
+    from openpyxl.utils import get_column_letter
+    
     try:
         # 扫描整个工作表找到有数据的区域（第一行开始就是有效数据）
-        max_row = ws.max_row
-        max_col = ws.max_column
+        # 一次遍历记录每列最后一个有数据的行号；表格尺寸无需预先单独求出，
+        # 空表或只有一列的表在下面因数据列不足两列直接返回
+        last_row_by_col = {}
+        for r, row in enumerate(rows, start=1):
+            # 空行（只读模式下常见于带格式的空白行）用C层面的any直接跳过，不逐格判断
+            if not any(row):
+                continue
+            for c, cell_value in enumerate(row, start=1):
+                if _has_value(cell_value):
+                    last_row_by_col[c] = r
         
-        if max_row == 1 and max_col == 1:
-            return None, None
-            
-        # 找到所有有数据的列
-        data_columns = []
-        for col in range(1, max_col + 1):
-            has_data = False
-            for row in range(1, max_row + 1):
-                cell_value = ws.cell(row=row, column=col).value
-                if cell_value and str(cell_value).strip():
-                    has_data = True
-                    break
-            if has_data:
-                data_columns.append(col)
+        # 找到所有有数据的列，及各列对应的最后数据行
+        data_columns = np.array(sorted(last_row_by_col), dtype=np.int32)
         
         if len(data_columns) < 2:
             return None, None
+        last_rows = np.array([last_row_by_col[c] for c in data_columns.tolist()], dtype=np.int32)
             
-        # 识别空列分隔，找到愿意和不愿意区域
-        willing_cols = []
-        unwilling_cols = []
-        
-        # 查找连续的数据列组
-        groups = []
-        current_group = [data_columns[0]]
-        
-        for i in range(1, len(data_columns)):
-            if data_columns[i] - data_columns[i-1] == 1:
-                # 连续列
-                current_group.append(data_columns[i])
-            else:
-                # 有间隔，开始新组
-                groups.append(current_group)
-                current_group = [data_columns[i]]
-        groups.append(current_group)
-        
-        # 假设第一组是愿意，第二组是不愿意
-        if len(groups) >= 1:
-            willing_cols = groups[0]
-        if len(groups) >= 2:
-            unwilling_cols = groups[1]
-            
-        # 为每组找到最长的列来确定行数（从第一行开始计算）
-        def find_max_row_in_cols(cols):
-            max_data_row = 1
-            for col in cols:
-                for row in range(max_row, 0, -1):
-                    cell_value = ws.cell(row=row, column=col).value
-                    if cell_value and str(cell_value).strip():
-                        max_data_row = max(max_data_row, row)
-                        break
-            return max_data_row
+        # 识别空列分隔，找到愿意和不愿意区域：相邻列号之差不为1处即为空列分隔，
+        # 一次切分出所有连续的数据列组
+        breaks = np.flatnonzero(np.diff(data_columns) != 1) + 1
+        col_groups = np.split(data_columns, breaks)
+        row_groups = np.split(last_rows, breaks)
             
-        willing_range = None
-        unwilling_range = None
+        def column_group_range(g):
+            # 组内各列已按序连续，行数直接取该组各列最后数据行的最大值（从第一行开始计算）
+            start_letter = get_column_letter(int(col_groups[g][0]))
+            end_letter = get_column_letter(int(col_groups[g][-1]))
+            return f"{start_letter}1:{end_letter}{int(row_groups[g].max())}"
         
-        if willing_cols:
-            willing_max_row = find_max_row_in_cols(willing_cols)
-            willing_start_col = min(willing_cols)
-            willing_end_col = max(willing_cols)
-            willing_range = f"{chr(64 + willing_start_col)}1:{chr(64 + willing_end_col)}{willing_max_row}"
-            
-        if unwilling_cols:
-            unwilling_max_row = find_max_row_in_cols(unwilling_cols)
-            unwilling_start_col = min(unwilling_cols)
-            unwilling_end_col = max(unwilling_cols)
-            unwilling_range = f"{chr(64 + unwilling_start_col)}1:{chr(64 + unwilling_end_col)}{unwilling_max_row}"
+        # 假设第一组是愿意，第二组是不愿意
+        willing_range = column_group_range(0)
+        unwilling_range = column_group_range(1) if len(col_groups) >= 2 else None
             
         return willing_range, unwilling_range
         
@@ -207,6 +202,85 @@ def auto_detect_preference_ranges(ws) -> Tuple[Optional[str], Optional[str]]:
         return None, None
 
 
+def _make_pair(a: str, b: str, pool: Dict) -> frozenset:
+    """从对象池取出人名对的frozenset，池中没有时创建并登记
+    
+    同一人名只保留一个字符串对象，同一人名对（不分先后）只保留一个frozenset，
+    在多个单元格、多个等级中重复出现的人名和人名对不再各自占用内存。
+    
+    Args:
+        a: 人名1
+        b: 人名2
+        pool: 对象池，人名→人名、(人名1, 人名2)→frozenset
+        
+    Returns:
+        frozenset: 人名对
+    """
+    key = (a, b) if a < b else (b, a)
+    pair = pool.get(key)
+    if pair is None:
+        pair = pool[key] = frozenset((pool.setdefault(a, a), pool.setdefault(b, b)))
+    return pair
+
+
+def _parse_pair_columns(
+    rows: List[tuple],
+    range_spec: str,
+    label: str,
+    pairs_by_rank: Dict[int, Set],
+    pool: Optional[Dict] = None
+) -> List[Tuple]:
+    """按列解析人名对，每一列为一个等级
+    
+    Args:
+        rows: 工作表按行读取的单元格值
+        range_spec: 单元格范围
+        label: 等级标题前缀（喜欢/不喜欢）
+        pairs_by_rank: 解析结果写入的等级字典
+        pool: 人名和人名对的共享对象池（见_make_pair），None时只在本次解析内共享
+        
+    Returns:
+        List[Tuple]: 每个等级的标题
+    """
+    from openpyxl.utils import get_column_letter
+    
+    headers = []
+    start_col, start_row, end_col, _ = parse_cell_range(range_spec)
+    if start_col is None:
+        return headers
+    if pool is None:
+        pool = {}
+    
+    # 动态识别实际的等级数量：每一列为一个等级
+    # 解析时先按等级追加到列表，结束后每个等级一次性并入集合（C层面批量去重）
+    rank_lists = [[] for _ in range(start_col, end_col + 1)]
+    
+    # 按行遍历一次，每行只取范围内的列切片，读取各等级的人名对（逗号分隔格式）
+    for row in rows[max(start_row, 0):]:
+        for rank_list, cell_value in zip(rank_lists, row[start_col:end_col + 1]):
+            if cell_value:
+                # 解析逗号分隔的人名对；两部分各自去除空白，整体无需先strip，
+                # 纯空白单元格切分后只有一部分，自然被跳过
+                parts = str(cell_value).split(',')
+                if len(parts) == 2:
+                    a, b = parts[0].strip(), parts[1].strip()
+                    if a and b and a != b:
+                        rank_list.append(_make_pair(a, b, pool))
+    
+    # 只有读到人名对的等级才写入结果字典
+    for rank, rank_list in enumerate(rank_lists, start=1):
+        if rank_list:
+            pairs_by_rank[rank].update(rank_list)
+    
+    # 生成标题：等级X:列名（即使没有数据也保留该等级以保持一致性）
+    for rank, col in enumerate(range(start_col, end_col + 1), start=1):
+        col_letter = get_column_letter(col + 1)
+        headers.append((f"{label}等级{rank}:{col_letter}列", ""))
+    
+    return headers
+
+
+@st.cache_data(show_spinner=False)
 def load_preferences_from_excel(
     file, 
     sheet_name: Optional[str] = None, 
@@ -230,93 +304,25 @@ def load_preferences_from_excel(
     unwilling_pairs_by_rank = defaultdict(set)
     
     try:
-        wb = openpyxl.load_workbook(file, read_only=True)
-        ws = wb[sheet_name] if sheet_name else wb.active
+        # 解析结果按文件内容缓存，与名单读取共用
+        rows = _read_sheet_rows(_file_bytes(file), sheet_name)
         
         # 如果启用自动检测，则自动识别范围
         detection_results = None
         if auto_detect:
-            detected_willing, detected_unwilling = auto_detect_preference_ranges(ws)
+            detected_willing, detected_unwilling = auto_detect_preference_ranges(rows)
             if detected_willing:
                 willing_range_spec = detected_willing
             if detected_unwilling:
                 unwilling_range_spec = detected_unwilling
             detection_results = (detected_willing, detected_unwilling)
         
-        willing_headers = []
-        unwilling_headers = []
-        
         # 解析喜好关系单元格范围
-        w_start_col, w_start_row, w_end_col, w_end_row = parse_cell_range(willing_range_spec)
-        if w_start_col is not None:
-            rank = 1
-            # 动态识别实际的等级数量：每一列为一个等级
-            total_cols = w_end_col - w_start_col + 1
-            max_levels = total_cols
-            
-            for level in range(max_levels):
-                col = w_start_col + level
-                if col <= w_end_col:
-                    # 读取该列的所有人名对（逗号分隔格式），从第一行开始
-                    pairs_found = False
-                    for row in range(w_start_row + 1, ws.max_row + 1):
-                        cell_value = ws.cell(row=row, column=col + 1).value
-                        if cell_value and str(cell_value).strip():
-                            # 解析逗号分隔的人名对
-                            parts = str(cell_value).strip().split(',')
-                            if len(parts) == 2:
-                                a, b = parts[0].strip(), parts[1].strip()
-                                if a and b and a != b:
-                                    willing_pairs_by_rank[rank].add(frozenset([a, b]))
-                                    pairs_found = True
-                    
-                    # 生成标题：喜欢等级X:列名
-                    col_letter = openpyxl.utils.get_column_letter(col + 1)
-                    header = f"喜欢等级{rank}:{col_letter}列"
-                    willing_headers.append((header, ""))
-                    # 只有找到实际数据对时才增加等级计数
-                    if pairs_found:
-                        rank += 1
-                    else:
-                        # 即使没有数据也要增加等级计数以保持一致性
-                        rank += 1
-        
+        # 两个范围共用一个对象池，同一人名、人名对在结果中只有一份
+        pool = {}
+        willing_headers = _parse_pair_columns(rows, willing_range_spec, "喜欢", willing_pairs_by_rank, pool)
         # 解析不喜好关系单元格范围
-        uw_start_col, uw_start_row, uw_end_col, uw_end_row = parse_cell_range(unwilling_range_spec)
-        if uw_start_col is not None:
-            rank = 1
-            # 动态识别实际的等级数量：每一列为一个等级
-            total_cols = uw_end_col - uw_start_col + 1
-            max_levels = total_cols
-            
-            for level in range(max_levels):
-                col = uw_start_col + level
-                if col <= uw_end_col:
-                    # 读取该列的所有人名对（逗号分隔格式），从第一行开始
-                    pairs_found = False
-                    for row in range(uw_start_row + 1, ws.max_row + 1):
-                        cell_value = ws.cell(row=row, column=col + 1).value
-                        if cell_value and str(cell_value).strip():
-                            # 解析逗号分隔的人名对
-                            parts = str(cell_value).strip().split(',')
-                            if len(parts) == 2:
-                                a, b = parts[0].strip(), parts[1].strip()
-                                if a and b and a != b:
-                                    unwilling_pairs_by_rank[rank].add(frozenset([a, b]))
-                                    pairs_found = True
-                    
-                    # 生成标题：不喜欢等级X:列名
-                    col_letter = openpyxl.utils.get_column_letter(col + 1)
-                    header = f"不喜欢等级{rank}:{col_letter}列"
-                    unwilling_headers.append((header, ""))
-                    # 只有找到实际数据对时才增加等级计数
-                    if pairs_found:
-                        rank += 1
-                    else:
-                        # 即使没有数据也要增加等级计数以保持一致性
-                        rank += 1
-        
-        wb.close()
+        unwilling_headers = _parse_pair_columns(rows, unwilling_range_spec, "不喜欢", unwilling_pairs_by_rank, pool)
     except Exception as e:
         st.error(f"读取Excel出错: {str(e)}")
         return {}, {}, [], [], None
@@ -337,21 +343,43 @@ def parse_custom_weights(text: str) -> List[Tuple[str, str, float]]:
         return []
     
     custom_pairs = []
-    lines = text.strip().split('\n')
-    for line in lines:
+    # splitlines按行切分，不必先复制一份去除首尾空白的全文；空行切分后不足3段，直接跳过
+    for line in text.splitlines():
         parts = line.split(',')
         if len(parts) == 3:
             try:
-                name1 = parts[0].strip()
-                name2 = parts[1].strip()
-                weight = float(parts[2].strip())
-                if name1 and name2:
-                    custom_pairs.append((name1, name2, weight))
+                # float本身忽略首尾空白，权重部分无需strip
+                weight = float(parts[2])
             except ValueError:
                 continue
+            name1 = parts[0].strip()
+            name2 = parts[1].strip()
+            if name1 and name2:
+                custom_pairs.append((name1, name2, weight))
     return custom_pairs
 
 
+def encode_pairs_by_rank(pairs_by_rank: Dict[int, Set], names: List[str]) -> np.ndarray:
+    """将按等级分组的人名对编码为整数数组
+    
+    Args:
+        pairs_by_rank: 按等级分组的人名对
+        names: 人员名单，人员索引即在名单中的位置
+        
+    Returns:
+        np.ndarray: 形状为(对数, 3)的int32数组，每行为(等级, 人员索引1, 人员索引2)，
+            不在名单中的人名对会被忽略
+    """
+    name_to_idx = {name: i for i, name in enumerate(names)}
+    rows = []
+    for rank, pairs in pairs_by_rank.items():
+        for pair in pairs:
+            a, b = pair
+            if a in name_to_idx and b in name_to_idx:
+                rows.append((rank, name_to_idx[a], name_to_idx[b]))
+    return np.array(rows, dtype=np.int32).reshape(-1, 3)
+
+
 def compute_pair_weights(
     willing_pairs_by_rank: Dict[int, Set], 
     unwilling_pairs_by_rank: Dict[int, Set],
@@ -373,18 +401,16 @@ def compute_pair_weights(
     """
     pair_weights = {}
     
-    # 处理喜好对
+    # 处理喜好对：同一等级的所有对权重相同，用dict.fromkeys整组写入，不再逐对赋值
     for rank, pairs in willing_pairs_by_rank.items():
         if rank <= len(w_weights):
-            for pair in pairs:
-                pair_weights[pair] = w_weights[rank-1]
+            pair_weights.update(dict.fromkeys(pairs, w_weights[rank-1]))
     
     # 处理不喜好对
     for rank, pairs in unwilling_pairs_by_rank.items():
         if rank < len(uw_weights):
-            for pair in pairs:
-                # 不喜欢关系使用负权重（uw_weights已经是负数）
-                pair_weights[pair] = uw_weights[rank]
+            # 不喜欢关系使用负权重（uw_weights已经是负数）
+            pair_weights.update(dict.fromkeys(pairs, uw_weights[rank]))
     
     # 添加自定义权重对
     if custom_pairs:
@@ -392,4 +418,37 @@ def compute_pair_weights(
             pair = frozenset([name1, name2])
             pair_weights[pair] = float(weight)
     
-    return pair_weights
\ No newline at end of file
+    return pair_weights
+
+
+def build_weight_matrix(pair_weights: Dict[frozenset, float], names: List[str]) -> np.ndarray:
+    """把权重字典转换为按名单索引的稠密权重矩阵
+    
+    Args:
+        pair_weights: 人员对权重字典
+        names: 人员名单，决定矩阵的行列顺序
+        
+    Returns:
+        np.ndarray: 形状为(人数, 人数)的对称float32矩阵，W[i, j]为第i人与第j人的权重；
+            名单外的人员对被忽略
+    """
+    name_to_idx = {name: i for i, name in enumerate(names)}
+    W = np.zeros((len(names), len(names)), dtype=np.float32)
+    
+    # 先把名单内的人员对编码为行、列下标和权重数组，再用花式索引一次写入矩阵，
+    # 避免逐个元素的NumPy标量赋值
+    rows, cols, weights = [], [], []
+    for pair, weight in pair_weights.items():
+        if len(pair) != 2:
+            continue
+        a, b = pair
+        if a in name_to_idx and b in name_to_idx:
+            rows.append(name_to_idx[a])
+            cols.append(name_to_idx[b])
+            weights.append(weight)
+    
+    if rows:
+        W[rows, cols] = weights
+        W[cols, rows] = weights
+    
+    return W
@@ -4,17 +4,93 @@
 """
 
 import io
-import openpyxl
-from openpyxl.styles import Alignment, PatternFill
+import threading
+import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import matplotlib.patches as patches
-from typing import Dict, List, Tuple, Optional
+from matplotlib.collections import LineCollection, PatchCollection
+from matplotlib.colors import to_rgba_array
+from matplotlib.font_manager import FontProperties
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple, Optional
 import zipfile
+from PIL import Image, ImageDraw, ImageFont
+
+# openpyxl只在导出Excel的函数内导入，未导出时不加载（导入需要一百多毫秒）
 
 # 设置matplotlib中文字体
 plt.rcParams['font.sans-serif'] = ['SimHei', 'DejaVu Sans']
 plt.rcParams['axes.unicode_minus'] = False
 
+# 所有文字标签共用同一个字体属性对象，不必每个标签都重新解析rcParams中的字体族
+# （图例和标题仍使用上面的rcParams设置）
+_CN_FONT = FontProperties(family=['SimHei', 'DejaVu Sans'])
+
+# 每个线程缓存一个图形对象，尺寸和分辨率不变时清空后复用，省去每次导出重新创建Figure和画布
+_FIG_CACHE = threading.local()
+_SUBPLOT_PARAMS = ('left', 'right', 'bottom', 'top', 'wspace', 'hspace')
+
+# 座位图的坐标范围和边距都是固定的（标题和图例都画在坐标轴内），直接指定坐标轴位置，不用tight_layout逐个测量Artist
+_SEAT_MAP_AXES_RECT = dict(left=0.02, right=0.98, bottom=0.02, top=0.98)
+
+# 图片质量档位 -> (分辨率, PNG压缩级别)；界面上看的两档保持快速编码，打印档压得更小
+_QUALITY_PRESETS = {
+    'preview': (72, 1),
+    'standard': (100, 1),
+    'print': (200, 6),
+}
+
+
+def _resolve_quality(
+    quality: str, 
+    dpi: Optional[int], 
+    compress_level: Optional[int]
+) -> Tuple[int, int]:
+    """把质量档位换算成分辨率和PNG压缩级别，显式给出的dpi/compress_level优先
+    
+    Args:
+        quality: 质量档位，"preview"、"standard"或"print"
+        dpi: 显式指定的分辨率（可选）
+        compress_level: 显式指定的PNG压缩级别（可选）
+        
+    Returns:
+        Tuple[int, int]: (分辨率, PNG压缩级别)
+        
+    Raises:
+        ValueError: 不支持的质量档位
+    """
+    if quality not in _QUALITY_PRESETS:
+        raise ValueError(f"不支持的图片质量档位: {quality}")
+    preset_dpi, preset_level = _QUALITY_PRESETS[quality]
+    return (preset_dpi if dpi is None else dpi,
+            preset_level if compress_level is None else compress_level)
+
+
+def _reuse_figure(figsize: Tuple[float, float], dpi: int):
+    """取得当前线程缓存的图形和一个新坐标轴
+    
+    图形不经过pyplot管理，不需要plt.close。每次取用时都会清空内容并恢复背景色和子图边距
+    （导出时会改动边距），因此上一次导出中途出错留下的内容也不会带到下一次。
+    
+    Args:
+        figsize: 图片尺寸（英寸）
+        dpi: 图片分辨率
+        
+    Returns:
+        Tuple[Figure, Axes]: 图形和坐标轴
+    """
+    key = (tuple(figsize), dpi)
+    fig = getattr(_FIG_CACHE, 'fig', None)
+    if fig is None or _FIG_CACHE.key != key:
+        fig = Figure(figsize=figsize, dpi=dpi)
+        _FIG_CACHE.fig, _FIG_CACHE.key = fig, key
+    else:
+        fig.clear()
+        fig.patch.set_facecolor(plt.rcParams['figure.facecolor'])
+        fig.subplots_adjust(**{k: plt.rcParams[f'figure.subplot.{k}'] for k in _SUBPLOT_PARAMS})
+    return fig, fig.add_subplot(111)
+
 
 def export_assignment_to_excel(
     assignment: Dict[str, int], 
@@ -33,46 +109,55 @@ def export_assignment_to_excel(
     Returns:
         bytes: Excel文件的字节数据
     """
-    # 创建工作簿和工作表
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "座位表"
+    import openpyxl
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, PatternFill
+    from openpyxl.utils import get_column_letter
+    
+    # 创建工作簿和工作表：只写模式按行流式写出，不在内存中保留整张表的单元格对象
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("座位表")
+    
+    # 调整列宽、合并标题行（只写模式下需在写入第一行之前设置）
+    for c in range(1, n_cols + 2):
+        ws.column_dimensions[get_column_letter(c)].width = 15
+    ws.merged_cells.add(f'A1:{get_column_letter(n_cols + 1)}1')
+    
+    # 样式对象不可变，整张表共用同一个对齐和填充实例
+    center = Alignment(horizontal='center')
+    fill = PatternFill(start_color="E2EFDA", end_color="E2EFDA", fill_type="solid")
+    
+    def centered_cell(value, fill=None):
+        """创建居中对齐（可带填充色）的只写单元格"""
+        cell = WriteOnlyCell(ws, value=value)
+        cell.alignment = center
+        if fill is not None:
+            cell.fill = fill
+        return cell
     
     # 写入标题行
-    ws.merge_cells(f'A1:{chr(65+n_cols)}1')
-    ws.cell(1, 1).value = "座位安排表"
-    ws.cell(1, 1).alignment = Alignment(horizontal='center')
+    ws.append([centered_cell("座位安排表")])
     
     # 写入列标题
-    for c in range(n_cols):
-        ws.cell(2, c + 2).value = f"列 {c+1}"
-        ws.cell(2, c + 2).alignment = Alignment(horizontal='center')
-    
-    # 写入行标题
-    max_rows = max(rows_per_col) if rows_per_col else 0
-    for r in range(max_rows):
-        ws.cell(r + 3, 1).value = f"排 {r+1}"
-        ws.cell(r + 3, 1).alignment = Alignment(horizontal='center')
+    ws.append([None] + [centered_cell(f"列 {c+1}") for c in range(n_cols)])
     
     # 创建座位ID到人名的映射
     seat_to_person = {}
     for name, idx in assignment.items():
         seat_to_person[idx] = name
     
-    # 填充座位信息
+    # 先按(排, 列)排好座位信息，没有座位的位置为None（不写单元格）
+    max_rows = max(rows_per_col) if rows_per_col else 0
+    grid = [[None] * n_cols for _ in range(max_rows)]
     for idx, (c, r) in enumerate(seats):
-        name = seat_to_person.get(idx, "")
-        ws.cell(r + 3, c + 2).value = name
-        ws.cell(r + 3, c + 2).alignment = Alignment(horizontal='center')
-        
-        # 添加单元格颜色
-        if name:
-            fill = PatternFill(start_color="E2EFDA", end_color="E2EFDA", fill_type="solid")
-            ws.cell(r + 3, c + 2).fill = fill
+        grid[r][c] = seat_to_person.get(idx, "")
     
-    # 调整列宽
-    for c in range(1, n_cols + 2):
-        ws.column_dimensions[chr(64 + c)].width = 15
+    # 逐排写入行标题和座位信息，有人的座位添加单元格颜色
+    for r, row in enumerate(grid):
+        ws.append([centered_cell(f"排 {r+1}")] + [
+            None if name is None else centered_cell(name, fill if name else None)
+            for name in row
+        ])
     
     # 保存到内存
     output = io.BytesIO()
@@ -82,6 +167,43 @@ def export_assignment_to_excel(
     return output.getvalue()
 
 
+# 关系线轮换使用的颜色
+_POS_LINE_COLORS = ['#28a745', '#20c997', '#17a2b8', '#6f42c1', '#e83e8c']
+_NEG_LINE_COLORS = ['#dc3545', '#fd7e14', '#ffc107', '#6c757d', '#343a40']
+
+# 相邻座位的坐标偏移（包括对角线）；相邻关系对称，只需向一侧的4个方向查找
+_FORWARD_NEIGHBOR_OFFSETS = ((1, -1), (1, 0), (1, 1), (0, 1))
+
+
+def _adjacent_person_pairs(
+    assignment: Dict[str, int], 
+    seats: List[Tuple[int, int]]
+) -> Set[Tuple[str, str]]:
+    """求出座位相邻（包括对角线）的所有人员对
+    
+    Args:
+        assignment: 座位分配方案
+        seats: 座位列表
+        
+    Returns:
+        Set[Tuple[str, str]]: 座位相邻的人员对，每对按人名排序
+    """
+    # 座位坐标到人名的网格
+    coord_to_person = {}
+    for name, seat_idx in assignment.items():
+        if 0 <= seat_idx < len(seats):
+            c, r = seats[seat_idx]
+            coord_to_person[(c, r)] = name
+    
+    adjacent_pairs = set()
+    for (c, r), name in coord_to_person.items():
+        for dc, dr in _FORWARD_NEIGHBOR_OFFSETS:
+            other = coord_to_person.get((c + dc, r + dr))
+            if other is not None:
+                adjacent_pairs.add((name, other) if name < other else (other, name))
+    return adjacent_pairs
+
+
 def export_assignment_to_image(
     assignment: Dict[str, int], 
     seats: List[Tuple[int, int]], 
@@ -89,10 +211,12 @@ def export_assignment_to_image(
     rows_per_col: List[int], 
     pair_weights: Optional[Dict[frozenset, float]] = None,
     figsize: Optional[Tuple[float, float]] = None,
-    dpi: int = 120,
+    dpi: Optional[int] = None,
     split_visualization: bool = False,
     aisles: Optional[List[int]] = None,
-    show_all_lines: bool = False
+    show_all_lines: bool = False,
+    compress_level: Optional[int] = None,
+    quality: str = "standard"
 ) -> bytes:
     """绘制座位图，带关系线
     
@@ -103,13 +227,21 @@ def export_assignment_to_image(
         rows_per_col: 每列的排数列表
         pair_weights: 人员对权重字典（可选，用于绘制关系线）
         figsize: 图片尺寸（可选）
-        dpi: 图片分辨率
+        dpi: 图片分辨率（可选，默认取质量档位的分辨率）
         split_visualization: 是否分离可视化
         aisles: 过道位置列表（可选，列索引）
+        show_all_lines: 是否显示所有关系线（否则只显示满足的关系）
+        compress_level: PNG压缩级别（0-9，可选，默认取质量档位的压缩级别）；
+            界面用的档位为1，编码更快，文件稍大，PNG本身无损
+        quality: 质量档位，"preview"（72dpi）、"standard"（100dpi）或"print"（200dpi）
         
     Returns:
         bytes: PNG图片的字节数据
+        
+    Raises:
+        ValueError: 不支持的质量档位
     """
+    dpi, compress_level = _resolve_quality(quality, dpi, compress_level)
     max_rows = max(rows_per_col) if rows_per_col else 1
     cell_w, cell_h = 2.0, 1.2
     margin = 0.5
@@ -119,15 +251,18 @@ def export_assignment_to_image(
         fig_h = max(6, max_rows * cell_h + 2 * margin)
         figsize = (fig_w, fig_h)
     
-    fig, ax = plt.subplots(figsize=figsize, dpi=dpi)
+    fig, ax = _reuse_figure(figsize, dpi)
     fig.patch.set_facecolor('#f8f9fa')
     ax.set_xlim(0, n_cols * cell_w + 2 * margin)
     ax.set_ylim(0, max_rows * cell_h + 2 * margin)
     ax.axis('off')
     
-    # 创建座位ID到人名的映射
+    # 创建座位ID到人名的映射：一次性反转分配方案，不再为每个座位扫描整个方案
     seat_to_person = {}
+    for name, seat_idx in assignment.items():
+        seat_to_person.setdefault(seat_idx, name)
     person_to_pos = {}
+    rects = []
     
     # 画从左到右，底部为R1，向上增加
     for idx, (c, r) in enumerate(seats):
@@ -136,27 +271,25 @@ def export_assignment_to_image(
         
         # 座位矩形和编号
         rect_color = '#e9ecef'
-        rect = patches.Rectangle((x0, y0), cell_w, cell_h, fill=True, 
-                               linewidth=1, edgecolor='#adb5bd', facecolor=rect_color)
-        ax.add_patch(rect)
+        rects.append(patches.Rectangle((x0, y0), cell_w, cell_h, fill=True, 
+                                       linewidth=1, edgecolor='#adb5bd', facecolor=rect_color))
         seat_id = f"C{c+1}-R{r+1}"
         ax.text(x0 + 0.1, y0 + cell_h - 0.2, seat_id, ha='left', va='top', 
-                fontsize=7, color='#6c757d')
+                fontproperties=_CN_FONT, fontsize=7, color='#6c757d')
         
         # 找到这个座位的人
-        name = None
-        for k, v in assignment.items():
-            if v == idx:
-                name = k
-                seat_to_person[idx] = name
-                person_to_pos[name] = (x0 + cell_w/2, y0 + cell_h/2)
-                break
+        name = seat_to_person.get(idx)
+        if name is not None:
+            person_to_pos[name] = (x0 + cell_w/2, y0 + cell_h/2)
         
         # 显示人名
         label = name if name else ""
         if label:
             ax.text(x0 + cell_w/2, y0 + cell_h/2, label, ha='center', va='center', 
-                    fontsize=min(9, max(6, 60//len(label))), fontweight='bold')
+                    fontproperties=_CN_FONT, fontsize=min(9, max(6, 60//len(label))), fontweight='bold')
+    
+    # 所有座位矩形合成一个PatchCollection，只添加一个Artist（单个Patch默认尖角连接，集合需显式指定）
+    ax.add_collection(PatchCollection(rects, match_original=True, joinstyle='miter'))
     
     # 绘制过道线条
     if aisles:
@@ -169,131 +302,52 @@ def export_assignment_to_image(
                           color='#6c757d', linewidth=3, linestyle='--', alpha=0.7)
                 # 添加过道标识
                 ax.text(x_aisle + 0.1, margin + max_rows * cell_h / 2, '过道', 
-                       rotation=90, ha='left', va='center', fontsize=8, color='#6c757d')
+                       rotation=90, ha='left', va='center', fontproperties=_CN_FONT, fontsize=8, color='#6c757d')
     
     # 如果提供了权重信息，画出关系线
     if pair_weights:
-        # 创建座位位置映射
-        seat_positions = {idx: (c, r) for idx, (c, r) in enumerate(seats)}
-        
-        def are_seats_adjacent(person1, person2):
-            """检查两个人的座位是否相邻"""
-            # 找到两个人的座位索引
-            seat1_idx = assignment.get(person1)
-            seat2_idx = assignment.get(person2)
-            
-            if seat1_idx is None or seat2_idx is None:
-                return False
-                
-            # 获取座位坐标
-            if seat1_idx not in seat_positions or seat2_idx not in seat_positions:
-                return False
-                
-            c1, r1 = seat_positions[seat1_idx]
-            c2, r2 = seat_positions[seat2_idx]
-            
-            # 检查是否相邻（包括对角线）
-            dc = abs(c1 - c2)
-            dr = abs(r1 - r2)
-            
-            return (dc <= 1 and dr <= 1) and (dc + dr > 0)
-        
-        # 收集所有连线信息
-        if show_all_lines:
-            # 显示所有关系线
-            pos_pairs = [(list(p)[0], list(p)[1], w) for p, w in pair_weights.items() 
-                        if w > 3.0 and list(p)[0] in person_to_pos and list(p)[1] in person_to_pos]
-            neg_pairs = [(list(p)[0], list(p)[1], w) for p, w in pair_weights.items() 
-                        if w < -3.0 and list(p)[0] in person_to_pos and list(p)[1] in person_to_pos]
-        else:
-            # 只包含实际满足的关系（相邻座位）
-            pos_pairs = [(list(p)[0], list(p)[1], w) for p, w in pair_weights.items() 
-                        if w > 3.0 and list(p)[0] in person_to_pos and list(p)[1] in person_to_pos 
-                        and are_seats_adjacent(list(p)[0], list(p)[1])]
-            neg_pairs = [(list(p)[0], list(p)[1], w) for p, w in pair_weights.items() 
-                        if w < -3.0 and list(p)[0] in person_to_pos and list(p)[1] in person_to_pos 
-                        and not are_seats_adjacent(list(p)[0], list(p)[1])]
+        # 只显示实际满足的关系时，一次性求出座位相邻（包括对角线）的所有人员对，
+        # 筛选时只需一次集合查询
+        adjacent_pairs = None if show_all_lines else _adjacent_person_pairs(assignment, seats)
+        
+        # 收集所有连线信息：一次遍历权重字典，每个人员对只展开一次并直接分到正向/负向。
+        # frozenset的元素顺序随字符串哈希变化，按人名排序后连线方向固定
+        pos_pairs = []
+        neg_pairs = []
+        for pair, w in pair_weights.items():
+            is_pos = w > 3.0
+            if not is_pos and not w < -3.0:
+                continue
+            a, b = sorted(pair)
+            if a not in person_to_pos or b not in person_to_pos:
+                continue
+            # 显示所有关系线；否则只包含实际满足的关系（喜欢的相邻、不喜欢的不相邻）
+            if adjacent_pairs is not None and ((a, b) in adjacent_pairs) != is_pos:
+                continue
+            (pos_pairs if is_pos else neg_pairs).append((a, b, w))
+        
+        # 权重字典的顺序来自集合遍历，同样随哈希变化；排序后每条线的颜色和偏移在每次运行中都相同
+        pos_pairs.sort()
+        neg_pairs.sort()
         
         # 如果启用拆分可视化，返回两张图的字节数据
         if split_visualization:
             return _create_split_visualization(assignment, seats, n_cols, rows_per_col, 
                                              pos_pairs, neg_pairs, person_to_pos, 
-                                             figsize, dpi, margin, cell_w, cell_h, max_rows, aisles, show_all_lines)
-        
-        # 统计每个位置的连线数量，用于颜色区分
-        from collections import defaultdict
-        pos_count = defaultdict(int)
-        neg_count = defaultdict(int)
-        
-        # 预统计连线数量
-        for a, b, w in pos_pairs:
-            pos_count[a] += 1
-            pos_count[b] += 1
-        for a, b, w in neg_pairs:
-            neg_count[a] += 1
-            neg_count[b] += 1
-        
-        # 定义颜色列表
-        pos_colors = ['#28a745', '#20c997', '#17a2b8', '#6f42c1', '#e83e8c']
-        neg_colors = ['#dc3545', '#fd7e14', '#ffc107', '#6c757d', '#343a40']
-        
-        # 绘制正向关系线
-        pos_drawn = defaultdict(int)
-        for a, b, w in pos_pairs:
-            if a in person_to_pos and b in person_to_pos:
-                x1, y1 = person_to_pos[a]
-                x2, y2 = person_to_pos[b]
-                
-                # 根据已绘制的线数选择颜色和偏移
-                color_idx = (pos_drawn[a] + pos_drawn[b]) % len(pos_colors)
-                color = pos_colors[color_idx]
-                
-                # 计算偏移量，避免线条重叠
-                offset = (pos_drawn[a] + pos_drawn[b]) * 0.05
-                dx = (y2 - y1) * offset / max(1, abs(x2 - x1) + abs(y2 - y1))
-                dy = -(x2 - x1) * offset / max(1, abs(x2 - x1) + abs(y2 - y1))
-                
-                # 绘制连线
-                ax.plot([x1 + dx, x2 + dx], [y1 + dy, y2 + dy], 
-                       color=color, alpha=0.6, linewidth=2, solid_capstyle='round')
-                
-                # 在连线两端添加圆点
-                ax.scatter([x1 + dx, x2 + dx], [y1 + dy, y2 + dy], 
-                          c=color, s=30, alpha=0.8, zorder=5)
-                
-                pos_drawn[a] += 1
-                pos_drawn[b] += 1
-        
-        # 绘制负向关系线
-        neg_drawn = defaultdict(int)
-        for a, b, w in neg_pairs:
-            if a in person_to_pos and b in person_to_pos:
-                x1, y1 = person_to_pos[a]
-                x2, y2 = person_to_pos[b]
-                
-                # 根据已绘制的线数选择颜色和偏移
-                color_idx = (neg_drawn[a] + neg_drawn[b]) % len(neg_colors)
-                color = neg_colors[color_idx]
-                
-                # 计算偏移量，避免线条重叠
-                offset = (neg_drawn[a] + neg_drawn[b]) * 0.05
-                dx = (y2 - y1) * offset / max(1, abs(x2 - x1) + abs(y2 - y1))
-                dy = -(x2 - x1) * offset / max(1, abs(x2 - x1) + abs(y2 - y1))
-                
-                # 绘制虚线
-                ax.plot([x1 + dx, x2 + dx], [y1 + dy, y2 + dy], 
-                       color=color, alpha=0.6, linewidth=1.5, linestyle='--', solid_capstyle='round')
-                
-                # 在连线两端添加方形标记
-                ax.scatter([x1 + dx, x2 + dx], [y1 + dy, y2 + dy], 
-                          c=color, s=25, alpha=0.8, marker='s', zorder=5)
-                
-                neg_drawn[a] += 1
-                neg_drawn[b] += 1
+                                             figsize, dpi, margin, cell_w, cell_h, max_rows, aisles, show_all_lines,
+                                             compress_level)
+        
+        # 绘制正向关系线（实线+圆点）
+        _draw_relationship_lines(ax, pos_pairs, person_to_pos, _POS_LINE_COLORS,
+                                 linewidth=2, marker_size=30)
+        
+        # 绘制负向关系线（虚线+方点）
+        _draw_relationship_lines(ax, neg_pairs, person_to_pos, _NEG_LINE_COLORS,
+                                 linewidth=1.5, marker_size=25, linestyle='--', marker='s')
     
     # 添加标题和图例
     ax.text(margin, max_rows * cell_h + margin/2, "座位分布图", 
-            fontsize=12, fontweight='bold')
+            fontproperties=_CN_FONT, fontsize=12, fontweight='bold')
     
     # 添加改进的图例
     if pair_weights:
@@ -315,14 +369,14 @@ def export_assignment_to_image(
         # 添加颜色说明
         if len(pos_pairs) > 1 or len(neg_pairs) > 1:
             ax.text(0.02, 0.98, '注：多条线重叠时使用不同颜色区分', 
-                   transform=ax.transAxes, fontsize=7, verticalalignment='top',
+                   transform=ax.transAxes, fontproperties=_CN_FONT, fontsize=7, verticalalignment='top',
                    bbox=dict(boxstyle='round,pad=0.3', facecolor='white', alpha=0.8))
     
-    plt.tight_layout(rect=[0, 0, 1, 0.95])
+    fig.subplots_adjust(**_SEAT_MAP_AXES_RECT)
     
     buf = io.BytesIO()
-    plt.savefig(buf, format="png", dpi=dpi, bbox_inches="tight", facecolor=fig.get_facecolor())
-    plt.close(fig)
+    fig.savefig(buf, format="png", dpi=dpi, facecolor=fig.get_facecolor(),
+                pil_kwargs={'compress_level': compress_level})
     buf.seek(0)
     return buf.getvalue()
 
@@ -342,144 +396,125 @@ def _create_split_visualization(
     cell_h: float,
     max_rows: int,
     aisles: Optional[List[int]] = None,
-    show_all_lines: bool = False
+    show_all_lines: bool = False,
+    compress_level: int = 1
 ) -> bytes:
     """创建分离的正负关系可视化图
     
     Returns:
         bytes: ZIP文件的字节数据，包含两张PNG图片
     """
-    from collections import defaultdict
-    
-    # 创建座位位置映射
-    seat_positions = {idx: (c, r) for idx, (c, r) in enumerate(seats)}
+    # 一次性求出座位相邻（包括对角线）的所有人员对
+    adjacent_pairs = _adjacent_person_pairs(assignment, seats)
     
-    def are_seats_adjacent(person1, person2):
-        """检查两个人的座位是否相邻"""
-        # 找到两个人的座位索引
-        seat1_idx = assignment.get(person1)
-        seat2_idx = assignment.get(person2)
+    # 过滤关系对，只保留满足条件的
+    filtered_pos_pairs = [(a, b, w) for a, b, w in pos_pairs if (a, b) in adjacent_pairs]
+    filtered_neg_pairs = [(a, b, w) for a, b, w in neg_pairs if (a, b) not in adjacent_pairs]
+    
+    def render_layer(pairs, colors, title, **line_style):
+        """绘制只含一类关系线的座位图，返回PNG字节数据"""
+        fig, ax = _reuse_figure(figsize, dpi)
+        fig.patch.set_facecolor('#f8f9fa')
+        ax.set_xlim(0, n_cols * cell_w + 2 * margin)
+        ax.set_ylim(0, max_rows * cell_h + 2 * margin)
+        ax.axis('off')
         
-        if seat1_idx is None or seat2_idx is None:
-            return False
-            
-        # 获取座位坐标
-        if seat1_idx not in seat_positions or seat2_idx not in seat_positions:
-            return False
-            
-        c1, r1 = seat_positions[seat1_idx]
-        c2, r2 = seat_positions[seat2_idx]
+        # 绘制座位和关系线
+        _draw_seats(ax, assignment, seats, margin, cell_w, cell_h, max_rows, aisles)
+        _draw_relationship_lines(ax, pairs, person_to_pos, colors, **line_style)
         
-        # 检查是否相邻（包括对角线）
-        dc = abs(c1 - c2)
-        dr = abs(r1 - r2)
+        ax.text(margin, max_rows * cell_h + margin/2, title, 
+                fontproperties=_CN_FONT, fontsize=12, fontweight='bold')
         
-        return (dc <= 1 and dr <= 1) and (dc + dr > 0)
-    
-    # 过滤关系对，只保留满足条件的
-    filtered_pos_pairs = [(a, b, w) for a, b, w in pos_pairs if are_seats_adjacent(a, b)]
-    filtered_neg_pairs = [(a, b, w) for a, b, w in neg_pairs if not are_seats_adjacent(a, b)]
+        fig.subplots_adjust(**_SEAT_MAP_AXES_RECT)
+        
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png", dpi=dpi, facecolor=fig.get_facecolor(),
+                    pil_kwargs={'compress_level': compress_level})
+        return buf.getvalue()
     
-    # 创建ZIP文件
+    # 创建ZIP文件，没有可画关系的一类不生成图片；PNG本身已压缩，直接存储不再压缩
     zip_buffer = io.BytesIO()
     
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        # 只创建正向关系图
+    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_STORED) as zip_file:
         if filtered_pos_pairs:
-            fig1, ax1 = plt.subplots(figsize=figsize, dpi=dpi)
-            fig1.patch.set_facecolor('#f8f9fa')
-            ax1.set_xlim(0, n_cols * cell_w + 2 * margin)
-            ax1.set_ylim(0, max_rows * cell_h + 2 * margin)
-            ax1.axis('off')
-            
-            # 绘制座位
-            _draw_seats(ax1, assignment, seats, margin, cell_w, cell_h, max_rows, aisles)
-            
-            # 绘制正向关系线
-            pos_colors = ['#28a745', '#20c997', '#17a2b8', '#6f42c1', '#e83e8c']
-            pos_drawn = defaultdict(int)
-            
-            for a, b, w in filtered_pos_pairs:
-                if a in person_to_pos and b in person_to_pos:
-                    x1, y1 = person_to_pos[a]
-                    x2, y2 = person_to_pos[b]
-                    
-                    color_idx = (pos_drawn[a] + pos_drawn[b]) % len(pos_colors)
-                    color = pos_colors[color_idx]
-                    
-                    offset = (pos_drawn[a] + pos_drawn[b]) * 0.05
-                    dx = (y2 - y1) * offset / max(1, abs(x2 - x1) + abs(y2 - y1))
-                    dy = -(x2 - x1) * offset / max(1, abs(x2 - x1) + abs(y2 - y1))
-                    
-                    ax1.plot([x1 + dx, x2 + dx], [y1 + dy, y2 + dy], 
-                           color=color, alpha=0.6, linewidth=2, solid_capstyle='round')
-                    ax1.scatter([x1 + dx, x2 + dx], [y1 + dy, y2 + dy], 
-                              c=color, s=30, alpha=0.8, zorder=5)
-                    
-                    pos_drawn[a] += 1
-                    pos_drawn[b] += 1
-            
-            ax1.text(margin, max_rows * cell_h + margin/2, "座位分布图 - 正向关系", 
-                    fontsize=12, fontweight='bold')
-            
-            plt.tight_layout(rect=[0, 0, 1, 0.95])
-            
-            buf1 = io.BytesIO()
-            plt.savefig(buf1, format="png", dpi=dpi, bbox_inches="tight", facecolor=fig1.get_facecolor())
-            plt.close(fig1)
-            buf1.seek(0)
-            zip_file.writestr("positive_relationships.png", buf1.getvalue())
-        
-        # 创建负向关系图
+            zip_file.writestr("positive_relationships.png", render_layer(
+                filtered_pos_pairs, _POS_LINE_COLORS, "座位分布图 - 正向关系",
+                linewidth=2, marker_size=30))
         if filtered_neg_pairs:
-            fig2, ax2 = plt.subplots(figsize=figsize, dpi=dpi)
-            fig2.patch.set_facecolor('#f8f9fa')
-            ax2.set_xlim(0, n_cols * cell_w + 2 * margin)
-            ax2.set_ylim(0, max_rows * cell_h + 2 * margin)
-            ax2.axis('off')
-            
-            # 绘制座位
-            _draw_seats(ax2, assignment, seats, margin, cell_w, cell_h, max_rows, aisles)
-            
-            # 绘制负向关系线
-            neg_colors = ['#dc3545', '#fd7e14', '#ffc107', '#6c757d', '#343a40']
-            neg_drawn = defaultdict(int)
-            
-            for a, b, w in filtered_neg_pairs:
-                if a in person_to_pos and b in person_to_pos:
-                    x1, y1 = person_to_pos[a]
-                    x2, y2 = person_to_pos[b]
-                    
-                    color_idx = (neg_drawn[a] + neg_drawn[b]) % len(neg_colors)
-                    color = neg_colors[color_idx]
-                    
-                    offset = (neg_drawn[a] + neg_drawn[b]) * 0.05
-                    dx = (y2 - y1) * offset / max(1, abs(x2 - x1) + abs(y2 - y1))
-                    dy = -(x2 - x1) * offset / max(1, abs(x2 - x1) + abs(y2 - y1))
-                    
-                    ax2.plot([x1 + dx, x2 + dx], [y1 + dy, y2 + dy], 
-                           color=color, alpha=0.6, linewidth=1.5, linestyle='--', solid_capstyle='round')
-                    ax2.scatter([x1 + dx, x2 + dx], [y1 + dy, y2 + dy], 
-                              c=color, s=25, alpha=0.8, marker='s', zorder=5)
-                    
-                    neg_drawn[a] += 1
-                    neg_drawn[b] += 1
-            
-            ax2.text(margin, max_rows * cell_h + margin/2, "座位分布图 - 负向关系", 
-                    fontsize=12, fontweight='bold')
-            
-            plt.tight_layout(rect=[0, 0, 1, 0.95])
-            
-            buf2 = io.BytesIO()
-            plt.savefig(buf2, format="png", dpi=dpi, bbox_inches="tight", facecolor=fig2.get_facecolor())
-            plt.close(fig2)
-            buf2.seek(0)
-            zip_file.writestr("negative_relationships.png", buf2.getvalue())
+            zip_file.writestr("negative_relationships.png", render_layer(
+                filtered_neg_pairs, _NEG_LINE_COLORS, "座位分布图 - 负向关系",
+                linewidth=1.5, marker_size=25, linestyle='--', marker='s'))
     
     zip_buffer.seek(0)
     return zip_buffer.getvalue()
 
 
+def _draw_relationship_lines(
+    ax,
+    pairs: List[Tuple[str, str, float]],
+    person_to_pos: Dict[str, Tuple[float, float]],
+    colors: List[str],
+    linewidth: float,
+    marker_size: float,
+    linestyle: str = '-',
+    marker: str = 'o'
+):
+    """把一组关系线及其两端标记一次性画到坐标轴上
+    
+    同一人已有的连线越多，新连线的偏移越大、颜色依次轮换，避免线条重叠。
+    所有连线合成一个LineCollection、所有端点合成一次scatter，
+    不再为每条连线各创建两个图形对象。
+    
+    Args:
+        ax: matplotlib坐标轴
+        pairs: 关系对列表 (人名1, 人名2, 权重)
+        person_to_pos: 人名到座位中心坐标的映射
+        colors: 轮换使用的颜色列表
+        linewidth: 线宽
+        marker_size: 端点标记大小
+        linestyle: 线型
+        marker: 端点标记形状
+    """
+    # 只保留两人都已就座的关系对；每条线的颜色和偏移取决于两人此前已画的线数，
+    # 这一步有先后依赖，逐对计数
+    drawn = defaultdict(int)
+    starts, ends, n_drawn = [], [], []
+    for a, b, w in pairs:
+        if a in person_to_pos and b in person_to_pos:
+            starts.append(person_to_pos[a])
+            ends.append(person_to_pos[b])
+            n_drawn.append(drawn[a] + drawn[b])
+            drawn[a] += 1
+            drawn[b] += 1
+    
+    if not starts:
+        return
+    
+    # 偏移量整批计算：沿连线法向平移，已画线数越多偏移越大，避免线条重叠
+    starts = np.array(starts)
+    ends = np.array(ends)
+    n_drawn = np.array(n_drawn)
+    delta = ends - starts
+    offset = n_drawn * 0.05 / np.maximum(1, np.abs(delta).sum(axis=1))
+    shift = np.column_stack((delta[:, 1], -delta[:, 0])) * offset[:, None]
+    # 形状为(线数, 2个端点, 2个坐标)
+    segments = np.stack((starts + shift, ends + shift), axis=1)
+    # 根据已绘制的线数选择颜色：颜色表先转成RGBA数组，按下标整批取色
+    segment_colors = to_rgba_array(colors)[n_drawn % len(colors)]
+    
+    # 连线画在座位矩形之上（与Line2D默认层级相同），虚线两端保持平头
+    ax.add_collection(LineCollection(
+        segments, colors=segment_colors, alpha=0.6, linewidths=linewidth,
+        linestyles=linestyle, capstyle='round' if linestyle == '-' else 'butt', zorder=2
+    ))
+    
+    # 每条连线的两个端点依次排列，颜色与连线一致
+    points = segments.reshape(-1, 2)
+    ax.scatter(points[:, 0], points[:, 1], c=np.repeat(segment_colors, 2, axis=0),
+               s=marker_size, alpha=0.8, marker=marker, zorder=5)
+
+
 def _draw_seats(
     ax, 
     assignment: Dict[str, int], 
@@ -491,31 +526,35 @@ def _draw_seats(
     aisles: Optional[List[int]] = None
 ):
     """绘制座位的辅助函数"""
+    # 座位ID到人名的映射，一次性反转分配方案
+    seat_to_person = {}
+    for name, seat_idx in assignment.items():
+        seat_to_person.setdefault(seat_idx, name)
+    
+    rects = []
     for idx, (c, r) in enumerate(seats):
         x0 = margin + c * cell_w
         y0 = margin + (max_rows - r - 1) * cell_h
         
         rect_color = '#e9ecef'
-        rect = patches.Rectangle((x0, y0), cell_w, cell_h, fill=True, 
-                               linewidth=1, edgecolor='#adb5bd', facecolor=rect_color)
-        ax.add_patch(rect)
+        rects.append(patches.Rectangle((x0, y0), cell_w, cell_h, fill=True, 
+                                       linewidth=1, edgecolor='#adb5bd', facecolor=rect_color))
         
         seat_id = f"C{c+1}-R{r+1}"
         ax.text(x0 + 0.1, y0 + cell_h - 0.2, seat_id, ha='left', va='top', 
-                fontsize=7, color='#6c757d')
+                fontproperties=_CN_FONT, fontsize=7, color='#6c757d')
         
         # 找到这个座位的人
-        name = None
-        for k, v in assignment.items():
-            if v == idx:
-                name = k
-                break
+        name = seat_to_person.get(idx)
         
         # 显示人名
         label = name if name else ""
         if label:
             ax.text(x0 + cell_w/2, y0 + cell_h/2, label, ha='center', va='center', 
-                    fontsize=min(9, max(6, 60//len(label))), fontweight='bold')
+                    fontproperties=_CN_FONT, fontsize=min(9, max(6, 60//len(label))), fontweight='bold')
+    
+    # 所有座位矩形合成一个PatchCollection，只添加一个Artist（单个Patch默认尖角连接，集合需显式指定）
+    ax.add_collection(PatchCollection(rects, match_original=True, joinstyle='miter'))
     
     # 绘制过道线条
     if aisles:
@@ -532,79 +571,154 @@ def _draw_seats(
                           color='#6c757d', linewidth=3, linestyle='--', alpha=0.7)
                 # 添加过道标识
                 ax.text(x_aisle + cell_w * 0.1, margin + max_rows * cell_h / 2, '过道', 
-                       rotation=90, ha='left', va='center', fontsize=8, color='#6c757d')
+                       rotation=90, ha='left', va='center', fontproperties=_CN_FONT, fontsize=8, color='#6c757d')
 
 
-def create_assignment_summary_excel(
+def _summary_sheets(
     results: List[Dict], 
-    people: List[str], 
     seats: List[Tuple[int, int]]
-) -> bytes:
-    """创建包含多个方案对比的Excel文件
+) -> List[Tuple[str, List[float], List[str], List[list], bool]]:
+    """整理方案对比表和各方案详情表的内容，与具体的Excel写出库无关
     
     Args:
         results: 座位分配结果列表
-        people: 人员列表
         seats: 座位列表
         
     Returns:
-        bytes: Excel文件的字节数据
+        List[Tuple[str, List[float], List[str], List[list], bool]]: 
+            每个工作表的(名称, 各列列宽, 表头, 数据行, 数据行是否居中)
     """
-    wb = openpyxl.Workbook()
-    
-    # 创建摘要工作表
-    summary_ws = wb.active
-    summary_ws.title = "方案对比"
-    
-    # 写入摘要表头
     headers = ["方案编号", "目标函数值", "满足率(%)", "满足人数", "满足对数", "求解状态"]
-    for col, header in enumerate(headers, 1):
-        summary_ws.cell(1, col).value = header
-        summary_ws.cell(1, col).alignment = Alignment(horizontal='center')
-    
-    # 写入摘要数据
+    summary_rows = [
+        [
+            f"方案{i}",
+            round(result.get('objective', 0), 2),
+            result.get('satisfaction_rate', 0),
+            result.get('n_satisfied', 0),
+            result.get('n_satisfied_pairs', 0),
+            "最优解" if result.get('status') == 4 else "可行解",
+        ]
+        for i, result in enumerate(results, 1)
+    ]
+    sheets = [("方案对比", [15] * len(headers), headers, summary_rows, False)]
+    
+    # 每个方案一张详细工作表
     for i, result in enumerate(results, 1):
-        summary_ws.cell(i + 1, 1).value = f"方案{i}"
-        summary_ws.cell(i + 1, 2).value = round(result.get('objective', 0), 2)
-        summary_ws.cell(i + 1, 3).value = result.get('satisfaction_rate', 0)
-        summary_ws.cell(i + 1, 4).value = result.get('n_satisfied', 0)
-        summary_ws.cell(i + 1, 5).value = result.get('n_satisfied_pairs', 0)
-        summary_ws.cell(i + 1, 6).value = "最优解" if result.get('status') == 4 else "可行解"
-    
-    # 调整列宽
-    for col in range(1, len(headers) + 1):
-        summary_ws.column_dimensions[chr(64 + col)].width = 15
-    
-    # 为每个方案创建详细工作表
-    for i, result in enumerate(results, 1):
-        ws = wb.create_sheet(f"方案{i}详情")
-        assignment = result.get('assignment', {})
-        
-        # 写入详细分配信息
-        ws.cell(1, 1).value = "姓名"
-        ws.cell(1, 2).value = "座位号"
-        ws.cell(1, 1).alignment = Alignment(horizontal='center')
-        ws.cell(1, 2).alignment = Alignment(horizontal='center')
-        
-        for row, (name, seat_idx) in enumerate(assignment.items(), 2):
-            ws.cell(row, 1).value = name
+        detail_rows = []
+        for name, seat_idx in result.get('assignment', {}).items():
             if 0 <= seat_idx < len(seats):
                 c, r = seats[seat_idx]
-                ws.cell(row, 2).value = f"C{c+1}-R{r+1}"
+                seat_label = f"C{c+1}-R{r+1}"
             else:
-                ws.cell(row, 2).value = "未知座位"
-            
-            ws.cell(row, 1).alignment = Alignment(horizontal='center')
-            ws.cell(row, 2).alignment = Alignment(horizontal='center')
+                seat_label = "未知座位"
+            detail_rows.append([name, seat_label])
+        sheets.append((f"方案{i}详情", [20, 15], ["姓名", "座位号"], detail_rows, True))
+    
+    return sheets
+
+
+def _write_summary_xlsxwriter(sheets, output: io.BytesIO) -> None:
+    """用XlsxWriter按行直接写出XML（constant_memory模式）
+    
+    Args:
+        sheets: _summary_sheets返回的工作表内容
+        output: 输出缓冲区
+        
+    Raises:
+        ImportError: 未安装xlsxwriter
+    """
+    import xlsxwriter
+    
+    # constant_memory模式下每写完一行即落盘，行必须按顺序写入
+    wb = xlsxwriter.Workbook(output, {'constant_memory': True})
+    center = wb.add_format({'align': 'center'})
+    
+    for title, widths, headers, rows, center_rows in sheets:
+        ws = wb.add_worksheet(title)
+        for col, width in enumerate(widths):
+            ws.set_column(col, col, width)
+        ws.write_row(0, 0, headers, center)
+        row_format = center if center_rows else None
+        for r, row in enumerate(rows, 1):
+            ws.write_row(r, 0, row, row_format)
+    
+    wb.close()
+
+
+def _write_summary_openpyxl(sheets, output: io.BytesIO) -> None:
+    """用openpyxl只写模式按行流式写出各工作表
+    
+    Args:
+        sheets: _summary_sheets返回的工作表内容
+        output: 输出缓冲区
+    """
+    import openpyxl
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment
+    from openpyxl.utils import get_column_letter
+    
+    wb = openpyxl.Workbook(write_only=True)
+    
+    # 所有居中单元格共用同一个对齐样式实例
+    center = Alignment(horizontal='center')
+    
+    def centered_row(ws, values):
+        """创建一行居中对齐的只写单元格"""
+        cells = []
+        for value in values:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.alignment = center
+            cells.append(cell)
+        return cells
+    
+    for title, widths, headers, rows, center_rows in sheets:
+        ws = wb.create_sheet(title)
+        
+        # 调整列宽（只写模式下需在写入第一行之前设置）
+        for col, width in enumerate(widths, 1):
+            ws.column_dimensions[get_column_letter(col)].width = width
         
-        # 调整列宽
-        ws.column_dimensions['A'].width = 20
-        ws.column_dimensions['B'].width = 15
+        ws.append(centered_row(ws, headers))
+        for row in rows:
+            ws.append(centered_row(ws, row) if center_rows else row)
+    
+    wb.save(output)
+
+
+def create_assignment_summary_excel(
+    results: List[Dict], 
+    people: List[str], 
+    seats: List[Tuple[int, int]],
+    engine: str = "xlsxwriter"
+) -> bytes:
+    """创建包含多个方案对比的Excel文件
+    
+    Args:
+        results: 座位分配结果列表
+        people: 人员列表
+        seats: 座位列表
+        engine: Excel写出库，"xlsxwriter"（未安装时自动回退到openpyxl）或"openpyxl"
+        
+    Returns:
+        bytes: Excel文件的字节数据
+        
+    Raises:
+        ValueError: engine不是支持的写出库
+    """
+    if engine not in ("xlsxwriter", "openpyxl"):
+        raise ValueError(f"不支持的Excel写出库: {engine}")
+    
+    sheets = _summary_sheets(results, seats)
     
     # 保存到内存
     output = io.BytesIO()
-    wb.save(output)
-    output.seek(0)
+    if engine == "xlsxwriter":
+        try:
+            _write_summary_xlsxwriter(sheets, output)
+        except ImportError:
+            engine = "openpyxl"
+    if engine == "openpyxl":
+        _write_summary_openpyxl(sheets, output)
     
     return output.getvalue()
 
@@ -614,7 +728,10 @@ def export_layout_preview(
     rows_per_col: List[int], 
     edges: List[Tuple[Tuple[int, int], Tuple[int, int]]],
     figsize: Optional[Tuple[float, float]] = None,
-    dpi: int = 100
+    dpi: Optional[int] = None,
+    compress_level: Optional[int] = None,
+    hq: bool = False,
+    quality: str = "standard"
 ) -> bytes:
     """导出教室布局预览图
     
@@ -623,28 +740,41 @@ def export_layout_preview(
         rows_per_col: 每列的排数列表
         edges: 邻座边列表
         figsize: 图片尺寸（可选）
-        dpi: 图片分辨率
+        dpi: 图片分辨率（可选，默认取质量档位的分辨率）
+        compress_level: PNG压缩级别（0-9，可选，默认取质量档位的压缩级别）
+        hq: 为True时用matplotlib绘制（带标题和坐标轴），否则直接用Pillow绘制，速度快得多
+        quality: 质量档位，"preview"（72dpi）、"standard"（100dpi）或"print"（200dpi）
         
     Returns:
         bytes: PNG图片的字节数据
+        
+    Raises:
+        ValueError: 不支持的质量档位
     """
+    dpi, compress_level = _resolve_quality(quality, dpi, compress_level)
     max_rows = max(rows_per_col) if rows_per_col else 0
     
     if figsize is None:
         figsize = (max(8, n_cols * 1.2), max(6, max_rows * 1.2))
     
-    fig, ax = plt.subplots(figsize=figsize, dpi=dpi)
+    if not hq:
+        return _render_layout_preview_pil(n_cols, rows_per_col, edges, figsize, dpi, compress_level)
+    
+    fig, ax = _reuse_figure(figsize, dpi)
     
     # 绘制座位
+    rects = []
     for c in range(n_cols):
         for r in range(rows_per_col[c]):
-            rect = patches.Rectangle((c, r), 0.9, 0.9, fill=True, 
-                                   edgecolor='black', facecolor='lightgray', alpha=0.5)
-            ax.add_patch(rect)
-            ax.text(c + 0.45, r + 0.45, f"C{c+1}-R{r+1}", ha='center', va='center', fontsize=8)
+            rects.append(patches.Rectangle((c, r), 0.9, 0.9, fill=True, 
+                                           edgecolor='black', facecolor='lightgray', alpha=0.5))
+            ax.text(c + 0.45, r + 0.45, f"C{c+1}-R{r+1}", ha='center', va='center', fontproperties=_CN_FONT, fontsize=8)
+    
+    # 所有座位矩形合成一个PatchCollection，只添加一个Artist（单个Patch默认尖角连接，集合需显式指定）
+    ax.add_collection(PatchCollection(rects, match_original=True, joinstyle='miter'))
     
-    # 绘制邻座关系
-    for (c1, r1), (c2, r2) in edges:
+    # 绘制邻座关系：邻座边按双向给出，同一对座位只画一条线
+    for (c1, r1), (c2, r2) in dict.fromkeys(tuple(sorted(edge)) for edge in edges):
         ax.plot([c1 + 0.45, c2 + 0.45], [r1 + 0.45, r2 + 0.45], 'b-', alpha=0.3)
     
     ax.set_xlim(-0.5, n_cols + 0.5)
@@ -654,10 +784,88 @@ def export_layout_preview(
     ax.set_xticklabels([f'C{i+1}' for i in range(n_cols)])
     ax.set_yticklabels([f'R{i+1}' for i in range(max_rows)])
     ax.set_title('教室座位布局预览')
-    plt.tight_layout()
+    fig.tight_layout()
     
     buf = io.BytesIO()
-    plt.savefig(buf, format="png", dpi=dpi, bbox_inches="tight")
-    plt.close(fig)
+    fig.savefig(buf, format="png", dpi=dpi, bbox_inches="tight", pil_kwargs={'compress_level': compress_level})
     buf.seek(0)
-    return buf.getvalue()
\ No newline at end of file
+    return buf.getvalue()
+
+
+def _render_layout_preview_pil(
+    n_cols: int, 
+    rows_per_col: List[int], 
+    edges: List[Tuple[Tuple[int, int], Tuple[int, int]]],
+    figsize: Tuple[float, float],
+    dpi: int,
+    compress_level: int
+) -> bytes:
+    """用Pillow直接绘制布局预览图，省去matplotlib创建图形和计算紧凑边界的开销
+    
+    坐标与matplotlib版本一致：座位(c, r)占据[c, c+0.9]×[r, r+0.9]，R1在底部。
+    Pillow默认字体不含中文，因此不绘制标题。
+    
+    Args:
+        n_cols: 列数
+        rows_per_col: 每列的排数列表
+        edges: 邻座边列表
+        figsize: 图片尺寸（英寸）
+        dpi: 图片分辨率
+        compress_level: PNG压缩级别（0-9）
+        
+    Returns:
+        bytes: PNG图片的字节数据
+    """
+    max_rows = max(rows_per_col) if rows_per_col else 0
+    font_px = max(1, round(8 * dpi / 72))
+    try:
+        font = ImageFont.load_default(size=font_px)
+    except TypeError:
+        # Pillow 10.1之前load_default不支持size参数，退回到固定大小的位图字体
+        font = ImageFont.load_default()
+    
+    # 左侧和底部留出坐标轴标签的位置，其余空间按数据范围[-0.5, n+0.5]等比例缩放
+    pad = 4 * font_px
+    unit = min((figsize[0] * dpi - pad) / (n_cols + 1), (figsize[1] * dpi - pad) / (max_rows + 1))
+    width = int(pad + (n_cols + 1) * unit)
+    height = int(pad + (max_rows + 1) * unit)
+    
+    def to_px(x, y):
+        """数据坐标转换为像素坐标（y轴向上）"""
+        return (pad + (x + 0.5) * unit, (max_rows + 0.5 - y) * unit)
+    
+    def draw_centered_text(x, y, text):
+        """以像素坐标(x, y)为中心绘制文字"""
+        left, top, right, bottom = draw.textbbox((0, 0), text, font=font)
+        draw.text((x - (left + right) / 2, y - (top + bottom) / 2), text, fill='black', font=font)
+    
+    img = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(img, "RGBA")
+    
+    # 座位：浅灰色半透明填充、黑色半透明边框（与matplotlib版本的alpha=0.5叠加在白底上的颜色相同）
+    for c in range(n_cols):
+        for r in range(rows_per_col[c]):
+            x0, y0 = to_px(c, r + 0.9)
+            x1, y1 = to_px(c + 0.9, r)
+            draw.rectangle([x0, y0, x1, y1], fill=(233, 233, 233), outline=(128, 128, 128))
+    
+    # 邻座关系：半透明蓝线
+    line_width = max(1, round(1.5 * dpi / 72))
+    for (c1, r1), (c2, r2) in dict.fromkeys(tuple(sorted(edge)) for edge in edges):
+        draw.line([to_px(c1 + 0.45, r1 + 0.45), to_px(c2 + 0.45, r2 + 0.45)], 
+                  fill=(0, 0, 255, 77), width=line_width)
+    
+    # 座位编号和坐标轴标签画在最上层
+    for c in range(n_cols):
+        for r in range(rows_per_col[c]):
+            draw_centered_text(*to_px(c + 0.45, r + 0.45), f"C{c+1}-R{r+1}")
+    for c in range(n_cols):
+        x, y = to_px(c, -0.5)
+        draw_centered_text(x, y + pad / 2, f'C{c+1}')
+    for r in range(max_rows):
+        x, y = to_px(-0.5, r)
+        draw_centered_text(x - pad / 2, y, f'R{r+1}')
+    
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", compress_level=compress_level)
+    return buf.getvalue()
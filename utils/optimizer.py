@@ -6,8 +6,16 @@
 from ortools.sat.python import cp_model
 from typing import List, Dict, Tuple, Set, Optional, Callable
 from collections import defaultdict
+from functools import lru_cache
+import os
+import math
+import multiprocessing
 import time
 import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+
+from .seat_layout import build_adjacency_matrix
 
 
 class SeatAssignmentResult:
@@ -23,6 +31,777 @@ class SeatAssignmentResult:
         self.n_satisfied_pairs = 0
 
 
+def _auction_assignment(benefit: np.ndarray) -> np.ndarray:
+    """ε-scaling拍卖算法求解线性指派问题（最大化总收益）
+    
+    Args:
+        benefit: 收益矩阵，形状为(人数, 座位数)，要求人数不超过座位数
+        
+    Returns:
+        np.ndarray: 每个人分配到的座位索引
+    """
+    P, S = benefit.shape
+    if P == 0:
+        return np.full(0, -1, dtype=np.int64)
+    
+    # 座位多于人数时补充零收益的虚拟人员，否则ε缩放后空座位的残留价格会破坏最优性
+    if P < S:
+        benefit = np.vstack([benefit, np.zeros((S - P, S), dtype=benefit.dtype)])
+    n = S
+    seat_of = np.full(n, -1, dtype=np.int64)
+    
+    prices = np.zeros(S, dtype=benefit.dtype)
+    span = float(benefit.max() - benefit.min())
+    eps_min = 1.0 / (n + 1)
+    eps = max(span / 2, eps_min)
+    
+    while True:
+        # 每一轮缩放都重新出价，但保留上一轮的价格
+        seat_of[:] = -1
+        owner = np.full(S, -1, dtype=np.int64)
+        
+        while True:
+            bidders = np.flatnonzero(seat_of < 0)
+            if bidders.size == 0:
+                break
+            
+            # 所有未分配者同时计算净收益，取最优和次优
+            values = benefit[bidders] - prices
+            if S > 1:
+                top2 = np.argpartition(-values, 1, axis=1)[:, :2]
+                top2_values = np.take_along_axis(values, top2, axis=1)
+                first = np.argmax(top2_values, axis=1)
+                rows = np.arange(bidders.size)
+                best = top2[rows, first]
+                v_best = top2_values[rows, first]
+                v_second = top2_values[rows, 1 - first]
+            else:
+                best = np.zeros(bidders.size, dtype=np.int64)
+                v_best = values[:, 0]
+                v_second = v_best
+            bids = prices[best] + (v_best - v_second) + eps
+            
+            # 每个座位只接受最高出价
+            order = np.lexsort((bids, best))
+            last = np.r_[best[order][1:] != best[order][:-1], True]
+            winners = order[last]
+            won_seats = best[winners]
+            
+            prev_owners = owner[won_seats]
+            seat_of[prev_owners[prev_owners >= 0]] = -1
+            owner[won_seats] = bidders[winners]
+            seat_of[bidders[winners]] = won_seats
+            prices[won_seats] = bids[winners]
+        
+        if eps <= eps_min:
+            break
+        eps = max(eps / 2, eps_min)
+    
+    return seat_of[:P]
+
+
+def evaluate_assignment(
+    seat_of: np.ndarray,
+    weight_matrix: np.ndarray,
+    adj_matrix: np.ndarray
+) -> float:
+    """用稠密矩阵计算一个座位方案的目标函数值
+    
+    Args:
+        seat_of: 每个人的座位索引（按人员顺序）
+        weight_matrix: 对称的人员权重矩阵，见build_weight_matrix
+        adj_matrix: 座位邻接矩阵，见build_adjacency_matrix
+        
+    Returns:
+        float: 相邻人员对的权重之和，与CP-SAT模型的目标函数一致
+    """
+    seat_of = np.asarray(seat_of)
+    return float(np.sum(weight_matrix * adj_matrix[np.ix_(seat_of, seat_of)]) / 2)
+
+
+def _auction_warm_start(
+    W: np.ndarray,
+    A: np.ndarray,
+    max_iter: int = 50,
+    seed: int = 0
+) -> Tuple[np.ndarray, float]:
+    """用迭代线性化+拍卖算法构造初始座位方案，作为求解器的提示解
+    
+    固定其他人的座位后，每个人坐到某个座位的收益是线性的，
+    因此每轮随机挑选一半人员重新求解线性指派问题来逼近原二次目标。
+    
+    Args:
+        W: 人员权重矩阵（P×P，对称）
+        A: 座位邻接矩阵（S×S）
+        max_iter: 最大迭代次数
+        seed: 随机种子
+        
+    Returns:
+        Tuple[np.ndarray, float]: (每个人的座位索引, 对应的目标函数值)
+    """
+    P = W.shape[0]
+    
+    def objective(seat_of: np.ndarray) -> float:
+        return evaluate_assignment(seat_of, W, A)
+    
+    rng = np.random.default_rng(seed)
+    # 足够大的奖励，保证本轮不移动的人留在原座位
+    stay_bonus = float(np.abs(W).sum()) * 2 + 1
+    
+    seat_of = np.arange(P)
+    current_obj = objective(seat_of)
+    best_seat_of, best_obj = seat_of, current_obj
+    for _ in range(max_iter):
+        benefit = W @ A[seat_of]
+        fixed = rng.random(P) < 0.5
+        benefit[fixed, seat_of[fixed]] += stay_bonus
+        candidate = _auction_assignment(benefit)
+        obj = objective(candidate)
+        if obj >= current_obj:
+            seat_of, current_obj = candidate, obj
+            if obj > best_obj:
+                best_seat_of, best_obj = candidate, obj
+    
+    return best_seat_of, best_obj
+
+
+def _dense_matrices(
+    P: int,
+    S: int,
+    seats: List[Tuple[int, int]],
+    weighted_idx_pairs: List[Tuple[int, int, float]],
+    oriented_edges: List[Tuple[Tuple[int, int], Tuple[int, int]]]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """构建启发式算法使用的人员权重矩阵W（P×P）和座位邻接矩阵A（S×S）"""
+    W = np.zeros((P, P), dtype=np.float32)
+    for i, j, w in weighted_idx_pairs:
+        W[i, j] += w
+        W[j, i] += w
+    A = build_adjacency_matrix(seats, oriented_edges).astype(np.float32)
+    return W, A
+
+
+def _neighbor_moves(
+    seat_of: np.ndarray,
+    W: np.ndarray,
+    A: np.ndarray,
+    allowed: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """一次性计算所有“交换两人”和“一人换到空座”邻近方案的目标函数增量
+    
+    给出allowed（人数×座位数的布尔矩阵）时，会让人坐到禁止座位的邻近方案增量为-inf。
+    
+    Returns:
+        Tuple: (增量数组，前len(swap_i)项为交换、其余为换座, 交换的人员i, 交换的人员j, 空座位索引)
+    """
+    P, S = len(seat_of), A.shape[0]
+    # G[i, t]: 其他人不动时第i人坐在座位t与他人的权重和
+    G = W @ A[seat_of]
+    g = G[np.arange(P), seat_of]
+    
+    # 交换i、j两人座位后的目标函数增量（两人之间的关系不变）
+    D = G[:, seat_of]
+    swap_delta = D + D.T - g[:, None] - g[None, :] + 2 * W * A[np.ix_(seat_of, seat_of)]
+    swap_i, swap_j = np.triu_indices(P, k=1)
+    
+    # 第i人换到空座t后的目标函数增量
+    empty = np.setdiff1d(np.arange(S), seat_of)
+    move_delta = G[:, empty] - g[:, None]
+    
+    if allowed is not None:
+        # 交换后i坐seat_of[j]、j坐seat_of[i]
+        swap_ok = allowed[:, seat_of]
+        swap_delta = np.where(swap_ok & swap_ok.T, swap_delta, -np.inf)
+        move_delta = np.where(allowed[:, empty], move_delta, -np.inf)
+    
+    deltas = np.concatenate([swap_delta[swap_i, swap_j], move_delta.ravel()])
+    return deltas, swap_i, swap_j, empty
+
+
+def _apply_move(
+    seat_of: np.ndarray,
+    k: int,
+    swap_i: np.ndarray,
+    swap_j: np.ndarray,
+    empty: np.ndarray
+) -> np.ndarray:
+    """按_neighbor_moves中的第k个邻近方案生成新的座位方案"""
+    candidate = seat_of.copy()
+    if k < len(swap_i):
+        i, j = swap_i[k], swap_j[k]
+        candidate[i], candidate[j] = seat_of[j], seat_of[i]
+    else:
+        i, t = divmod(int(k) - len(swap_i), len(empty))
+        candidate[i] = empty[t]
+    return candidate
+
+
+def _local_search(
+    seat_of: np.ndarray,
+    W: np.ndarray,
+    A: np.ndarray,
+    max_iter: int = 200,
+    allowed: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, float]:
+    """最陡上升的交换/换座局部搜索，改进初始方案直到没有正增量的邻近方案
+    
+    Args:
+        seat_of: 初始方案中每个人的座位索引
+        W: 人员权重矩阵
+        A: 座位邻接矩阵（对称）
+        max_iter: 最大移动次数
+        allowed: 每人可坐的座位（人数×座位数的布尔矩阵），None表示不限制
+        
+    Returns:
+        Tuple[np.ndarray, float]: (局部最优方案, 对应的目标函数值)
+    """
+    seat_of = np.asarray(seat_of)
+    for _ in range(max_iter):
+        deltas, swap_i, swap_j, empty = _neighbor_moves(seat_of, W, A, allowed)
+        if deltas.size == 0:
+            break
+        k = int(np.argmax(deltas))
+        if deltas[k] <= 1e-6:
+            break
+        seat_of = _apply_move(seat_of, k, swap_i, swap_j, empty)
+    return seat_of, evaluate_assignment(seat_of, W, A)
+
+
+def _best_neighbor(
+    seat_of: np.ndarray,
+    W: np.ndarray,
+    A: np.ndarray,
+    excluded: Set[Tuple[int, ...]],
+    allowed: Optional[np.ndarray] = None
+) -> Optional[np.ndarray]:
+    """在只差一次交换或一次换到空座的邻近方案中，找目标函数值最高且未使用过的方案
+    
+    Args:
+        seat_of: 当前方案中每个人的座位索引
+        W: 人员权重矩阵
+        A: 座位邻接矩阵（对称）
+        excluded: 已使用方案的座位索引元组集合
+        allowed: 每人可坐的座位（人数×座位数的布尔矩阵），None表示不限制
+        
+    Returns:
+        Optional[np.ndarray]: 邻近方案；没有可用邻近方案时返回None
+    """
+    deltas, swap_i, swap_j, empty = _neighbor_moves(seat_of, W, A, allowed)
+    for k in np.argsort(-deltas, kind="stable"):
+        if deltas[k] == -np.inf:
+            break
+        candidate = _apply_move(seat_of, k, swap_i, swap_j, empty)
+        if tuple(candidate.tolist()) not in excluded:
+            return candidate
+    return None
+
+
+def _index_weighted_pairs(
+    people: List[str],
+    pair_weights: Dict[frozenset, float]
+) -> List[Tuple[int, int, float]]:
+    """把非零权重的人员对转换为 (i, j, w) 索引三元组，保证 i < j
+    
+    Args:
+        people: 人员名单
+        pair_weights: 人员对权重字典
+        
+    Returns:
+        List[Tuple[int, int, float]]: 名单内的有效权重对
+    """
+    name_to_idx = {p: i for i, p in enumerate(people)}
+    weighted_idx_pairs = []
+    for pair, w in pair_weights.items():
+        if abs(w) <= 1e-9:
+            continue
+        a, b = pair
+        if a in name_to_idx and b in name_to_idx:
+            ia, ib = name_to_idx[a], name_to_idx[b]
+            if ia == ib:
+                continue
+            if ia > ib:
+                ia, ib = ib, ia
+            weighted_idx_pairs.append((ia, ib, w))
+    return weighted_idx_pairs
+
+
+def _forbidden_seat_pairs(
+    people: List[str],
+    S: int,
+    forbidden_seats: Optional[Dict[str, Set[int]]]
+) -> Tuple[Tuple[int, int], ...]:
+    """把按人名给出的禁止座位转换为排好序的 (人员索引, 座位索引) 元组，可直接作为缓存键
+    
+    Args:
+        people: 人员名单
+        S: 座位数量
+        forbidden_seats: 人名 -> 该人不能坐的座位索引集合；名单外的人和越界座位被忽略
+    """
+    name_to_idx = {p: i for i, p in enumerate(people)}
+    return tuple(sorted(
+        (name_to_idx[name], s)
+        for name, seats in (forbidden_seats or {}).items() if name in name_to_idx
+        for s in set(seats) if 0 <= s < S
+    ))
+
+
+def _allowed_seat_mask(P: int, S: int, forbidden_pairs: Tuple[Tuple[int, int], ...]) -> Optional[np.ndarray]:
+    """每人可坐座位的布尔矩阵（人数×座位数）；没有禁止座位时返回None"""
+    if not forbidden_pairs:
+        return None
+    allowed = np.ones((P, S), dtype=bool)
+    idx = np.array(forbidden_pairs, dtype=np.intp)
+    allowed[idx[:, 0], idx[:, 1]] = False
+    return allowed
+
+
+def _repair_forbidden_seats(seat_of: np.ndarray, allowed: np.ndarray) -> Optional[np.ndarray]:
+    """把坐在禁止座位上的人挪开，其余人尽量不动；无法满足时返回None
+    
+    用拍卖算法求解线性指派：留在原座位得1分，坐禁止座位扣P+1分。
+    """
+    P, S = allowed.shape
+    benefit = np.where(allowed, 0.0, -(P + 1.0))
+    keep = allowed[np.arange(P), seat_of]
+    benefit[np.flatnonzero(keep), seat_of[keep]] = 1.0
+    repaired = _auction_assignment(benefit)
+    if not allowed[np.arange(P), repaired].all():
+        return None
+    return repaired
+
+
+def _trivial_assignments(
+    P: int,
+    S: int,
+    count: int,
+    seed: Optional[int] = None,
+    excluded: Optional[Set[Tuple[int, ...]]] = None
+) -> List[Tuple[int, ...]]:
+    """没有任何权重对时所有方案目标值都为0，无需建模，直接生成互不相同的方案
+    
+    不给种子时第一个方案按顺序就座；给出种子时所有方案都由该种子随机生成，
+    不同种子（如并行求解的各子进程）得到不同的方案。
+    
+    Args:
+        P: 人员数量
+        S: 座位数量
+        count: 需要的方案数量，受不同方案总数 S!/(S-P)! 限制
+        seed: 随机种子，为None时第一个方案按顺序就座
+        excluded: 需要排除的座位索引元组集合
+        
+    Returns:
+        List[Tuple[int, ...]]: 每个方案中每个人的座位索引
+    """
+    excluded = set(excluded or ())
+    count = min(count, math.perm(S, P) - len(excluded))
+    rng = random.Random(seed or 0)
+    assignments = []
+    candidate = tuple(range(P)) if seed is None else tuple(rng.sample(range(S), P))
+    while len(assignments) < count:
+        if candidate not in excluded:
+            excluded.add(candidate)
+            assignments.append(candidate)
+        candidate = tuple(rng.sample(range(S), P))
+    return assignments
+
+
+def _objective_scale(weighted_idx_pairs: List[Tuple[int, int, float]]) -> int:
+    """找出把全部权重变为整数的最小缩放倍数
+    
+    CP-SAT只对整数系数精确求解，浮点系数会被内部近似缩放。权重滑块的步长为0.5，
+    通常缩放2倍即可；自定义权重无法精确表示时使用1000倍并四舍五入。
+    """
+    for scale in (1, 2, 4, 5, 10, 20, 100):
+        if all(abs(w * scale - round(w * scale)) < 1e-6 for _, _, w in weighted_idx_pairs):
+            return scale
+    return 1000
+
+
+def _add_assignment_hint(
+    model: cp_model.CpModel,
+    x: Dict[Tuple[int, int], cp_model.IntVar],
+    seat_vars: List[cp_model.IntVar],
+    pair_terms: List[Tuple[cp_model.IntVar, int, int, int]],
+    seat_adj: np.ndarray,
+    seat_of: np.ndarray,
+    S: int
+) -> None:
+    """把座位方案作为完整提示加入模型
+    
+    x、座位索引变量和相邻指示变量都给出取值，求解器可以直接把提示当作可行解，而不需要先修复。
+    """
+    for i, seat in enumerate(seat_of):
+        model.AddHint(seat_vars[i], int(seat))
+        for s in range(S):
+            if (i, s) in x:
+                model.AddHint(x[i, s], int(s == seat))
+    for adj, i, j, _ in pair_terms:
+        model.AddHint(adj, int(seat_adj[seat_of[i], seat_of[j]]))
+
+
+def _solution_objective(
+    pair_terms: List[Tuple[cp_model.IntVar, int, int, int]],
+    seat_adj: np.ndarray,
+    assign_idx: Dict[int, int],
+    objective_scale: int
+) -> float:
+    """按座位方案精确计算目标函数值
+    
+    相邻指示变量只有单侧约束，非最优的可行解中adj可能取了与实际是否相邻不符的值，
+    求解器报告的目标值会偏低，因此直接按座位重新累加系数。
+    """
+    total = sum(c for _, i, j, c in pair_terms if seat_adj[assign_idx[i], assign_idx[j]])
+    return total / objective_scale
+
+
+def _build_assignment_model(
+    P: int,
+    S: int,
+    seats: List[Tuple[int, int]],
+    weighted_idx_pairs: List[Tuple[int, int, float]],
+    oriented_edges: List[Tuple[Tuple[int, int], Tuple[int, int]]],
+    hint_seed: int = 0,
+    progress_callback: Optional[Callable[[float, str], None]] = None,
+    objective_scale: int = 1,
+    forbidden_pairs: Tuple[Tuple[int, int], ...] = ()
+) -> Tuple[cp_model.CpModel, Dict[Tuple[int, int], cp_model.IntVar], List[cp_model.IntVar], List[Tuple], np.ndarray, Optional[Tuple[np.ndarray, float]]]:
+    """构建座位分配的CP-SAT模型
+    
+    Args:
+        P: 人员数量
+        S: 座位数量
+        seats: 座位列表
+        weighted_idx_pairs: 索引化的权重对
+        oriented_edges: 邻座边列表
+        hint_seed: 拍卖算法初始方案的随机种子
+        progress_callback: 进度回调函数
+        objective_scale: 目标函数系数的整数缩放倍数，见_objective_scale
+        forbidden_pairs: 禁止的 (人员索引, 座位索引)，见_forbidden_seat_pairs；对应的x变量不会创建
+        
+    Returns:
+        Tuple: (模型, 决策变量x（只含允许的座位）, 每人座位索引变量seat_of, 相邻指示变量列表[(adj, i, j, 系数)],
+            座位邻接矩阵, 初始方案及其目标值；无目标函数时为None)
+    """
+    if progress_callback:
+        progress_callback(0.1, "创建约束模型...")
+    model = cp_model.CpModel()
+    if progress_callback:
+        progress_callback(0.2, "创建决策变量...")
+    # 禁止的座位直接不建变量，相关约束只在允许的座位上求和
+    forbidden = set(forbidden_pairs)
+    allowed_seats = [[s for s in range(S) if (i, s) not in forbidden] for i in range(P)]
+    x = {}
+    for i in range(P):
+        for s in allowed_seats[i]:
+            x[i, s] = model.NewBoolVar(f"x_{i}_{s}")
+
+    # 每人一个座位
+    if progress_callback:
+        progress_callback(0.3, "添加座位分配约束...")
+    for i in range(P):
+        model.AddExactlyOne(x[i, s] for s in allowed_seats[i])
+    # 每座位至多一人
+    for s in range(S):
+        model.AddAtMostOne(x[i, s] for i in range(P) if (i, s) in x)
+    # 座位索引通道变量：seat_of[i] == s 当且仅当 x[i,s]，读取解时每人只需一次取值
+    seat_of = []
+    for i in range(P):
+        if len(allowed_seats[i]) == S:
+            seat_of.append(model.NewIntVar(0, S - 1, f"seat_{i}"))
+            model.AddMapDomain(seat_of[i], [x[i, s] for s in range(S)], 0)
+        else:
+            domain = cp_model.Domain.FromValues(allowed_seats[i])
+            seat_of.append(model.NewIntVarFromDomain(domain, f"seat_{i}"))
+            for s in allowed_seats[i]:
+                model.Add(seat_of[i] == s).OnlyEnforceIf(x[i, s])
+    # 与每座位至多一人等价的冗余约束，让求解器直接在整数变量上传播。
+    # 可互换人员（如都没有偏好的人）之间的对称性由CP-SAT自行检测（symmetry_level默认为2），
+    # 实测再手动加 seat_of[a] < seat_of[b] 的排序约束反而更慢
+    model.AddAllDifferent(seat_of)
+
+    # 目标：邻座对的权重和。每个权重对只建一个指示变量 adj = [i与j坐在相邻座位]，
+    # 而不是为每条邻座边建乘积变量 x[i,s]*x[j,t]，变量数从 权重对数×边数 降到 权重对数
+    if progress_callback:
+        progress_callback(0.4, "构建目标函数...")
+    adj_vars = []
+    adj_coeffs = []
+    pair_terms = []
+    
+    seat_adj = build_adjacency_matrix(seats, oriented_edges)
+    neighbors = [np.flatnonzero(seat_adj[s]).tolist() for s in range(S)]
+    
+    for (i, j, w) in weighted_idx_pairs:
+        coeff = int(round(w * objective_scale))
+        adj = model.NewBoolVar(f"adj_{i}_{j}")
+        # 只加目标函数方向需要的一侧约束：正权重时求解器会尽量让adj=1，只需保证
+        # adj且i坐s时j坐在s的某个邻座；负权重时会尽量让adj=0，只需保证i坐s且j坐s的邻座时adj=1
+        for s in allowed_seats[i]:
+            near = [x[j, t] for t in neighbors[s] if (j, t) in x]
+            if coeff > 0:
+                model.AddBoolOr([adj.Not(), x[i, s].Not()] + near)
+            elif near:
+                model.Add(adj >= x[i, s] + sum(near) - 1)
+        pair_terms.append((adj, i, j, coeff))
+        adj_vars.append(adj)
+        adj_coeffs.append(coeff)
+
+    warm_start = None
+    if adj_vars:  # 只有在有权重对时才设置目标函数
+        model.Maximize(cp_model.LinearExpr.WeightedSum(adj_vars, adj_coeffs))
+        
+        # 用拍卖算法构造的初始方案作为提示，加快找到高质量解
+        W, A = _dense_matrices(P, S, seats, weighted_idx_pairs, oriented_edges)
+        hint, hint_obj = _auction_warm_start(W, A, seed=hint_seed)
+        allowed = _allowed_seat_mask(P, S, forbidden_pairs)
+        if allowed is not None:
+            hint = _repair_forbidden_seats(hint, allowed)
+        # 拍卖算法每轮只重排一半人员，再用交换/换座局部搜索补上剩余的单步改进
+        if hint is not None:
+            hint, hint_obj = _local_search(hint, W, A, allowed=allowed)
+            warm_start = (hint, hint_obj)
+            _add_assignment_hint(model, x, seat_of, pair_terms, seat_adj, hint, S)
+
+    return model, x, seat_of, pair_terms, seat_adj, warm_start
+
+
+@lru_cache(maxsize=4)
+def _build_assignment_model_cached(
+    P: int,
+    S: int,
+    seats: Tuple[Tuple[int, int], ...],
+    weighted_idx_pairs: Tuple[Tuple[int, int, float], ...],
+    oriented_edges: Tuple[Tuple[Tuple[int, int], Tuple[int, int]], ...],
+    objective_scale: int,
+    forbidden_pairs: Tuple[Tuple[int, int], ...]
+) -> Tuple:
+    """按问题参数缓存的模型构建结果，调用方不能直接修改，见_cached_assignment_model"""
+    return _build_assignment_model(
+        P, S, list(seats), list(weighted_idx_pairs), list(oriented_edges),
+        objective_scale=objective_scale, forbidden_pairs=forbidden_pairs
+    )
+
+
+def _cached_assignment_model(
+    P: int,
+    S: int,
+    seats: List[Tuple[int, int]],
+    weighted_idx_pairs: List[Tuple[int, int, float]],
+    oriented_edges: List[Tuple[Tuple[int, int], Tuple[int, int]]],
+    objective_scale: int = 1,
+    forbidden_pairs: Tuple[Tuple[int, int], ...] = ()
+) -> Tuple[cp_model.CpModel, Dict[Tuple[int, int], cp_model.IntVar], List[cp_model.IntVar], List[Tuple], np.ndarray, Optional[Tuple[np.ndarray, float]]]:
+    """返回_build_assignment_model结果的独立副本，相同问题重复求解时跳过建模和初始方案计算
+    
+    Streamlit每次交互都会重新求解，人员、座位和权重不变时模型完全相同。
+    缓存中保存未加no-good cut的原始模型，每次克隆后再把变量映射到副本上，
+    本次加入的no-good cut和提示不会影响之后的调用。
+    """
+    base_model, base_x, base_seat_of, base_terms, seat_adj, warm_start = _build_assignment_model_cached(
+        P, S, tuple(seats), tuple(weighted_idx_pairs), tuple(oriented_edges), objective_scale, forbidden_pairs
+    )
+    model = base_model.Clone()
+    x = {key: model.GetBoolVarFromProtoIndex(var.Index()) for key, var in base_x.items()}
+    seat_of = [model.GetIntVarFromProtoIndex(var.Index()) for var in base_seat_of]
+    pair_terms = [(model.GetBoolVarFromProtoIndex(adj.Index()), i, j, c) for adj, i, j, c in base_terms]
+    return model, x, seat_of, pair_terms, seat_adj, warm_start
+
+
+def _apply_solver_params(solver: cp_model.CpSolver, tuned_params: Optional[Dict[str, object]]) -> None:
+    """把自定义的CP-SAT参数覆盖到求解器上
+    
+    键为SatParameters字段名，例如 {"use_erwa_heuristic": True, "symmetry_level": 2}；
+    字段名写错时抛出AttributeError，而不是静默忽略。
+    """
+    for name, value in (tuned_params or {}).items():
+        if not hasattr(solver.parameters, name):
+            raise AttributeError(f"未知的CP-SAT参数: {name}")
+        setattr(solver.parameters, name, value)
+
+
+def _extract_assignment(
+    solver: cp_model.CpSolver,
+    seat_of: List[cp_model.IntVar]
+) -> Dict[int, int]:
+    """从求解器中读出每个人的座位索引（每人读取一个整数变量，而不是逐个检查P×S个布尔变量）"""
+    return {i: solver.Value(var) for i, var in enumerate(seat_of)}
+
+
+def solve_one(
+    people: List[str],
+    seats: List[Tuple[int, int]],
+    pair_weights: Dict[frozenset, float],
+    oriented_edges: List[Tuple[Tuple[int, int], Tuple[int, int]]],
+    seed: int = 0,
+    time_limit_s: float = 10.0,
+    forbidden: Optional[List[Dict[str, int]]] = None,
+    num_workers: int = 1,
+    tuned_params: Optional[Dict[str, object]] = None,
+    forbidden_seats: Optional[Dict[str, Set[int]]] = None
+) -> Optional[SeatAssignmentResult]:
+    """独立求解一个座位方案，可在子进程中运行
+    
+    Args:
+        people: 人员名单
+        seats: 座位列表
+        pair_weights: 人员对权重字典
+        oriented_edges: 邻座边列表
+        seed: 随机种子，同时作用于初始方案和CP-SAT搜索，不同种子得到不同方案
+        time_limit_s: 时间限制（秒）
+        forbidden: 需要排除的已有方案（按no-good cut加入）
+        num_workers: CP-SAT搜索线程数
+        tuned_params: 覆盖默认值的CP-SAT参数，见_apply_solver_params
+        forbidden_seats: 人名 -> 该人不能坐的座位索引集合（如固定座位、无障碍需求）
+        
+    Returns:
+        Optional[SeatAssignmentResult]: 找到方案时返回结果，否则返回None
+    """
+    P = len(people)
+    S = len(seats)
+    if P > S:
+        raise ValueError(f"座位数({S})不足以容纳全部人员({P})")
+
+    weighted_idx_pairs = _index_weighted_pairs(people, pair_weights)
+    forbidden_pairs = _forbidden_seat_pairs(people, S, forbidden_seats)
+    if not weighted_idx_pairs and not forbidden_pairs:
+        excluded = {tuple(a[p] for p in people) for a in forbidden or [] if all(p in a for p in people)}
+        trivial = _trivial_assignments(P, S, 1, seed=seed, excluded=excluded)
+        if not trivial:
+            return None
+        return SeatAssignmentResult(
+            assignment={people[i]: trivial[0][i] for i in range(P)},
+            objective=0,
+            status=cp_model.OPTIMAL
+        )
+
+    scale = _objective_scale(weighted_idx_pairs)
+    model, x, seat_of, pair_terms, seat_adj, warm_start = _build_assignment_model(
+        P, S, seats, weighted_idx_pairs, oriented_edges, hint_seed=seed, objective_scale=scale,
+        forbidden_pairs=forbidden_pairs
+    )
+    name_to_idx = {p: i for i, p in enumerate(people)}
+    for assignment in forbidden or []:
+        # 至少一人不坐原座位；方案未覆盖全部人员或含禁止座位时该约束恒成立，无需添加
+        keys = [(name_to_idx[p], s) for p, s in assignment.items() if p in name_to_idx]
+        if len(keys) == P and all(key in x for key in keys):
+            model.AddBoolOr([x[key].Not() for key in keys])
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = time_limit_s
+    solver.parameters.num_search_workers = max(1, num_workers)
+    solver.parameters.random_seed = seed
+    _apply_solver_params(solver, tuned_params)
+
+    status = solver.Solve(model)
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        assign_idx = _extract_assignment(solver, seat_of)
+        return SeatAssignmentResult(
+            assignment={people[i]: assign_idx[i] for i in range(P)},
+            objective=_solution_objective(pair_terms, seat_adj, assign_idx, scale) if pair_terms else 0,
+            status=status
+        )
+
+    # 时限内求解器未给出解时，退回到未被排除的初始方案
+    if warm_start is not None:
+        hint, hint_obj = warm_start
+        assignment = {people[i]: int(hint[i]) for i in range(P)}
+        if assignment not in (forbidden or []):
+            return SeatAssignmentResult(assignment=assignment, objective=hint_obj, status=cp_model.FEASIBLE)
+    return None
+
+
+def solve_top_n_parallel(
+    people: List[str],
+    seats: List[Tuple[int, int]],
+    pair_weights: Dict[frozenset, float],
+    oriented_edges: List[Tuple[Tuple[int, int], Tuple[int, int]]],
+    top_n: int,
+    time_limit_s: float = 10.0,
+    progress_callback: Optional[Callable[[float, str], None]] = None,
+    max_workers: Optional[int] = None,
+    tuned_params: Optional[Dict[str, object]] = None,
+    forbidden_seats: Optional[Dict[str, Set[int]]] = None
+) -> List[SeatAssignmentResult]:
+    """在进程池中用不同随机种子并行求解Top-N个座位方案
+    
+    各子进程独立求解，总耗时约为单个方案的时间限制。重复的方案会被去除，
+    不足top_n个时再在当前进程中以no-good cut补齐，保证方案互不相同。
+    
+    Args:
+        people: 人员名单
+        seats: 座位列表
+        pair_weights: 人员对权重字典
+        oriented_edges: 邻座边列表
+        top_n: 需要生成的方案数量
+        time_limit_s: 每个方案的时间限制（秒）
+        progress_callback: 进度回调函数（在当前进程中调用）
+        max_workers: 进程数上限，默认且最多为CPU核数的1/4
+        tuned_params: 覆盖默认值的CP-SAT参数，见_apply_solver_params
+        forbidden_seats: 人名 -> 该人不能坐的座位索引集合
+        
+    Returns:
+        List[SeatAssignmentResult]: 按目标函数值降序排列的座位分配结果列表
+    """
+    if len(people) > len(seats):
+        raise ValueError(f"座位数({len(seats)})不足以容纳全部人员({len(people)})")
+
+    cpu_count = os.cpu_count() or 1
+    # 每个进程至少保留4个CP-SAT搜索线程（单线程搜索得到的方案明显更差），
+    # 进程数因此不超过CPU核数的1/4
+    max_workers = max(1, min(max_workers or cpu_count, cpu_count // 4, top_n))
+    # 进程间平分CPU，避免CP-SAT线程过度抢占
+    num_workers = max(1, cpu_count // max_workers)
+    if max_workers == 1:
+        # 核数不足8个或单方案时多进程没有收益，直接按no-good cut顺序求解
+        return solve_top_n_assignments(
+            people, seats, pair_weights, oriented_edges, top_n,
+            time_limit_s=time_limit_s, progress_callback=progress_callback,
+            tuned_params=tuned_params, forbidden_seats=forbidden_seats
+        )
+
+    if progress_callback:
+        progress_callback(0.0, f"启动 {max_workers} 个求解进程...")
+
+    results = []
+    seen = set()
+    done = 0
+    # 在多线程的Streamlit服务中fork可能让子进程继承被占用的锁而卡死，改用spawn启动子进程
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        futures = [
+            executor.submit(solve_one, people, seats, pair_weights, oriented_edges,
+                            seed, time_limit_s, None, num_workers, tuned_params, forbidden_seats)
+            for seed in range(top_n)
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            done += 1
+            if result is not None:
+                key = tuple(result.assignment[p] for p in people)
+                if key not in seen:
+                    seen.add(key)
+                    results.append(result)
+            if progress_callback:
+                progress_callback(0.9 * done / top_n, f"已完成 {done}/{top_n} 个方案...")
+
+    # 不同种子可能收敛到同一方案，或在时限内未找到解，排除已有方案后补齐
+    while len(results) < top_n:
+        if progress_callback:
+            progress_callback(0.9, f"补充求解第 {len(results)+1}/{top_n} 个方案...")
+        result = solve_one(people, seats, pair_weights, oriented_edges,
+                           seed=len(results), time_limit_s=time_limit_s,
+                           forbidden=[r.assignment for r in results], num_workers=cpu_count,
+                           tuned_params=tuned_params, forbidden_seats=forbidden_seats)
+        if result is None:
+            break
+        results.append(result)
+
+    results.sort(key=lambda r: r.objective, reverse=True)
+
+    if progress_callback:
+        progress_callback(1.0, "计算完成!")
+
+    return results
+
+
 def solve_top_n_assignments(
     people: List[str],
     seats: List[Tuple[int, int]],
@@ -31,7 +810,9 @@ def solve_top_n_assignments(
     top_n: int,
     time_limit_s: float = 10.0,
     progress_callback: Optional[Callable[[float, str], None]] = None,
-    debug_mode: bool = False
+    debug_mode: bool = False,
+    tuned_params: Optional[Dict[str, object]] = None,
+    forbidden_seats: Optional[Dict[str, Set[int]]] = None
 ) -> List[SeatAssignmentResult]:
     """求解并返回Top-N个座位方案
     
@@ -43,13 +824,14 @@ def solve_top_n_assignments(
         top_n: 需要生成的方案数量
         time_limit_s: 每个方案的时间限制（秒）
         progress_callback: 进度回调函数
+        tuned_params: 覆盖默认值的CP-SAT参数，见_apply_solver_params
+        forbidden_seats: 人名 -> 该人不能坐的座位索引集合，对应的决策变量不会创建
         
     Returns:
         List[SeatAssignmentResult]: 座位分配结果列表
     """
     # 仅对非零权重的pair建变量，降低规模
-    weighted_pairs = [(list(p)[0], list(p)[1], w) for p, w in pair_weights.items() if abs(w) > 1e-9]
-    name_to_idx = {p: i for i, p in enumerate(people)}
+    weighted_pairs = [(a, b, w) for (a, b), w in pair_weights.items() if abs(w) > 1e-9]
     P = len(people)
     S = len(seats)
     
@@ -68,15 +850,8 @@ def solve_top_n_assignments(
         raise ValueError(f"座位数({S})不足以容纳全部人员({P})")
 
     # 预转索引
-    weighted_idx_pairs = []
-    for a, b, w in weighted_pairs:
-        if a in name_to_idx and b in name_to_idx:
-            ia, ib = name_to_idx[a], name_to_idx[b]
-            if ia == ib:
-                continue
-            if ia > ib:
-                ia, ib = ib, ia
-            weighted_idx_pairs.append((ia, ib, w))
+    weighted_idx_pairs = _index_weighted_pairs(people, pair_weights)
+    forbidden_pairs = _forbidden_seat_pairs(people, S, forbidden_seats)
     
     if debug_mode:
         print(f"🔍 [调试] 有效权重对数量: {len(weighted_idx_pairs)}")
@@ -89,53 +864,48 @@ def solve_top_n_assignments(
             if neg_weights:
                 print(f"🔍 [调试] 负权重范围: {min(neg_weights):.2f} ~ {max(neg_weights):.2f}")
 
+    if not weighted_idx_pairs and not forbidden_pairs:
+        # 没有偏好和禁止座位时所有方案等价，跳过建模和求解
+        if debug_mode:
+            print(f"🔍 [调试] 没有有效权重对，直接生成方案")
+        if progress_callback:
+            progress_callback(1.0, "计算完成!")
+        return [
+            SeatAssignmentResult(
+                assignment={people[i]: seat_idx[i] for i in range(P)},
+                objective=0,
+                status=cp_model.OPTIMAL
+            )
+            for seat_idx in _trivial_assignments(P, S, top_n)
+        ]
+
     results = []
 
     # 迭代求K解：每次加一个no-good cut
+    scale = _objective_scale(weighted_idx_pairs)
     if progress_callback:
         progress_callback(0.1, "创建约束模型...")
-    model = cp_model.CpModel()
-    if progress_callback:
-        progress_callback(0.2, "创建决策变量...")
-    x = {}
-    for i in range(P):
-        for s in range(S):
-            x[i, s] = model.NewBoolVar(f"x_{i}_{s}")
-
-    # 每人一个座位
-    if progress_callback:
-        progress_callback(0.3, "添加座位分配约束...")
-    for i in range(P):
-        model.Add(sum(x[i, s] for s in range(S)) == 1)
-    # 每座位至多一人
-    for s in range(S):
-        model.Add(sum(x[i, s] for i in range(P)) <= 1)
-
-    # 目标：邻座对的权重和。用乘积变量 m = x[i,s] * x[j,t]，只在相邻座位上考虑
-    if progress_callback:
-        progress_callback(0.4, "构建目标函数...")
-    m_vars = []
-    m_coeffs = []
-    
-    # 构建座位索引映射
-    seat_to_idx = {seat: idx for idx, seat in enumerate(seats)}
-    
-    for (i, j, w) in weighted_idx_pairs:
-        for (seat1, seat2) in oriented_edges:
-            if seat1 in seat_to_idx and seat2 in seat_to_idx:
-                s = seat_to_idx[seat1]
-                t = seat_to_idx[seat2]
-                m = model.NewBoolVar(f"m_{i}_{j}_{s}_{t}")
-                model.AddMultiplicationEquality(m, [x[i, s], x[j, t]])
-                m_vars.append(m)
-                m_coeffs.append(w)
-
-    if m_vars:  # 只有在有权重对时才设置目标函数
-        model.Maximize(sum(c * v for c, v in zip(m_coeffs, m_vars)))
+    model, x, seat_of, pair_terms, seat_adj, warm_start = _cached_assignment_model(
+        P, S, seats, weighted_idx_pairs, oriented_edges, objective_scale=scale,
+        forbidden_pairs=forbidden_pairs
+    )
+    has_objective = bool(pair_terms)
+    if debug_mode and forbidden_pairs:
+        print(f"🔍 [调试] 禁止座位数: {len(forbidden_pairs)}, 决策变量数: {len(x)}")
+    if has_objective and top_n > 1:
+        W, A = _dense_matrices(P, S, seats, weighted_idx_pairs, oriented_edges)
+        allowed = _allowed_seat_mask(P, S, forbidden_pairs)
+    if debug_mode and warm_start is not None:
+        print(f"🔍 [调试] 拍卖算法初始方案目标函数值: {warm_start[1]:.2f}")
+    # 当前提示方案，满足已加入的全部no-good约束，求解器超时未给出解时作为兜底
+    fallback = warm_start
 
     solver = cp_model.CpSolver()
     solver.parameters.max_time_in_seconds = time_limit_s
-    solver.parameters.num_search_workers = min(8, 4)  # 限制线程数
+    # 至少4个线程保证CP-SAT组合搜索的多样性（单线程时证明最优慢得多），核数更多时最多用到8个
+    solver.parameters.num_search_workers = min(8, max(4, os.cpu_count() or 1))
+    solver.parameters.linearization_level = 2
+    _apply_solver_params(solver, tuned_params)
     
     used_solutions = []
 
@@ -154,20 +924,21 @@ def solve_top_n_assignments(
                 print(f"🔍 [调试] 找到最优解")
             elif status == cp_model.FEASIBLE:
                 print(f"🔍 [调试] 找到可行解")
+            elif fallback is not None:
+                print(f"🔍 [调试] 求解器未找到解，使用启发式提示方案")
             else:
                 print(f"🔍 [调试] 未找到解，停止搜索")
         
-        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            # 提取解
+            assign_idx = _extract_assignment(solver, seat_of)
+            obj_value = _solution_objective(pair_terms, seat_adj, assign_idx, scale) if has_objective else 0
+        elif fallback is not None:
+            assign_idx = {i: int(fallback[0][i]) for i in range(P)}
+            obj_value = fallback[1]
+            status = cp_model.FEASIBLE
+        else:
             break
-
-        # 提取解
-        assign_idx = {}
-        for i in range(P):
-            for s in range(S):
-                if solver.Value(x[i, s]) == 1:
-                    assign_idx[i] = s
-                    break
-        obj_value = solver.ObjectiveValue() if m_vars else 0
         
         if debug_mode:
             print(f"🔍 [调试] 第 {k+1} 个方案目标函数值: {obj_value:.2f}")
@@ -178,11 +949,25 @@ def solve_top_n_assignments(
 
         # 保存并加no-good cut
         used_solutions.append(assign_idx.copy())
-        # sum over i x[i, assigned[i]] <= P-1
-        model.Add(sum(x[i, assign_idx[i]] for i in range(P)) <= P - 1)
+        # 至少一人不坐当前座位：直接加子句 OR_i not x[i, assigned[i]]
+        model.AddBoolOr([x[i, assign_idx[i]].Not() for i in range(P)])
         
         if debug_mode:
             print(f"🔍 [调试] 已添加no-good约束，排除当前解")
+        
+        if has_objective and k + 1 < top_n:
+            # 类似Murty的k-best划分：下一个方案从当前解的最优邻近方案出发，
+            # 该提示已满足刚加入的no-good约束，避免求解器冷启动
+            current = np.array([assign_idx[i] for i in range(P)])
+            used_keys = {tuple(sol[i] for i in range(P)) for sol in used_solutions}
+            neighbor = _best_neighbor(current, W, A, used_keys, allowed)
+            fallback = None
+            if neighbor is not None:
+                model.ClearHints()
+                _add_assignment_hint(model, x, seat_of, pair_terms, seat_adj, neighbor, S)
+                fallback = (neighbor, evaluate_assignment(neighbor, W, A))
+                if debug_mode:
+                    print(f"🔍 [调试] 下一方案初始提示目标函数值: {fallback[1]:.2f}")
 
 
         
@@ -204,7 +989,8 @@ def compute_satisfaction_metrics(
     seats: List[Tuple[int, int]], 
     positive_pairs: Set[frozenset], 
     oriented_edges: List[Tuple[Tuple[int, int], Tuple[int, int]]],
-    willing_pairs_by_rank: Optional[Dict[int, Set]] = None
+    willing_pairs_by_rank: Optional[Dict[int, Set]] = None,
+    adj_matrix: Optional[np.ndarray] = None
 ) -> Tuple[int, int, int, float]:
     """计算满足喜好的人数和对数
     
@@ -215,67 +1001,77 @@ def compute_satisfaction_metrics(
         positive_pairs: 正向关系对集合
         oriented_edges: 邻座边列表
         willing_pairs_by_rank: 按等级分组的喜好关系（可选）
+        adj_matrix: 预先构建的座位邻接矩阵（可选，缺省时由邻座边构建）
         
     Returns:
         Tuple[int, int, int, float]: (满足的人数, 有喜好关系的总人数, 满足的对数, 第一意愿满足率)
     """
-    # 座位索引到坐标的映射
-    idx_to_seat = {i: seat for i, seat in enumerate(seats)}
-    # 人名到座位索引的映射
-    person_to_sidx = {p: sidx for p, sidx in assignment.items()}
+    return compute_satisfaction_metrics_batch(
+        [assignment], people, seats, positive_pairs, oriented_edges, willing_pairs_by_rank, adj_matrix
+    )[0]
+
+
+def compute_satisfaction_metrics_batch(
+    assignments: List[Dict[str, int]], 
+    people: List[str], 
+    seats: List[Tuple[int, int]], 
+    positive_pairs: Set[frozenset], 
+    oriented_edges: List[Tuple[Tuple[int, int], Tuple[int, int]]],
+    willing_pairs_by_rank: Optional[Dict[int, Set]] = None,
+    adj_matrix: Optional[np.ndarray] = None
+) -> List[Tuple[int, int, int, float]]:
+    """一次计算多个方案的满足度指标
     
+    所有方案的座位排成(方案数, 人数)的数组，每个关系对在全部方案中是否相邻
+    只需一次邻接矩阵索引，结果与逐个调用compute_satisfaction_metrics相同。
+    
+    Args:
+        assignments: 座位分配方案列表
+        其余参数同compute_satisfaction_metrics
+        
+    Returns:
+        List[Tuple[int, int, int, float]]: 每个方案的 (满足的人数, 有喜好关系的总人数, 满足的对数, 第一意愿满足率)
+    """
     # 邻座关系
-    adjacent_seats = set()
-    for (c1, r1), (c2, r2) in oriented_edges:
-        try:
-            idx1 = seats.index((c1, r1))
-            idx2 = seats.index((c2, r2))
-            adjacent_seats.add(frozenset([idx1, idx2]))
-        except ValueError:
-            continue
+    if adj_matrix is None:
+        adj_matrix = build_adjacency_matrix(seats, oriented_edges)
     
-    # 统计满足的人和对数
-    satisfied_people = set()
-    satisfied_pairs = 0
+    K = len(assignments)
+    positive_pairs = [tuple(pair) for pair in positive_pairs]
+    first_rank_pairs = [tuple(pair) for pair in (willing_pairs_by_rank or {}).get(1, ())]
     
-    for pair in positive_pairs:
-        person1, person2 = list(pair)
-        if person1 not in person_to_sidx or person2 not in person_to_sidx:
-            continue
-            
-        seat_idx1 = person_to_sidx[person1]
-        seat_idx2 = person_to_sidx[person2]
-        
-        # 检查这两个座位是否相邻
-        if frozenset([seat_idx1, seat_idx2]) in adjacent_seats:
-            satisfied_people.add(person1)
-            satisfied_people.add(person2)
-            satisfied_pairs += 1
+    # 关系对中出现的人名 -> 列索引；每个方案中未就座的人记为-1
+    names = sorted(set().union(*positive_pairs, *first_rank_pairs))
+    name_to_col = {name: col for col, name in enumerate(names)}
+    seat_grid = np.array([[assignment.get(name, -1) for name in names] for assignment in assignments],
+                         dtype=np.intp).reshape(K, len(names))
+    
+    def adjacency_mask(pairs):
+        """返回(方案数, 关系对数)的布尔矩阵：两人都已就座且坐在相邻座位"""
+        cols = np.array([(name_to_col[p1], name_to_col[p2]) for p1, p2 in pairs], dtype=np.intp).reshape(-1, 2)
+        s1, s2 = seat_grid[:, cols[:, 0]], seat_grid[:, cols[:, 1]]
+        seated = (s1 >= 0) & (s2 >= 0)
+        return seated & adj_matrix[np.where(seated, s1, 0), np.where(seated, s2, 0)], cols
+    
+    # 统计满足的人和对数：某人参与的任一关系对被满足即算满足
+    satisfied_mask, pair_cols = adjacency_mask(positive_pairs)
+    satisfied_pairs = satisfied_mask.sum(axis=1)
+    incidence = np.zeros((len(positive_pairs), len(names)), dtype=np.int32)
+    incidence[np.arange(len(positive_pairs)), pair_cols[:, 0]] = 1
+    incidence[np.arange(len(positive_pairs)), pair_cols[:, 1]] = 1
+    satisfied_people = ((satisfied_mask.astype(np.int32) @ incidence) > 0).sum(axis=1)
     
     total_people_with_pref = len(set().union(*positive_pairs)) if positive_pairs else 0
     
     # 计算第一意愿满足率
-    first_preference_rate = 0.0
-    if willing_pairs_by_rank and 1 in willing_pairs_by_rank:
-        first_rank_pairs = willing_pairs_by_rank[1]
-        satisfied_first_pairs = 0
-        
-        for pair in first_rank_pairs:
-            person1, person2 = list(pair)
-            if person1 not in person_to_sidx or person2 not in person_to_sidx:
-                continue
-                
-            seat_idx1 = person_to_sidx[person1]
-            seat_idx2 = person_to_sidx[person2]
-            
-            # 检查这两个座位是否相邻
-            if frozenset([seat_idx1, seat_idx2]) in adjacent_seats:
-                satisfied_first_pairs += 1
-        
-        if len(first_rank_pairs) > 0:
-            first_preference_rate = (satisfied_first_pairs / len(first_rank_pairs)) * 100
+    first_preference_rates = np.zeros(K)
+    if first_rank_pairs:
+        first_preference_rates = adjacency_mask(first_rank_pairs)[0].sum(axis=1) / len(first_rank_pairs) * 100
     
-    return len(satisfied_people), total_people_with_pref, satisfied_pairs, first_preference_rate
+    return [
+        (int(satisfied_people[k]), total_people_with_pref, int(satisfied_pairs[k]), float(first_preference_rates[k]))
+        for k in range(K)
+    ]
 
 
 def validate_assignment(
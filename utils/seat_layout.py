@@ -5,7 +5,10 @@
 
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
+from matplotlib.collections import LineCollection, PatchCollection
+import numpy as np
 from typing import List, Tuple, Dict, Set
+from functools import lru_cache
 import streamlit as st
 
 
@@ -19,11 +22,71 @@ def generate_seats(n_cols: int, rows_per_col: List[int]) -> List[Tuple[int, int]
     Returns:
         List[Tuple[int, int]]: 座位坐标列表 [(列, 排), ...]
     """
+    # 同一布局的结果按参数缓存，返回新列表，调用方修改不会影响缓存
+    return list(_generate_seats_cached(n_cols, tuple(rows_per_col)))
+
+
+@lru_cache(maxsize=32)
+def _generate_seats_cached(n_cols: int, rows_per_col: Tuple[int, ...]) -> Tuple[Tuple[int, int], ...]:
+    """按布局参数缓存的座位生成，见generate_seats"""
     seats = []
     for c in range(n_cols):
         for r in range(rows_per_col[c]):
             seats.append((c, r))
-    return seats
+    return tuple(seats)
+
+
+def _adjacent_edge_array(n_cols: int, rows_per_col: List[int], include_diag: bool = True, aisles: List[Tuple[int, int]] = None) -> np.ndarray:
+    """以整数数组形式生成邻座位的有向边
+    
+    Args:
+        n_cols: 列数
+        rows_per_col: 每列的排数列表
+        include_diag: 是否包含对角线邻座关系
+        aisles: 过道列表，每个元素为(左列索引, 右列索引)，表示这两列之间有过道
+        
+    Returns:
+        np.ndarray: 形状为(边数, 4)的int32数组，每行为(列1, 排1, 列2, 排2)
+    """
+    rows = np.asarray(rows_per_col[:n_cols], dtype=np.int32)
+    
+    # 标记每列与其右侧相邻列之间是否有过道
+    blocked = np.zeros(n_cols, dtype=bool)
+    for left_col, right_col in aisles or []:
+        if right_col == left_col + 1 and 0 <= left_col < n_cols:
+            blocked[left_col] = True
+        elif left_col == right_col + 1 and 0 <= right_col < n_cols:
+            blocked[right_col] = True
+    
+    # 按列优先顺序展开所有座位坐标
+    c = np.repeat(np.arange(n_cols, dtype=np.int32), rows)
+    starts = np.repeat(np.cumsum(rows) - rows, rows)
+    r = np.arange(len(c), dtype=np.int32) - starts
+    
+    rows_here = rows[c]
+    rows_right = np.append(rows[1:], 0).astype(np.int32)[c]
+    open_right = ~blocked[c]
+    
+    # 候选方向依次为：右、上、右上、右下
+    dc = np.array([1, 0, 1, 1], dtype=np.int32)
+    dr = np.array([0, 1, 1, -1], dtype=np.int32)
+    valid = np.stack([
+        open_right & (r < rows_right),
+        r + 1 < rows_here,
+        include_diag & open_right & (r + 1 < rows_right),
+        include_diag & open_right & (r >= 1) & (r - 1 < rows_right),
+    ], axis=1)
+    
+    tc = c[:, None] + dc
+    tr = r[:, None] + dr
+    cc = np.broadcast_to(c[:, None], tc.shape)
+    rr = np.broadcast_to(r[:, None], tr.shape)
+    forward = np.stack([cc, rr, tc, tr], axis=-1)
+    backward = np.stack([tc, tr, cc, rr], axis=-1)
+    
+    # 每条邻接关系按(正向, 反向)成对输出
+    candidates = np.stack([forward, backward], axis=2)
+    return candidates[valid].reshape(-1, 4).astype(np.int32)
 
 
 def generate_adjacent_edges(n_cols: int, rows_per_col: List[int], include_diag: bool = True, aisles: List[Tuple[int, int]] = None) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
@@ -38,46 +101,20 @@ def generate_adjacent_edges(n_cols: int, rows_per_col: List[int], include_diag:
     Returns:
         List[Tuple[Tuple[int, int], Tuple[int, int]]]: 邻座边列表
     """
-    edges = []
-    if aisles is None:
-        aisles = []
-    
-    def has_aisle_between(col1: int, col2: int) -> bool:
-        """检查两列之间是否有过道"""
-        for left_col, right_col in aisles:
-            if (col1 == left_col and col2 == right_col) or (col1 == right_col and col2 == left_col):
-                return True
-        return False
-    
-    # 检查每个座位，添加与相邻座位的边
-    for c in range(n_cols):
-        for r in range(rows_per_col[c]):
-            # 这个座位的坐标
-            curr = (c, r)
-            
-            # 右边的座位 (如果存在且没有过道隔开)
-            if c + 1 < n_cols and r < rows_per_col[c+1] and not has_aisle_between(c, c+1):
-                edges.append((curr, (c+1, r)))
-                edges.append(((c+1, r), curr))  # 双向
-            
-            # 上面的座位 (如果存在)
-            if r + 1 < rows_per_col[c]:
-                edges.append((curr, (c, r+1)))
-                edges.append(((c, r+1), curr))  # 双向
-            
-            # 如果包含对角线边
-            if include_diag:
-                # 右上 (如果存在且没有过道隔开)
-                if c + 1 < n_cols and r + 1 < rows_per_col[c+1] and not has_aisle_between(c, c+1):
-                    edges.append((curr, (c+1, r+1)))
-                    edges.append(((c+1, r+1), curr))  # 双向
-                
-                # 右下 (如果存在且没有过道隔开)
-                if c + 1 < n_cols and r - 1 >= 0 and r - 1 < rows_per_col[c+1] and not has_aisle_between(c, c+1):
-                    edges.append((curr, (c+1, r-1)))
-                    edges.append(((c+1, r-1), curr))  # 双向
-    
-    return edges
+    aisles_key = tuple(tuple(aisle) for aisle in aisles or ())
+    return list(_generate_adjacent_edges_cached(n_cols, tuple(rows_per_col), include_diag, aisles_key))
+
+
+@lru_cache(maxsize=32)
+def _generate_adjacent_edges_cached(
+    n_cols: int, 
+    rows_per_col: Tuple[int, ...], 
+    include_diag: bool, 
+    aisles: Tuple[Tuple[int, int], ...]
+) -> Tuple[Tuple[Tuple[int, int], Tuple[int, int]], ...]:
+    """按布局参数缓存的邻座边生成，见generate_adjacent_edges"""
+    edge_array = _adjacent_edge_array(n_cols, list(rows_per_col), include_diag, list(aisles))
+    return tuple(((c1, r1), (c2, r2)) for c1, r1, c2, r2 in edge_array.tolist())
 
 
 def visualize_layout(n_cols: int, rows_per_col: List[int], edges: List[Tuple[Tuple[int, int], Tuple[int, int]]], aisles: List[Tuple[int, int]] = None) -> plt.Figure:
@@ -121,14 +158,15 @@ def visualize_layout(n_cols: int, rows_per_col: List[int], edges: List[Tuple[Tup
     total_width = current_x if col_x_positions else n_cols
     fig, ax = plt.subplots(figsize=(max(8, total_width * 1.2), max(6, max_rows * 1.2)))
     
-    # 绘制座位
+    # 绘制座位：所有矩形合成一个PatchCollection，只添加一个Artist
+    rects = []
     for c in range(n_cols):
         x_pos = col_x_positions[c]
         for r in range(rows_per_col[c]):
-            rect = patches.Rectangle((x_pos, r), 0.9, 0.9, fill=True, 
-                                   edgecolor='black', facecolor='lightgray', alpha=0.5)
-            ax.add_patch(rect)
+            rects.append(patches.Rectangle((x_pos, r), 0.9, 0.9, fill=True, 
+                                           edgecolor='black', facecolor='lightgray', alpha=0.5))
             ax.text(x_pos + 0.45, r + 0.45, f"C{c+1}-R{r+1}", ha='center', va='center', fontsize=8)
+    ax.add_collection(PatchCollection(rects, match_original=True, joinstyle='miter'))
     
     # 绘制过道线
     if aisles:
@@ -137,11 +175,16 @@ def visualize_layout(n_cols: int, rows_per_col: List[int], edges: List[Tuple[Tup
             x_pos = col_x_positions[left_col] + 1
             ax.axvline(x=x_pos, color='orange', linestyle='--', linewidth=2, alpha=0.7, label='过道')
     
-    # 绘制邻座关系
-    for (c1, r1), (c2, r2) in edges:
-        x1_pos = col_x_positions[c1] if c1 < len(col_x_positions) else c1
-        x2_pos = col_x_positions[c2] if c2 < len(col_x_positions) else c2
-        ax.plot([x1_pos + 0.45, x2_pos + 0.45], [r1 + 0.45, r2 + 0.45], 'b-', alpha=0.3)
+    # 绘制邻座关系：所有连线合成一个LineCollection，代替逐条ax.plot
+    # 邻座边按双向给出，同一对座位只画一条线
+    edges = list(dict.fromkeys(tuple(sorted(edge)) for edge in edges))
+    if edges:
+        ends = np.asarray(edges, dtype=float).reshape(-1, 2, 2)
+        cols = ends[..., 0].astype(int)
+        known = cols < n_cols
+        x_lookup = np.asarray(col_x_positions, dtype=float)
+        ends[..., 0][known] = x_lookup[cols[known]]
+        ax.add_collection(LineCollection(ends + 0.45, colors='b', alpha=0.3))
     
     ax.set_xlim(-0.5, total_width + 0.5)
     ax.set_ylim(-0.5, max_rows + 0.5)
@@ -165,17 +208,57 @@ def get_adjacent_seat_pairs(seats: List[Tuple[int, int]], edges: List[Tuple[Tupl
     Returns:
         Set[frozenset]: 相邻座位对集合
     """
-    adjacent_pairs = set()
+    adj = build_adjacency_matrix(seats, edges)
+    rows, cols = np.nonzero(np.triu(adj, k=1))
+    
+    return {frozenset((int(i), int(j))) for i, j in zip(rows, cols)}
+
+
+def _edge_index_array(seats: List[Tuple[int, int]], edges: List[Tuple[Tuple[int, int], Tuple[int, int]]]) -> np.ndarray:
+    """把邻座边转换为座位索引对数组
+    
+    座位和边先转为(座位数, 2)、(边数, 4)的int16数组，再通过按坐标索引的查找表
+    一次性映射到座位索引，避免逐条边查字典。
+    
+    Args:
+        seats: 座位列表
+        edges: 邻座边列表
+        
+    Returns:
+        np.ndarray: 形状为(边数, 2)的数组，每行为(座位索引1, 座位索引2)；端点不在座位列表中的边被丢弃
+    """
+    seats_arr = np.asarray(seats, dtype=np.int16).reshape(-1, 2)
+    edges_arr = np.asarray(edges, dtype=np.int16).reshape(-1, 4)
+    if len(seats_arr) == 0 or len(edges_arr) == 0:
+        return np.zeros((0, 2), dtype=np.intp)
     
-    for (c1, r1), (c2, r2) in edges:
-        try:
-            idx1 = seats.index((c1, r1))
-            idx2 = seats.index((c2, r2))
-            adjacent_pairs.add(frozenset([idx1, idx2]))
-        except ValueError:
-            continue
+    n_c, n_r = seats_arr.max(axis=0) + 1
+    lookup = np.full((n_c, n_r), -1, dtype=np.intp)
+    # 重复坐标取第一次出现的索引，与逐个建字典的结果一致
+    lookup[seats_arr[::-1, 0], seats_arr[::-1, 1]] = np.arange(len(seats_arr))[::-1]
+    
+    ends = edges_arr.reshape(-1, 2, 2)
+    inside = np.all((ends >= 0) & (ends < (n_c, n_r)), axis=(1, 2))
+    ends = ends[inside]
+    idx = lookup[ends[..., 0], ends[..., 1]]
+    return idx[np.all(idx >= 0, axis=1)]
+
+
+def build_adjacency_matrix(seats: List[Tuple[int, int]], edges: List[Tuple[Tuple[int, int], Tuple[int, int]]]) -> np.ndarray:
+    """构建按座位索引查询的邻接矩阵
     
-    return adjacent_pairs
+    Args:
+        seats: 座位列表
+        edges: 邻座边列表
+        
+    Returns:
+        np.ndarray: 形状为(座位数, 座位数)的布尔矩阵，adj[i, j]表示座位i与j相邻
+    """
+    adj = np.zeros((len(seats), len(seats)), dtype=bool)
+    idx = _edge_index_array(seats, edges)
+    adj[idx[:, 0], idx[:, 1]] = True
+    adj[idx[:, 1], idx[:, 0]] = True
+    return adj
 
 
 def validate_layout(n_cols: int, rows_per_col: List[int], num_people: int) -> Tuple[bool, str]: